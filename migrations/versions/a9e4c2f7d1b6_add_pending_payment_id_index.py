@@ -0,0 +1,38 @@
+"""add partial index for payment reconciliation scan
+
+Revision ID: a9e4c2f7d1b6
+Revises: f3d7b2e8a6c5
+Create Date: 2026-10-18 13:20:36.118427
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "a9e4c2f7d1b6"
+down_revision: Union[str, Sequence[str], None] = "f3d7b2e8a6c5"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # BookingRepository.get_pending_payments_page: keyset по id среди
+    # броней с созданным, но не подтверждённым платежом
+    op.create_index(
+        "ix_bookings_pending_payment_id",
+        "bookings",
+        ["id"],
+        postgresql_where=sa.text(
+            "payment_status = 'pending' AND payment_id IS NOT NULL"
+        ),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_bookings_pending_payment_id", table_name="bookings")
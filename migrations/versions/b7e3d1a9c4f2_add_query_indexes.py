@@ -0,0 +1,70 @@
+"""add indexes for repository query shapes
+
+Revision ID: b7e3d1a9c4f2
+Revises: aebba15f7220
+Create Date: 2026-10-18 10:12:31.418203
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "b7e3d1a9c4f2"
+down_revision: Union[str, Sequence[str], None] = "aebba15f7220"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # BookingRepository.get_by_phone: фильтр по телефону (+ статус),
+    # сортировка по дате и времени слота
+    op.create_index(
+        "ix_bookings_guest_phone_slot",
+        "bookings",
+        ["guest_phone", "slot_date", "start_time", "id"],
+    )
+    op.create_index(
+        "ix_bookings_guest_phone_status", "bookings", ["guest_phone", "status"]
+    )
+    # BookingRepository.get_for_carwash: автомойка + диапазон дат
+    op.create_index(
+        "ix_bookings_car_wash_slot",
+        "bookings",
+        ["car_wash_id", "slot_date", "start_time", "id"],
+    )
+    # BookingRepository.find_pending_payment
+    op.create_index(
+        "ix_bookings_payment_status_created_at",
+        "bookings",
+        ["payment_status", "created_at"],
+    )
+    # BookingRepository.statistic_total / statistic_completed
+    op.create_index("ix_bookings_user_id_status", "bookings", ["user_id", "status"])
+
+    # TimeSlotRepository.get_day_slots: все слоты автомойки на дату
+    op.create_index(
+        "ix_time_slots_car_wash_date", "time_slots", ["car_wash_id", "slot_date"]
+    )
+    # TimeSlotRepository.count_available_slots: только свободные слоты
+    op.create_index(
+        "ix_time_slots_available",
+        "time_slots",
+        ["car_wash_id", "slot_date"],
+        postgresql_where=sa.text("status = 'available'"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_time_slots_available", table_name="time_slots")
+    op.drop_index("ix_time_slots_car_wash_date", table_name="time_slots")
+    op.drop_index("ix_bookings_user_id_status", table_name="bookings")
+    op.drop_index("ix_bookings_payment_status_created_at", table_name="bookings")
+    op.drop_index("ix_bookings_car_wash_slot", table_name="bookings")
+    op.drop_index("ix_bookings_guest_phone_status", table_name="bookings")
+    op.drop_index("ix_bookings_guest_phone_slot", table_name="bookings")
@@ -0,0 +1,31 @@
+"""add car wash coordinates
+
+Revision ID: b8f2d4e6a1c3
+Revises: a9e4c2f7d1b6
+Create Date: 2026-10-18 15:02:11.406583
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "b8f2d4e6a1c3"
+down_revision: Union[str, Sequence[str], None] = "a9e4c2f7d1b6"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column("car_washes", sa.Column("latitude", sa.Float(), nullable=True))
+    op.add_column("car_washes", sa.Column("longitude", sa.Float(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("car_washes", "longitude")
+    op.drop_column("car_washes", "latitude")
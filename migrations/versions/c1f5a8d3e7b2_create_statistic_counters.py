@@ -0,0 +1,55 @@
+"""create statistic counters
+
+Revision ID: c1f5a8d3e7b2
+Revises: b8f2d4e6a1c3
+Create Date: 2026-10-18 16:41:27.553019
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c1f5a8d3e7b2"
+down_revision: Union[str, Sequence[str], None] = "b8f2d4e6a1c3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "statistic_counters",
+        sa.Column("key", sa.Text(), nullable=False),
+        sa.Column("value", sa.BigInteger(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("key"),
+    )
+    # Начальные значения — тот же пересчёт, что выполняет recount_statistics_service
+    # Двоеточия экранированы: строка выполняется как text() с bind-параметрами
+    op.execute(
+        r"""
+        INSERT INTO statistic_counters (key, value, updated_at)
+        SELECT 'carwashes', count(*), now() FROM car_washes
+        UNION ALL
+        SELECT 'bookings:total', count(*), now() FROM bookings
+        UNION ALL
+        SELECT 'bookings:status:' || status, count(*), now()
+        FROM bookings GROUP BY status
+        UNION ALL
+        SELECT 'user:' || user_id || '\:total', count(*), now()
+        FROM bookings WHERE user_id IS NOT NULL GROUP BY user_id
+        UNION ALL
+        SELECT 'user:' || user_id || '\:completed', count(*), now()
+        FROM bookings WHERE user_id IS NOT NULL AND status = 'completed'
+        GROUP BY user_id
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("statistic_counters")
@@ -0,0 +1,35 @@
+"""add unique index for time slot start per bay
+
+Revision ID: c4a9e5f1b2d8
+Revises: b7e3d1a9c4f2
+Create Date: 2026-10-18 11:02:47.905113
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c4a9e5f1b2d8"
+down_revision: Union[str, Sequence[str], None] = "b7e3d1a9c4f2"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Цель ON CONFLICT DO NOTHING при ленивой и фоновой генерации слотов
+    op.create_index(
+        "ux_time_slots_bay_date_start",
+        "time_slots",
+        ["wash_bay_id", "slot_date", "start_time"],
+        unique=True,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ux_time_slots_bay_date_start", table_name="time_slots")
@@ -0,0 +1,35 @@
+"""add partial index for unpaid booking expiry
+
+Revision ID: d2b8f6a3c7e1
+Revises: c4a9e5f1b2d8
+Create Date: 2026-10-18 11:40:13.552910
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "d2b8f6a3c7e1"
+down_revision: Union[str, Sequence[str], None] = "c4a9e5f1b2d8"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # BookingRepository.expire_unpaid: только брони, ожидающие оплаты
+    op.create_index(
+        "ix_bookings_pending_expires_at",
+        "bookings",
+        ["expires_at"],
+        postgresql_where=sa.text("status = 'pending_payment'"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_bookings_pending_expires_at", table_name="bookings")
@@ -0,0 +1,92 @@
+"""create analytics rollups
+
+Revision ID: d4e9a2c6f8b1
+Revises: c1f5a8d3e7b2
+Create Date: 2026-10-18 18:02:45.118406
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "d4e9a2c6f8b1"
+down_revision: Union[str, Sequence[str], None] = "c1f5a8d3e7b2"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "booking_rollups",
+        sa.Column("car_wash_id", sa.Uuid(), nullable=False),
+        sa.Column("grain", sa.Text(), nullable=False),
+        sa.Column("bucket", sa.DateTime(), nullable=False),
+        sa.Column("wash_bay_id", sa.Uuid(), nullable=False),
+        sa.Column("wash_type_id", sa.Uuid(), nullable=False),
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("bookings", sa.Integer(), nullable=False),
+        sa.Column("confirmed", sa.Integer(), nullable=False),
+        sa.Column("completed", sa.Integer(), nullable=False),
+        sa.Column("cancelled", sa.Integer(), nullable=False),
+        sa.Column("booked_minutes", sa.Integer(), nullable=False),
+        sa.Column("revenue", sa.Float(), nullable=False),
+        sa.ForeignKeyConstraint(["car_wash_id"], ["car_washes.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["wash_bay_id"], ["wash_bays.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["wash_type_id"], ["wash_types.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint(
+            "car_wash_id", "grain", "bucket", "wash_bay_id", "wash_type_id"
+        ),
+    )
+    op.create_index(
+        "ix_booking_rollups_car_wash_day", "booking_rollups", ["car_wash_id", "day"]
+    )
+    op.create_table(
+        "slot_rollups",
+        sa.Column("car_wash_id", sa.Uuid(), nullable=False),
+        sa.Column("grain", sa.Text(), nullable=False),
+        sa.Column("bucket", sa.DateTime(), nullable=False),
+        sa.Column("wash_bay_id", sa.Uuid(), nullable=False),
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("capacity_minutes", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["car_wash_id"], ["car_washes.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["wash_bay_id"], ["wash_bays.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("car_wash_id", "grain", "bucket", "wash_bay_id"),
+    )
+    op.create_index(
+        "ix_slot_rollups_car_wash_day", "slot_rollups", ["car_wash_id", "day"]
+    )
+    op.create_table(
+        "rollup_watermarks",
+        sa.Column("name", sa.Text(), nullable=False),
+        sa.Column("watermark", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("name"),
+    )
+    # Поиск изменённых броней и слотов по водяному знаку. Сами агрегаты
+    # строит первый запуск rollup_refresh_job (без знака — за все дни)
+    op.create_index(
+        "ix_bookings_changed_at",
+        "bookings",
+        [sa.text("coalesce(updated_at, created_at)")],
+    )
+    op.create_index(
+        "ix_time_slots_changed_at",
+        "time_slots",
+        [sa.text("coalesce(updated_at, created_at)")],
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_time_slots_changed_at", table_name="time_slots")
+    op.drop_index("ix_bookings_changed_at", table_name="bookings")
+    op.drop_table("rollup_watermarks")
+    op.drop_index("ix_slot_rollups_car_wash_day", table_name="slot_rollups")
+    op.drop_table("slot_rollups")
+    op.drop_index("ix_booking_rollups_car_wash_day", table_name="booking_rollups")
+    op.drop_table("booking_rollups")
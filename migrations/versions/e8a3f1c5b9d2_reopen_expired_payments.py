@@ -0,0 +1,38 @@
+"""reopen expired payments for reconciliation
+
+Revision ID: e8a3f1c5b9d2
+Revises: d4e9a2c6f8b1
+Create Date: 2026-10-18 20:14:08.331742
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "e8a3f1c5b9d2"
+down_revision: Union[str, Sequence[str], None] = "d4e9a2c6f8b1"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Просроченные брони с созданным платежом снова видны сверке:
+    # оплата могла пройти у провайдера уже после отмены брони
+    op.execute(
+        "UPDATE bookings SET payment_status = 'pending' "
+        "WHERE payment_status = 'expired' AND payment_id IS NOT NULL"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute(
+        "UPDATE bookings SET payment_status = 'expired' "
+        "WHERE payment_status = 'pending' AND status = 'cancelled' "
+        "AND payment_id IS NOT NULL"
+    )
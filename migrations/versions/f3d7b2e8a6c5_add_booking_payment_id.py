@@ -0,0 +1,30 @@
+"""add payment id to bookings
+
+Revision ID: f3d7b2e8a6c5
+Revises: e5c1a7d9b3f4
+Create Date: 2026-10-18 12:48:02.731946
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "f3d7b2e8a6c5"
+down_revision: Union[str, Sequence[str], None] = "e5c1a7d9b3f4"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # ID платежа у провайдера: нужен для возвратов и сверки статусов
+    op.add_column("bookings", sa.Column("payment_id", sa.Text(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("bookings", "payment_id")
@@ -0,0 +1,48 @@
+"""create statistic deltas
+
+Revision ID: f6b2d8e4a1c7
+Revises: e8a3f1c5b9d2
+Create Date: 2026-10-18 20:52:31.604219
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "f6b2d8e4a1c7"
+down_revision: Union[str, Sequence[str], None] = "e8a3f1c5b9d2"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "statistic_deltas",
+        sa.Column("id", sa.BigInteger(), sa.Identity(), nullable=False),
+        sa.Column("key", sa.Text(), nullable=False),
+        sa.Column("delta", sa.BigInteger(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_statistic_deltas_key", "statistic_deltas", ["key"])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Несвёрнутые изменения переносим в счётчики, чтобы не потерять их
+    op.execute(
+        """
+        INSERT INTO statistic_counters (key, value, updated_at)
+        SELECT key, sum(delta), now() FROM statistic_deltas GROUP BY key
+        ON CONFLICT (key) DO UPDATE
+        SET value = statistic_counters.value + excluded.value,
+            updated_at = excluded.updated_at
+        """
+    )
+    op.drop_index("ix_statistic_deltas_key", table_name="statistic_deltas")
+    op.drop_table("statistic_deltas")
@@ -12,19 +12,115 @@ from src.routers.v1.booking import router as booking_router
 from src.routers.v1.payment import router as payment_router
 from src.routers.v1.user import router as user_router
 from src.routers.v1.washtype import router as washtype_router
+from src.routers.v1.admin_carwash import router as admin_carwash_router
+from src.routers.v1.telegram import router as telegram_router
 from src.bot.main import main as run_bot
-from src.core.config import Settings
-
-settings = Settings()
+from src.bot.webhook import WEBHOOK_PATH, create_webhook_feeder
+from src.core.background import run_periodic
+from src.core.cache import catalog_cache
+from src.core.config import get_settings, install_reload_signal
+from src.services.booking_expiry import booking_expiry_job
+from src.services.payment_inbox import payment_inbox_worker
+from src.services.payment_gateway import close_payment_gateway, get_payment_gateway
+from src.services.payment_reconciliation import payment_reconciliation_job
+from src.services.statistics import statistics_fold_job, statistics_recount_job
+from src.services.analytics import rollup_refresh_job
+from src.services.timeslot import slot_horizon_job
 
 logger = logging.getLogger(__name__)
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    bot_task = asyncio.create_task(run_bot())
+    settings = get_settings()
+    # SIGHUP перечитывает .env без перезапуска (см. reload_settings)
+    install_reload_signal(asyncio.get_running_loop())
+    bot_task = None
+    feeder = None
+    if settings.bot_mode == "webhook":
+        feeder = create_webhook_feeder(settings, app)
+        await feeder.start(
+            settings.bot_webhook_url or f"{settings.api_base_url}{WEBHOOK_PATH}"
+        )
+        app.state.bot_feeder = feeder
+    else:
+        bot_task = asyncio.create_task(run_bot(app))
+    horizon_task = asyncio.create_task(
+        run_periodic(
+            "slot_horizon",
+            settings.slot_horizon_interval_seconds,
+            lambda: slot_horizon_job(get_settings().slot_horizon_days),
+        )
+    )
+    expiry_task = asyncio.create_task(
+        run_periodic(
+            "booking_expiry",
+            settings.booking_expiry_interval_seconds,
+            lambda: booking_expiry_job(get_settings().booking_expiry_batch_size),
+        )
+    )
+    inbox_tasks = [
+        asyncio.create_task(
+            payment_inbox_worker(
+                settings.payment_inbox_batch_size,
+                settings.payment_inbox_poll_seconds,
+                name=str(i),
+            )
+        )
+        for i in range(settings.payment_inbox_workers)
+    ]
+    rollup_task = asyncio.create_task(
+        run_periodic(
+            "rollup_refresh",
+            settings.rollup_refresh_interval_seconds,
+            rollup_refresh_job,
+        )
+    )
+    fold_task = asyncio.create_task(
+        run_periodic(
+            "statistics_fold",
+            settings.statistics_fold_interval_seconds,
+            statistics_fold_job,
+        )
+    )
+    background_tasks = [expiry_task, horizon_task, rollup_task, fold_task, *inbox_tasks]
+    if settings.payment_gateway_mode != "demo":
+        # Демо-шлюз считает любой платеж успешным — сверять с ним нельзя
+        background_tasks.append(
+            asyncio.create_task(
+                run_periodic(
+                    "payment_reconciliation",
+                    settings.payment_reconcile_interval_seconds,
+                    lambda: payment_reconciliation_job(
+                        get_payment_gateway(),
+                        get_settings().payment_reconcile_page_size,
+                        get_settings().payment_reconcile_concurrency,
+                    ),
+                )
+            )
+        )
+    if settings.statistics_recount_interval_seconds:
+        background_tasks.append(
+            asyncio.create_task(
+                run_periodic(
+                    "statistics_recount",
+                    settings.statistics_recount_interval_seconds,
+                    statistics_recount_job,
+                )
+            )
+        )
+    if bot_task:
+        background_tasks.append(bot_task)
     yield
-    bot_task.cancel()
+    for task in background_tasks:
+        task.cancel()
+    # Ждём завершения задач: их транзакции и клиенты закрываются до того,
+    # как ниже закроются шлюз платежей и кэш
+    await asyncio.gather(*background_tasks, return_exceptions=True)
+    if feeder:
+        await feeder.stop()
+    await catalog_cache.close()
+    await close_payment_gateway()
 
 
 def get_app() -> FastAPI:
@@ -35,6 +131,7 @@ def get_app() -> FastAPI:
 
     :return: application.
     """
+    settings = get_settings()
     app = FastAPI(
         title="CarWash API",
         description="API для агрегатора автомоек с бронированием и предоплатой",
@@ -75,6 +172,8 @@ def get_app() -> FastAPI:
     app.include_router(payment_router)
     app.include_router(user_router)
     app.include_router(washtype_router)
+    app.include_router(admin_carwash_router)
+    app.include_router(telegram_router)
 
     @app.get("/miniapp")
     async def miniapp(request: Request):
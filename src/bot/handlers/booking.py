@@ -4,6 +4,7 @@
 
 import logging
 from datetime import date
+from typing import Dict
 
 import httpx
 from aiogram import Router, F
@@ -28,6 +29,14 @@ logger = logging.getLogger(__name__)
 router = Router(name="booking")
 
 
+async def get_free_counts(
+    api_client: ApiClient, carwash_id: str, days: int = 7
+) -> Dict[str, int]:
+    """Свободные слоты по датам (ISO) на days дней начиная с сегодня."""
+    summary = await api_client.get_availability(carwash_id, days=days)
+    return {day["date"]: day["available_slots_count"] for day in summary["days"]}
+
+
 @router.callback_query(F.data.startswith("carwash_"))
 async def show_carwash_detail(
     callback: CallbackQuery, state: FSMContext, api_client: ApiClient
@@ -37,10 +46,9 @@ async def show_carwash_detail(
 
     try:
         carwash = await api_client.get_carwash(carwash_id)
-        # Получаем кол-во слотов на сегодня
-        today_str = date.today().isoformat()
-        slots_data = await api_client.get_slots_count(carwash_id, date=today_str)
-        available_slots = slots_data.get("available_slots_count", 0)
+        # Свободные слоты на неделю одним запросом: сегодня — первый день
+        free_counts = await get_free_counts(api_client, carwash_id)
+        available_slots = free_counts.get(date.today().isoformat(), 0)
 
         await state.update_data(carwash_id=carwash_id, carwash_name=carwash["name"])
 
@@ -55,7 +63,7 @@ async def show_carwash_detail(
 ✅ Свободных слотов сегодня: <b>{available_slots}</b>
 """
 
-        kb = get_date_keyboard(carwash_id)
+        kb = get_date_keyboard(carwash_id, free_counts=free_counts)
         await callback.message.edit_text(text, reply_markup=kb, parse_mode="HTML")
 
     except httpx.HTTPStatusError as e:
@@ -71,11 +79,18 @@ async def show_carwash_detail(
 
 
 @router.callback_query(F.data.startswith("select_date_"))
-async def select_date(callback: CallbackQuery, state: FSMContext):
+async def select_date(
+    callback: CallbackQuery, state: FSMContext, api_client: ApiClient
+):
     """Выбор даты"""
     carwash_id = callback.data.replace("select_date_", "")
 
-    kb = get_date_keyboard(carwash_id)
+    try:
+        free_counts = await get_free_counts(api_client, carwash_id)
+    except httpx.HTTPError as e:
+        logger.error(f"API error getting availability: {e}")
+        free_counts = None
+    kb = get_date_keyboard(carwash_id, free_counts=free_counts)
     await callback.message.edit_text(
         "📅 <b>Выберите дату:</b>", reply_markup=kb, parse_mode="HTML"
     )
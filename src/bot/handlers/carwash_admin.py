@@ -67,6 +67,43 @@ async def wash_admin_today(
         await callback.answer()
 
 
+@router.callback_query(F.data.startswith("wa_report_"))
+async def wash_admin_report(
+    callback: CallbackQuery,
+    api_client: ApiClient,
+):
+    """Отчёт админа мойки за последние 7 дней: выручка, загрузка, неявки"""
+    carwash_id = callback.data.replace("wa_report_", "")
+
+    try:
+        report = await api_client.get_carwash_analytics(carwash_id, grain="day")
+        totals = report["totals"]
+        lines = [
+            "📊 <b>Отчёт за 7 дней</b>\n",
+            f"Броней: {totals['bookings']} (выполнено {totals['completed']}, "
+            f"отменено {totals['cancelled']})",
+            f"Выручка: {totals['revenue']:.0f} ₽",
+            f"Загрузка: {totals['utilization']:.0%}",
+            f"Неявки: {totals['no_show']} ({totals['no_show_rate']:.0%})\n",
+        ]
+        for day in report["items"]:
+            lines.append(
+                f"{day['key'][8:10]}.{day['key'][5:7]}: {day['bookings']} бр., "
+                f"{day['revenue']:.0f} ₽, {day['utilization']:.0%}"
+            )
+
+        kb = get_back_keyboard("back_to_menu")
+        await callback.message.edit_text(
+            "\n".join(lines), reply_markup=kb, parse_mode="HTML"
+        )
+
+    except Exception as e:
+        logger.error(f"Error getting report for carwash {carwash_id}: {e}")
+        await callback.message.answer("❌ Не удалось загрузить отчёт.")
+    finally:
+        await callback.answer()
+
+
 @router.callback_query(F.data.startswith("wa_scan_"))
 async def wash_admin_scan(callback: CallbackQuery, state: FSMContext):
     """Сканирование QR для админа мойки"""
@@ -15,8 +15,6 @@ from src.bot.utils.api_client import ApiClient
 from src.bot.keyboards.keyboards import get_main_keyboard, get_back_keyboard
 from src.core.config import Settings
 
-settings = Settings()
-
 logger = logging.getLogger(__name__)
 router = Router(name="system_admin")
 
@@ -71,7 +69,9 @@ async def add_wash_phone(message: Message, state: FSMContext):
 
 
 @router.message(AdminWashStates.adding_wash_hours)
-async def add_wash_hours(message: Message, state: FSMContext, api_client: ApiClient):
+async def add_wash_hours(
+    message: Message, state: FSMContext, api_client: ApiClient, settings: Settings
+):
     """Ввод часов работы"""
     try:
         start, end = message.text.split("-")
@@ -228,6 +228,7 @@ async def show_stats(
     callback: CallbackQuery,
     state: FSMContext,
     api_client: ApiClient,
+    settings: Settings,
 ):
     """Показать статистику"""
     if callback.from_user.id not in settings.admins_id:
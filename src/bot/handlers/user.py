@@ -263,7 +263,9 @@ async def request_location(
 
 
 @router.message(UserStates.selecting_location, F.location)
-async def process_location(message: Message, state: FSMContext, settings: Settings):
+async def process_location(
+    message: Message, state: FSMContext, api_client: ApiClient
+):
     location = message.location
     await state.update_data(latitude=location.latitude, longitude=location.longitude)
 
@@ -271,7 +273,7 @@ async def process_location(message: Message, state: FSMContext, settings: Settin
         "📍 Ищу ближайшие мойки...", reply_markup=ReplyKeyboardRemove()
     )
     try:
-        carwashes = await ApiClient(settings.api_base_url).get_carwashes(
+        carwashes = await api_client.get_carwashes(
             latitude=location.latitude, longitude=location.longitude
         )
 
@@ -1,7 +1,7 @@
 """
 Клавиатуры для Telegram бота CarWash
 """
-from typing import List, Optional
+from typing import Dict, List, Optional
 from datetime import date, timedelta
 
 from aiogram.types import (
@@ -63,6 +63,9 @@ def get_main_keyboard(
                     InlineKeyboardButton(
                         text="📷 QR", callback_data=f"wa_scan_{carwash.id}"
                     ),
+                    InlineKeyboardButton(
+                        text="📊", callback_data=f"wa_report_{carwash.id}"
+                    ),
                 ]
             )
 
@@ -144,7 +147,15 @@ def get_carwashes_keyboard(
     return InlineKeyboardMarkup(inline_keyboard=buttons)
 
 
-def get_date_keyboard(carwash_id: str, days_ahead: int = 7) -> InlineKeyboardMarkup:
+def get_date_keyboard(
+    carwash_id: str, days_ahead: int = 7, free_counts: Optional[Dict[str, int]] = None
+) -> InlineKeyboardMarkup:
+    """
+    Выбор даты на days_ahead дней вперёд.
+
+    free_counts — свободные слоты по датам (ISO), рядом с датой показывается
+    их количество.
+    """
     buttons, today = [], date.today()
     weekdays = ["Пн", "Вт", "Ср", "Чт", "Пт", "Сб", "Вс"]
     row = []
@@ -158,6 +169,9 @@ def get_date_keyboard(carwash_id: str, days_ahead: int = 7) -> InlineKeyboardMar
             if i == 1
             else f"{weekdays[d.weekday()]}, {d.day}"
         )
+        if free_counts is not None:
+            count = free_counts.get(d.isoformat(), 0)
+            text += f" ({count})" if count else " —"
         row.append(
             InlineKeyboardButton(
                 text=text, callback_data=f"date_{carwash_id}_{d.isoformat()}"
@@ -4,15 +4,20 @@
 
 import asyncio
 import logging
+from typing import Optional
+
 from aiogram import Bot, Dispatcher
-from aiogram.fsm.storage.memory import MemoryStorage
 from aiogram.client.default import DefaultBotProperties
 from aiogram.enums import ParseMode
+from fastapi import FastAPI
 
 from src.core.db import async_session_maker
 from src.bot.utils.db import DbSessionMiddleware
+from src.bot.utils.api_client import ApiClient, get_api_client
 from src.bot.utils.api_client_middleware import ApiClientMiddleware
-from src.core.config import Settings
+from src.bot.utils.settings_middleware import SettingsMiddleware
+from src.bot.utils.storage import create_fsm_storage
+from src.core.config import Settings, get_settings
 from src.bot.handlers import (
     user_router,
     booking_router,
@@ -27,35 +32,56 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
-async def main():
-    """Запуск бота"""
-    settings = Settings()
-
-    bot = Bot(
+def create_bot(settings: Settings) -> Bot:
+    """Создаёт экземпляр бота."""
+    return Bot(
         token=settings.bot_token,
         default=DefaultBotProperties(parse_mode=ParseMode.HTML),
     )
 
-    storage = MemoryStorage()
-    dp = Dispatcher(storage=storage, settings=settings)
 
-    admin_ids = settings.admins_id
-    webapp_url = settings.webapp_url
+def create_dispatcher(settings: Settings, api_client: ApiClient) -> Dispatcher:
+    """
+    Создаёт диспетчер с хранилищем FSM, middleware и роутерами.
 
+    Роутеры — модульные объекты, поэтому диспетчер создаётся один раз на процесс.
+    """
+    storage = create_fsm_storage(settings)
+    dp = Dispatcher(storage=storage)
+
+    dp.update.middleware(SettingsMiddleware())
     dp.update.middleware(DbSessionMiddleware(session_pool=async_session_maker))
-    dp.update.middleware(ApiClientMiddleware(settings.api_base_url))
+    dp.update.middleware(ApiClientMiddleware(api_client))
 
     dp.include_router(user_router)
     dp.include_router(booking_router)
     dp.include_router(system_admin_router)
     dp.include_router(carwash_admin_router)
+    return dp
+
+
+async def main(app: Optional[FastAPI] = None):
+    """
+    Запуск бота в режиме long polling
+
+    :param app: FastAPI-приложение, если бот запущен в его процессе.
+    """
+    settings = get_settings()
+
+    bot = create_bot(settings)
+    api_client = get_api_client(settings, app)
+    dp = create_dispatcher(settings, api_client)
 
     logger.info("Запуск CarWash бота...")
 
     try:
+        # Вебхук, оставшийся от режима webhook, не даст получать обновления
+        await bot.delete_webhook()
         await dp.start_polling(bot, allowed_updates=dp.resolve_used_update_types())
     finally:
         await bot.session.close()
+        await api_client.close()
+        await dp.storage.close()
 
 
 if __name__ == "__main__":
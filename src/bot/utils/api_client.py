@@ -2,7 +2,9 @@
 Асинхронный клиент для взаимодействия с API CarWash.
 """
 
+import asyncio
 import logging
+import random
 from typing import Any, Dict, List, Optional
 from uuid import UUID
 
@@ -13,19 +15,81 @@ from src.core.config import Settings
 
 logger = logging.getLogger(__name__)
 
+# Статусы, при которых безопасный (GET) запрос имеет смысл повторить
+RETRY_STATUSES = {502, 503, 504}
+
+
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
 
 class ApiClient:
-    def __init__(self, base_url: str):
+    """
+    Клиент API с общим пулом соединений.
+
+    Создаётся один раз на процесс бота и закрывается при остановке.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        timeout: float = 10.0,
+        connect_timeout: float = 3.0,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        keepalive_expiry: float = 30.0,
+        http2: bool = False,
+        retries: int = 2,
+        retry_backoff: float = 0.1,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
         self._base_url = base_url
-        self._client = httpx.AsyncClient(base_url=self._base_url)
+        self._retries = retries
+        self._retry_backoff = retry_backoff
+        if http2 and not _http2_available():
+            logger.warning("HTTP/2 недоступен (не установлен пакет h2), используем HTTP/1.1")
+            http2 = False
+        self._client = httpx.AsyncClient(
+            base_url=self._base_url,
+            timeout=httpx.Timeout(timeout, connect=connect_timeout),
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections,
+                keepalive_expiry=keepalive_expiry,
+            ),
+            http2=http2,
+            transport=transport,
+        )
 
     async def close(self):
         await self._client.aclose()
 
+    async def _send(self, method: str, url: str, **kwargs) -> httpx.Response:
+        """
+        Отправляет запрос; GET повторяется при сетевых ошибках и 502/503/504
+        с экспоненциальной задержкой и случайным разбросом (full jitter).
+        """
+        attempts = self._retries + 1 if method == "GET" else 1
+        for attempt in range(attempts):
+            last_attempt = attempt == attempts - 1
+            try:
+                response = await self._client.request(method, url, **kwargs)
+            except httpx.TransportError:
+                if last_attempt:
+                    raise
+            else:
+                if response.status_code not in RETRY_STATUSES or last_attempt:
+                    return response
+            await asyncio.sleep(random.uniform(0, self._retry_backoff * 2**attempt))
+
     async def _request(self, method: str, url: str, **kwargs) -> Any:
         """Универсальный метод для выполнения запросов."""
         try:
-            response = await self._client.request(method, url, **kwargs)
+            response = await self._send(method, url, **kwargs)
             response.raise_for_status()
             if response.status_code == 204:  # No Content
                 return None
@@ -47,11 +111,16 @@ class ApiClient:
         )  # Public endpoint
 
     async def get_carwashes(
-        self, latitude: Optional[float] = None, longitude: Optional[float] = None
+        self,
+        latitude: Optional[float] = None,
+        longitude: Optional[float] = None,
+        radius: Optional[float] = None,
     ) -> List[Dict[str, Any]]:
         params = {}
         if latitude is not None and longitude is not None:
             params = {"latitude": latitude, "longitude": longitude}
+            if radius is not None:
+                params["radius"] = radius
         return await self._request(
             "GET", "/api/v1/carwashes/", params=params
         )  # Public endpoint
@@ -73,6 +142,16 @@ class ApiClient:
             "GET", f"/api/v1/carwashes/{carwash_id}/slots-count", params=params
         )
 
+    async def get_availability(
+        self, carwash_id: str | UUID, date_from: Optional[str] = None, days: int = 7
+    ) -> Dict[str, Any]:
+        params: Dict[str, Any] = {"days": days}
+        if date_from:
+            params["date_from"] = date_from
+        return await self._request(
+            "GET", f"/api/v1/carwashes/{carwash_id}/availability", params=params
+        )
+
     # TimeSlot Endpoints
     async def get_time_slots(
         self, carwash_id: str | UUID, date: str
@@ -119,6 +198,13 @@ class ApiClient:
             "GET", f"/api/v1/admin/carwash/{carwash_id}/bookings", params=params
         )
 
+    async def get_carwash_analytics(
+        self, carwash_id: str | UUID, **params
+    ) -> Dict[str, Any]:
+        return await self._request(
+            "GET", f"/api/v1/admin/carwash/{carwash_id}/analytics", params=params
+        )
+
     async def verify_qr_code(
         self, booking_id: str | UUID, qr_code: str
     ) -> Dict[str, Any]:
@@ -140,6 +226,42 @@ class ApiClient:
         )
 
 
-def get_api_client(settings: Settings) -> ApiClient:
-    """DI-фабрика для создания экземпляра ApiClient."""
-    return ApiClient(base_url=settings.api_base_url)
+# Условный адрес приложения для транспорта внутри процесса
+IN_PROCESS_BASE_URL = "http://carwash-api"
+
+
+def get_api_client(settings: Settings, app: Optional[Any] = None) -> ApiClient:
+    """
+    Создаёт общий для процесса ApiClient по настройкам.
+
+    Транспорт (API_CLIENT_TRANSPORT):
+    - http — запросы по сети на api_base_url;
+    - asgi — запросы в FastAPI-приложение того же процесса (httpx.ASGITransport);
+    - direct — как asgi, но частые запросы на чтение вызывают сервисы напрямую;
+    - auto — direct, если бот запущен в процессе приложения (передан app), иначе http.
+    """
+    mode = settings.api_client_transport
+    if mode == "auto":
+        mode = "direct" if app is not None else "http"
+    if mode != "http" and app is None:
+        logger.warning(f"Транспорт '{mode}' требует приложение в процессе, используем http")
+        mode = "http"
+
+    options = dict(
+        timeout=settings.api_client_timeout,
+        max_connections=settings.api_client_max_connections,
+        max_keepalive_connections=settings.api_client_max_keepalive,
+        http2=settings.api_client_http2,
+        retries=settings.api_client_retries,
+    )
+    logger.info(f"ApiClient: транспорт {mode}")
+    if mode == "http":
+        return ApiClient(base_url=settings.api_base_url, **options)
+
+    transport = httpx.ASGITransport(app=app)
+    if mode == "direct":
+        # Импорт здесь: модуль тянет сервисный слой и БД
+        from src.bot.utils.direct_api_client import DirectApiClient
+
+        return DirectApiClient(base_url=IN_PROCESS_BASE_URL, transport=transport, **options)
+    return ApiClient(base_url=IN_PROCESS_BASE_URL, transport=transport, **options)
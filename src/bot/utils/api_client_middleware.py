@@ -8,12 +8,12 @@ from src.bot.utils.api_client import ApiClient
 
 class ApiClientMiddleware(BaseMiddleware):
     """
-    Middleware для передачи экземпляра ApiClient в обработчики.
+    Middleware для передачи общего экземпляра ApiClient в обработчики.
     """
 
-    def __init__(self, base_url: str):
+    def __init__(self, api_client: ApiClient):
         super().__init__()
-        self.base_url = base_url
+        self.api_client = api_client
 
     async def __call__(
         self,
@@ -21,5 +21,5 @@ class ApiClientMiddleware(BaseMiddleware):
         event: TelegramObject,
         data: Dict[str, Any],
     ) -> Any:
-        data["api_client"] = ApiClient(base_url=self.base_url)
+        data["api_client"] = self.api_client
         return await handler(event, data)
@@ -0,0 +1,144 @@
+"""
+ApiClient, вызывающий сервисный слой напрямую.
+
+Используется, когда бот работает в одном процессе с FastAPI-приложением:
+частые запросы на чтение идут в сервисы без HTTP и без сериализации на
+стороне API, остальные — через ASGI-транспорт в то же приложение.
+Ответы имеют ту же форму, что и JSON от API, а HTTPException сервисов
+превращается в httpx.HTTPStatusError, поэтому обработчики бота не меняются.
+"""
+
+import json
+import uuid
+from contextlib import asynccontextmanager
+from functools import wraps
+from datetime import date as date_type
+from typing import Any, Dict, List, Optional
+from uuid import UUID
+
+import httpx
+from fastapi import HTTPException
+
+from src.bot.utils.api_client import ApiClient
+from src.core.db import get_async_session
+from src.services.booking import get_booking_by_id_service, get_my_bookings_service
+from src.services.carwash import (
+    get_all_carwashes_json_service,
+    get_carwash_availability_service,
+    get_carwash_by_id_json_service,
+    get_free_slots_json_service,
+    get_carwash_slots_stats_service,
+    search_carwashes_nearby_service,
+)
+from src.services.washtype import get_all_wash_types_json_service
+
+
+# Та же семантика, что и у зависимости роутеров: commit после успешного вызова
+_session = asynccontextmanager(get_async_session)
+
+# Столько ближайших моек бот показывает по геолокации (как per_page в API)
+NEARBY_PAGE_SIZE = 20
+
+
+def _as_http_error(method: str, url: str):
+    """Преобразует HTTPException сервиса в httpx.HTTPStatusError."""
+
+    def decorator(func):
+        @wraps(func)
+        async def wrapper(*args, **kwargs):
+            try:
+                return await func(*args, **kwargs)
+            except HTTPException as e:
+                request = httpx.Request(method, url)
+                response = httpx.Response(
+                    e.status_code, json={"detail": e.detail}, request=request
+                )
+                raise httpx.HTTPStatusError(
+                    str(e.detail), request=request, response=response
+                ) from e
+
+        return wrapper
+
+    return decorator
+
+
+class DirectApiClient(ApiClient):
+    """ApiClient с прямыми вызовами сервисов для частых запросов на чтение."""
+
+    @_as_http_error("GET", "/api/v1/carwashes/{carwash_id}")
+    async def get_carwash(self, carwash_id: str | UUID) -> Dict[str, Any]:
+        async with _session() as session:
+            cached = await get_carwash_by_id_json_service(
+                uuid.UUID(str(carwash_id)), session
+            )
+        return json.loads(cached.body)
+
+    async def get_carwashes(
+        self,
+        latitude: Optional[float] = None,
+        longitude: Optional[float] = None,
+        radius: Optional[float] = None,
+    ) -> List[Dict[str, Any]]:
+        if latitude is not None and longitude is not None:
+            async with _session() as session:
+                nearby = await search_carwashes_nearby_service(
+                    latitude, longitude, radius, 1, NEARBY_PAGE_SIZE, session
+                )
+            return [cw.model_dump(mode="json") for cw in nearby]
+        async with _session() as session:
+            cached = await get_all_carwashes_json_service(session)
+        return json.loads(cached.body)
+
+    async def get_wash_types(self) -> Dict[str, Any]:
+        async with _session() as session:
+            cached = await get_all_wash_types_json_service(session)
+        return json.loads(cached.body)
+
+    @_as_http_error("GET", "/api/v1/carwashes/{carwash_id}/slots-count")
+    async def get_slots_count(
+        self, carwash_id: str | UUID, date: Optional[str] = None
+    ) -> Dict[str, Any]:
+        async with _session() as session:
+            return await get_carwash_slots_stats_service(
+                uuid.UUID(str(carwash_id)), date, session
+            )
+
+    @_as_http_error("GET", "/api/v1/carwashes/{carwash_id}/availability")
+    async def get_availability(
+        self, carwash_id: str | UUID, date_from: Optional[str] = None, days: int = 7
+    ) -> Dict[str, Any]:
+        async with _session() as session:
+            result = await get_carwash_availability_service(
+                uuid.UUID(str(carwash_id)),
+                date_type.fromisoformat(date_from) if date_from else None,
+                days,
+                session,
+            )
+        return result.model_dump(mode="json")
+
+    @_as_http_error("GET", "/api/v1/carwashes/{carwash_id}/slots")
+    async def get_time_slots(
+        self, carwash_id: str | UUID, date: str
+    ) -> List[Dict[str, Any]]:
+        async with _session() as session:
+            body = await get_free_slots_json_service(
+                uuid.UUID(str(carwash_id)),
+                date_type.fromisoformat(date),
+                None,
+                False,
+                session,
+            )
+        return json.loads(body)
+
+    async def get_my_bookings(self, phone: str) -> Dict[str, Any]:
+        async with _session() as session:
+            result = await get_my_bookings_service(
+                phone=phone, status=None, page=1, per_page=20, session=session
+            )
+        return result.model_dump(mode="json")
+
+    @_as_http_error("GET", "/api/v1/bookings/{booking_id}")
+    async def get_booking_details(self, booking_id: str | UUID) -> Dict[str, Any]:
+        async with _session() as session:
+            result = await get_booking_by_id_service(uuid.UUID(str(booking_id)), session)
+        return result.model_dump(mode="json")
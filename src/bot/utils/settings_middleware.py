@@ -0,0 +1,25 @@
+from typing import Callable, Dict, Any, Awaitable
+
+from aiogram import BaseMiddleware
+from aiogram.types import TelegramObject
+
+from src.core.config import get_settings
+
+
+class SettingsMiddleware(BaseMiddleware):
+    """
+    Middleware для передачи текущих настроек процесса в обработчики.
+
+    Настройки берутся из get_settings на каждое обновление, поэтому после
+    reload_settings (SIGHUP) обработчики видят новые значения без
+    пересоздания диспетчера.
+    """
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: Dict[str, Any],
+    ) -> Any:
+        data["settings"] = get_settings()
+        return await handler(event, data)
@@ -0,0 +1,35 @@
+"""
+Хранилище состояний FSM бота.
+
+Состояние в памяти процесса теряется при перезапуске и не видно другим
+воркерам, поэтому по умолчанию используется Redis. Незавершённые сценарии
+(бронирование, регистрация) удаляются из Redis по истечении TTL.
+"""
+
+import logging
+
+from aiogram.fsm.storage.base import BaseStorage
+from aiogram.fsm.storage.memory import MemoryStorage
+from aiogram.fsm.storage.redis import DefaultKeyBuilder, RedisStorage
+
+from src.core.config import Settings
+
+
+logger = logging.getLogger(__name__)
+
+
+def create_fsm_storage(settings: Settings) -> BaseStorage:
+    """Создаёт хранилище FSM по настройке FSM_STORAGE (redis | memory)."""
+    if settings.fsm_storage == "memory":
+        logger.info("FSM: хранилище в памяти процесса")
+        return MemoryStorage()
+
+    ttl = settings.fsm_state_ttl_seconds or None
+    logger.info(f"FSM: хранилище Redis (TTL {ttl} с)")
+    return RedisStorage.from_url(
+        str(settings.redis_url),
+        # Префикс с id бота, чтобы несколько ботов могли делить один Redis
+        key_builder=DefaultKeyBuilder(prefix="fsm", with_bot_id=True),
+        state_ttl=ttl,
+        data_ttl=ttl,
+    )
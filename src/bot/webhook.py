@@ -0,0 +1,132 @@
+"""
+Приём обновлений Telegram через вебхук.
+
+Обновления, пришедшие POST-запросом в FastAPI, кладутся в ограниченную
+очередь и обрабатываются фиксированным числом воркеров через
+Dispatcher.feed_update. Если очередь заполнена, эндпоинт отвечает 503 —
+Telegram повторит доставку позже, а процесс не набирает бесконечно задач.
+
+Вебхук всегда защищён секретом (заголовок X-Telegram-Bot-Api-Secret-Token):
+если BOT_WEBHOOK_SECRET не задан, секрет выводится из токена бота, поэтому
+он одинаков во всех воркерах API и не угадывается без токена.
+"""
+
+import asyncio
+import hashlib
+import hmac
+import logging
+from typing import List, Optional
+
+from aiogram import Bot, Dispatcher
+from aiogram.types import Update
+from fastapi import FastAPI
+
+from src.bot.main import create_bot, create_dispatcher
+from src.bot.utils.api_client import ApiClient, get_api_client
+from src.core.config import Settings
+
+
+logger = logging.getLogger(__name__)
+
+WEBHOOK_PATH = "/telegram/webhook"
+
+
+def webhook_secret(settings: Settings) -> str:
+    """BOT_WEBHOOK_SECRET или секрет, выведенный из токена бота."""
+    if settings.bot_webhook_secret:
+        return settings.bot_webhook_secret
+    # Telegram допускает в секрете только A-Z, a-z, 0-9, _ и -
+    return hmac.new(
+        b"TelegramWebhook", settings.bot_token.encode(), hashlib.sha256
+    ).hexdigest()
+
+
+class WebhookUpdateFeeder:
+    """Очередь обновлений Telegram с пулом воркеров."""
+
+    def __init__(
+        self,
+        bot: Bot,
+        dispatcher: Dispatcher,
+        api_client: ApiClient,
+        workers: int,
+        queue_size: int,
+        secret_token: str,
+    ):
+        self.bot = bot
+        self.dispatcher = dispatcher
+        self.api_client = api_client
+        self.workers = workers
+        self.secret_token = secret_token
+        self.queue: asyncio.Queue[Update] = asyncio.Queue(maxsize=queue_size)
+        self._tasks: List[asyncio.Task] = []
+
+    def submit(self, data: dict) -> bool:
+        """
+        Ставит обновление в очередь. Возвращает False, если очередь заполнена.
+
+        Некорректное обновление — pydantic.ValidationError.
+        """
+        update = Update.model_validate(data, context={"bot": self.bot})
+        try:
+            self.queue.put_nowait(update)
+        except asyncio.QueueFull:
+            logger.warning("Очередь обновлений Telegram заполнена, отвечаем 503")
+            return False
+        return True
+
+    async def _worker(self) -> None:
+        while True:
+            update = await self.queue.get()
+            try:
+                await self.dispatcher.feed_update(self.bot, update)
+            except Exception as e:
+                logger.error(
+                    f"Ошибка обработки обновления {update.update_id}: {e}",
+                    exc_info=True,
+                )
+            finally:
+                self.queue.task_done()
+
+    async def start(self, webhook_url: Optional[str]) -> None:
+        """Запускает воркеров и регистрирует вебхук в Telegram."""
+        self._tasks = [
+            asyncio.create_task(self._worker()) for _ in range(self.workers)
+        ]
+        if webhook_url:
+            await self.bot.set_webhook(
+                url=webhook_url,
+                secret_token=self.secret_token,
+                allowed_updates=self.dispatcher.resolve_used_update_types(),
+            )
+            logger.info(f"Вебхук Telegram установлен: {webhook_url}")
+
+    async def stop(self, timeout: float = 10) -> None:
+        """Дожидается обработки очереди и останавливает воркеров."""
+        try:
+            await asyncio.wait_for(self.queue.join(), timeout=timeout)
+        except asyncio.TimeoutError:
+            logger.warning(
+                f"Не обработано обновлений при остановке: {self.queue.qsize()}"
+            )
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        # Вебхук не удаляем: его используют остальные воркеры API
+        await self.bot.session.close()
+        await self.api_client.close()
+        await self.dispatcher.storage.close()
+
+
+def create_webhook_feeder(
+    settings: Settings, app: Optional[FastAPI] = None
+) -> WebhookUpdateFeeder:
+    api_client = get_api_client(settings, app)
+    return WebhookUpdateFeeder(
+        bot=create_bot(settings),
+        dispatcher=create_dispatcher(settings, api_client),
+        api_client=api_client,
+        workers=settings.bot_webhook_workers,
+        queue_size=settings.bot_webhook_queue_size,
+        secret_token=webhook_secret(settings),
+    )
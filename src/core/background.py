@@ -0,0 +1,31 @@
+"""
+Периодические фоновые задачи, запускаемые из lifespan приложения.
+"""
+
+import asyncio
+import logging
+from typing import Awaitable, Callable
+
+
+logger = logging.getLogger(__name__)
+
+
+async def run_periodic(
+    name: str,
+    interval_seconds: float,
+    job: Callable[[], Awaitable[None]],
+) -> None:
+    """
+    Выполняет job каждые interval_seconds секунд до отмены задачи.
+
+    Ошибка одного запуска логируется и не останавливает цикл.
+    """
+    logger.info(f"Фоновая задача '{name}' запущена (интервал {interval_seconds} с)")
+    while True:
+        try:
+            await job()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Ошибка в фоновой задаче '{name}': {e}", exc_info=True)
+        await asyncio.sleep(interval_seconds)
@@ -0,0 +1,236 @@
+"""
+Двухуровневый кэш справочных данных (автомойки, типы мойки).
+
+Первый уровень — LRU в памяти процесса с коротким TTL, второй — Redis,
+общий для всех процессов. Значения хранятся готовым JSON, поэтому ответ
+отдаётся без повторной сериализации, а ETag считается один раз на значение.
+Если Redis недоступен, кэш продолжает работать только на первом уровне, а
+несостоявшиеся инвалидации повторяются, когда Redis снова доступен.
+"""
+
+import hashlib
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Generic, Optional, TypeVar
+
+from fastapi import Request, Response
+from redis import asyncio as aioredis
+from redis.exceptions import RedisError
+
+from src.core.config import get_settings
+
+
+logger = logging.getLogger(__name__)
+
+# Сколько секунд не обращаться к Redis после ошибки соединения
+REDIS_RETRY_AFTER = 30
+
+# Ключи справочников
+CARWASH_LIST_KEY = "carwashes"
+WASH_TYPE_LIST_KEY = "wash_types"
+
+
+def carwash_key(carwash_id) -> str:
+    return f"carwash:{carwash_id}"
+
+
+def wash_type_key(wash_type_id) -> str:
+    return f"wash_type:{wash_type_id}"
+
+
+@dataclass(frozen=True, slots=True)
+class CachedJSON:
+    """Сериализованный ответ и его ETag."""
+
+    body: bytes
+    etag: str
+
+    @classmethod
+    def from_body(cls, body: bytes) -> "CachedJSON":
+        return cls(body=body, etag=f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"')
+
+
+V = TypeVar("V")
+
+
+class TTLCache(Generic[V]):
+    """LRU-кэш в памяти с ограничением времени жизни записей."""
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Any, tuple[float, V]]" = OrderedDict()
+
+    def get(self, key: Any) -> Optional[V]:
+        item = self._data.get(key)
+        if item is None:
+            return None
+        expires_at, value = item
+        if expires_at < time.monotonic():
+            del self._data[key]
+            return None
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: Any, value: V, ttl: Optional[float] = None) -> None:
+        """ttl — время жизни этой записи вместо общего."""
+        self._data[key] = (time.monotonic() + (self.ttl if ttl is None else ttl), value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def delete(self, key: Any) -> None:
+        self._data.pop(key, None)
+
+
+class CatalogCache:
+    """
+    Read-through кэш: память процесса -> Redis -> загрузчик из БД.
+
+    У каждого ключа в Redis есть поколение (gen:<key>), которое invalidate()
+    увеличивает. Значение хранится вместе с поколением, при котором его начали
+    загружать, и при чтении с другим поколением считается промахом: загрузчик,
+    стартовавший до invalidate(), не вернёт в кэш устаревшие данные. В памяти
+    процесса то же обеспечивает общий счётчик инвалидаций.
+
+    Если Redis недоступен, invalidate() пишет ошибку в лог и запоминает ключи;
+    поколения увеличиваются при первом успешном обращении к Redis.
+    """
+
+    def __init__(
+        self,
+        redis_url: str,
+        ttl: int,
+        local_ttl: int,
+        maxsize: int = 1024,
+        prefix: str = "catalog:",
+    ):
+        self.ttl = ttl
+        self.prefix = prefix
+        self.local: TTLCache[CachedJSON] = TTLCache(maxsize=maxsize, ttl=local_ttl)
+        self._redis = aioredis.from_url(
+            redis_url, socket_timeout=0.5, socket_connect_timeout=0.5
+        )
+        self._redis_down_until = 0.0
+        # Растёт при каждой инвалидации в процессе
+        self._local_generation = 0
+        # Ключи, чьё поколение в Redis ещё не увеличено
+        self._pending_invalidations: set[str] = set()
+
+    def _redis_available(self) -> bool:
+        return time.monotonic() >= self._redis_down_until
+
+    def _redis_failed(self, e: Exception) -> None:
+        logger.warning(f"Redis недоступен, кэш работает только в памяти: {e}")
+        self._redis_down_until = time.monotonic() + REDIS_RETRY_AFTER
+
+    def _generation_key(self, key: str) -> str:
+        return f"{self.prefix}gen:{key}"
+
+    async def _bump_generations(self, keys: set[str]) -> bool:
+        """Увеличивает поколения ключей в Redis; False — Redis недоступен."""
+        try:
+            async with self._redis.pipeline(transaction=True) as pipe:
+                for key in sorted(keys):
+                    pipe.incr(self._generation_key(key))
+                    pipe.delete(self.prefix + key)
+                await pipe.execute()
+        except (RedisError, OSError) as e:
+            self._redis_failed(e)
+            return False
+        return True
+
+    async def _flush_pending(self) -> bool:
+        """Повторяет отложенные инвалидации; False — Redis по-прежнему недоступен."""
+        if not self._pending_invalidations:
+            return True
+        keys = set(self._pending_invalidations)
+        if not await self._bump_generations(keys):
+            return False
+        self._pending_invalidations -= keys
+        logger.info(f"Отложенная инвалидация кэша выполнена: {sorted(keys)}")
+        return True
+
+    async def get_or_load(
+        self, key: str, loader: Callable[[], Awaitable[bytes]]
+    ) -> CachedJSON:
+        """
+        Возвращает значение по ключу, при промахе вызывает loader.
+
+        Исключения loader (например, HTTPException 404) не кэшируются.
+        """
+        value = self.local.get(key)
+        if value is not None:
+            return value
+
+        local_generation = self._local_generation
+        generation: Optional[bytes] = None
+        use_redis = self._redis_available() and await self._flush_pending()
+        if use_redis:
+            try:
+                generation, stored = await self._redis.mget(
+                    self._generation_key(key), self.prefix + key
+                )
+            except (RedisError, OSError) as e:
+                self._redis_failed(e)
+                use_redis = False
+            else:
+                generation = generation or b"0"
+                if stored is not None:
+                    stored_generation, _, body = stored.partition(b"\n")
+                    if stored_generation == generation:
+                        value = CachedJSON.from_body(body)
+                        if local_generation == self._local_generation:
+                            self.local.set(key, value)
+                        return value
+
+        value = CachedJSON.from_body(await loader())
+        if local_generation == self._local_generation:
+            self.local.set(key, value)
+        if use_redis and self._redis_available():
+            try:
+                await self._redis.set(
+                    self.prefix + key, generation + b"\n" + value.body, ex=self.ttl
+                )
+            except (RedisError, OSError) as e:
+                self._redis_failed(e)
+        return value
+
+    async def invalidate(self, *keys: str) -> None:
+        """Удаляет ключи из обоих уровней; при недоступном Redis — повторит позже."""
+        if not keys:
+            return
+        self._local_generation += 1
+        for key in keys:
+            self.local.delete(key)
+
+        self._pending_invalidations.update(keys)
+        if self._redis_available() and await self._flush_pending():
+            return
+        logger.error(
+            f"Не удалось инвалидировать кэш в Redis, повтор при восстановлении: "
+            f"{sorted(self._pending_invalidations)}"
+        )
+
+    async def close(self) -> None:
+        await self._redis.aclose()
+
+
+catalog_cache = CatalogCache(
+    redis_url=str(get_settings().redis_url),
+    ttl=get_settings().catalog_cache_ttl_seconds,
+    local_ttl=get_settings().catalog_local_cache_ttl_seconds,
+)
+
+
+def etag_response(request: Request, cached: CachedJSON) -> Response:
+    """JSON-ответ с ETag; 304, если клиент прислал совпадающий If-None-Match."""
+    headers = {"ETag": cached.etag, "Cache-Control": "no-cache"}
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        if cached.etag in tags or "*" in tags:
+            return Response(status_code=304, headers=headers)
+    return Response(content=cached.body, media_type="application/json", headers=headers)
@@ -1,5 +1,7 @@
+import logging
 import os
-from typing import List
+import signal
+from typing import Callable, List, Literal, Optional
 
 from pydantic import PostgresDsn, Field, RedisDsn
 from pydantic_settings import BaseSettings
@@ -17,12 +19,79 @@ class Settings(BaseSettings):
     # Адрес API
     api_base_url: str = "http://localhost:8000"
 
+    # Пул соединений ApiClient бота (HTTP/2 требует пакет h2)
+    api_client_timeout: float = 10.0
+    api_client_max_connections: int = 100
+    api_client_max_keepalive: int = 20
+    api_client_http2: bool = False
+    api_client_retries: int = 2
+    # Транспорт ApiClient: auto | http | asgi | direct (см. get_api_client)
+    api_client_transport: Literal["auto", "http", "asgi", "direct"] = "auto"
+
     # Настройки Redis
     redis_url: RedisDsn
 
+    # Режим получения обновлений ботом: polling | webhook.
+    # В режиме webhook адрес вебхука по умолчанию: api_base_url + /telegram/webhook
+    bot_mode: Literal["polling", "webhook"] = "polling"
+    bot_webhook_url: Optional[str] = None
+    bot_webhook_secret: Optional[str] = None
+
+    # Mini App: срок годности initData (по auth_date) и токена сессии
+    webapp_init_data_max_age_seconds: int = 24 * 60 * 60
+    webapp_session_ttl_seconds: int = 12 * 60 * 60
+    bot_webhook_workers: int = 8
+    bot_webhook_queue_size: int = 1000
+
+    # Отмена неоплаченных броней по expires_at
+    booking_expiry_interval_seconds: int = 60
+    booking_expiry_batch_size: int = 500
+
+    # Сверка статусов платежей с провайдером (не выполняется в режиме demo)
+    payment_reconcile_interval_seconds: int = 300
+    payment_reconcile_page_size: int = 500
+    payment_reconcile_concurrency: int = 20
+
+    # Воркеры inbox платежных событий
+    payment_inbox_workers: int = 2
+    payment_inbox_batch_size: int = 50
+    payment_inbox_poll_seconds: float = 5.0
+
+    # Хранилище FSM бота: redis | memory; TTL незавершённых сценариев (0 — без TTL)
+    fsm_storage: Literal["redis", "memory"] = "redis"
+    fsm_state_ttl_seconds: int = 24 * 60 * 60
+
+    # Кэш справочников: TTL в Redis и в памяти процесса
+    catalog_cache_ttl_seconds: int = 300
+    catalog_local_cache_ttl_seconds: int = 30
+
+    # Быстрая сериализация ответов списков (orjson / pydantic-core) без
+    # повторной валидации по response_model; массивы длиннее порога — потоком.
+    # Порог подобран bench/serialization_bench.py: страницы списков (per_page
+    # до 100) выигрывают от потока уже на 100 элементах, на 20 — проигрывают
+    fast_json_responses: bool = False
+    fast_json_stream_threshold: int = 50
+
+    # Горизонт слотов: на сколько дней вперёд фоновая задача держит слоты
+    slot_horizon_days: int = 30
+    slot_horizon_interval_seconds: int = 3600
+
+    # Пересборка агрегатов аналитики по изменённым дням
+    rollup_refresh_interval_seconds: int = 300
+
+    # Свёртка изменений счётчиков статистики в statistic_counters
+    statistics_fold_interval_seconds: int = 10
+    # Полный пересчёт счётчиков статистики (0 — только вручную из админки)
+    statistics_recount_interval_seconds: int = 0
+
     # Настройки платежной системы
     yookassa_shop_id: str
     yookassa_secret_key: str
+    # demo — заглушка, yookassa — боевой API, fake — локальный фейковый провайдер
+    payment_gateway_mode: Literal["demo", "yookassa", "fake"] = "demo"
+    yookassa_api_url: str = "https://api.yookassa.ru/v3"
+    payment_gateway_timeout: float = 10.0
+    payment_gateway_retries: int = 2
 
     class Config:
         env_file = os.path.join(
@@ -30,3 +99,62 @@ class Settings(BaseSettings):
         )
         env_file_encoding = "utf-8"
         case_sensitive = False
+        # Настройки общие для процесса (get_settings) — менять их на месте нельзя
+        frozen = True
+
+
+logger = logging.getLogger(__name__)
+
+_settings: Optional[Settings] = None
+# Сбросы кэшей, построенных из настроек (см. on_settings_reload)
+_reload_callbacks: List[Callable[[], None]] = []
+
+
+def get_settings() -> Settings:
+    """
+    Настройки процесса: .env читается и проверяется один раз.
+
+    Используется и как зависимость FastAPI (Depends(get_settings)), и в
+    middleware бота. Ресурсы, созданные при старте (движок БД, Redis, бот),
+    новые значения после reload_settings не подхватывают — для них нужен
+    перезапуск.
+    """
+    global _settings
+    if _settings is None:
+        _settings = Settings()
+    return _settings
+
+
+def on_settings_reload(callback: Callable[[], None]) -> Callable[[], None]:
+    """
+    Регистрирует сброс кэша, построенного из настроек: reload_settings
+    вызывает его после замены настроек, какие бы поля ни изменились.
+    """
+    _reload_callbacks.append(callback)
+    return callback
+
+
+def reload_settings() -> Settings:
+    """Перечитывает .env и окружение; при ошибке остаются прежние настройки."""
+    global _settings
+    try:
+        settings = Settings()
+    except Exception:
+        logger.exception("Не удалось перечитать настройки, оставлены прежние")
+        return get_settings()
+    _settings = settings
+    for callback in _reload_callbacks:
+        callback()
+    logger.info("Настройки перечитаны")
+    return settings
+
+
+def install_reload_signal(loop) -> None:
+    """reload_settings по SIGHUP (на платформах, где есть сигналы)."""
+    if not hasattr(signal, "SIGHUP"):
+        return
+    try:
+        loop.add_signal_handler(signal.SIGHUP, reload_settings)
+    except (NotImplementedError, RuntimeError):
+        # Цикл не в главном потоке или не поддерживает сигналы
+        pass
@@ -1,8 +1,8 @@
 from contextlib import asynccontextmanager
 import sqlalchemy as sa
 from typing import Optional
-from typing import Annotated, List, AsyncGenerator
-from sqlalchemy import Text, String, ARRAY
+from typing import Annotated, List, AsyncGenerator, AsyncIterator
+from sqlalchemy import Text, String, ARRAY, func, select
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import (
     DeclarativeMeta,
@@ -13,11 +13,10 @@ from sqlalchemy.orm import (
 from sqlalchemy.ext.asyncio import AsyncAttrs
 
 
-from src.core.config import Settings
+from src.core.config import get_settings
 
 
-settings = Settings()
-engine = create_async_engine(str(settings.postgres_url))
+engine = create_async_engine(str(get_settings().postgres_url))
 async_session_maker = async_sessionmaker(
     engine,
     class_=AsyncSession,
@@ -64,3 +63,25 @@ async def get_async_session() -> AsyncGenerator[AsyncSession, None]:
             raise e
         finally:
             await session.close()
+
+
+@asynccontextmanager
+async def advisory_lock(lock_id: int) -> AsyncIterator[bool]:
+    """
+    Сессионная advisory-блокировка Postgres на отдельном соединении.
+
+    В отличие от BookingRepository.try_advisory_lock не держит открытую
+    транзакцию: соединение работает в autocommit, поэтому под блокировкой
+    можно делать долгие внешние вызовы и короткие транзакции в других
+    сессиях. Возвращает False, если блокировку держит другой процесс.
+    """
+    async with engine.connect() as connection:
+        connection = await connection.execution_options(isolation_level="AUTOCOMMIT")
+        locked = (
+            await connection.execute(select(func.pg_try_advisory_lock(lock_id)))
+        ).scalar()
+        try:
+            yield bool(locked)
+        finally:
+            if locked:
+                await connection.execute(select(func.pg_advisory_unlock(lock_id)))
@@ -0,0 +1,111 @@
+"""
+Быстрый путь сериализации ответов API (FAST_JSON_RESPONSES=true).
+
+По умолчанию FastAPI повторно валидирует результат по response_model и
+сериализует его через jsonable_encoder + json.dumps. Вывод сервисов уже
+собран из схем, поэтому в быстром режиме он сериализуется сразу в байты
+сериализатором pydantic-core (модели) или orjson (dict/list), а большие
+массивы отдаются потоком порциями.
+"""
+
+from functools import lru_cache
+from typing import Any, Iterator, List, Optional, Sequence
+
+import orjson
+from fastapi import Response
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, TypeAdapter
+
+from src.core.config import get_settings
+
+
+JSON_MEDIA_TYPE = "application/json"
+# Наибольшая порция элементов, сериализуемая за один шаг при потоковой отдаче
+STREAM_CHUNK_SIZE = 100
+
+
+@lru_cache(maxsize=None)
+def _list_adapter(item_type: type) -> TypeAdapter:
+    return TypeAdapter(List[item_type])
+
+
+def _dump_items(items: Sequence[Any]) -> bytes:
+    """Элементы массива через запятую, без квадратных скобок."""
+    if not items:
+        return b""
+    if isinstance(items[0], BaseModel):
+        return _list_adapter(type(items[0])).dump_json(list(items))[1:-1]
+    return orjson.dumps(list(items), option=orjson.OPT_NON_STR_KEYS)[1:-1]
+
+
+def _chunk_size(threshold: int) -> int:
+    """
+    Порция потока не больше порога: массив длиннее порога уходит хотя бы
+    двумя кусками, а не одним, как при обычном ответе.
+    """
+    return max(1, min(STREAM_CHUNK_SIZE, threshold))
+
+
+def _iter_array(items: Sequence[Any], chunk_size: int) -> Iterator[bytes]:
+    yield b"["
+    for start in range(0, len(items), chunk_size):
+        if start:
+            yield b","
+        yield _dump_items(items[start : start + chunk_size])
+    yield b"]"
+
+
+def _iter_model_with_array(model: BaseModel, field: str, chunk_size: int) -> Iterator[bytes]:
+    """Модель вида {"items": [...], ...}: сначала массив порциями, затем остальные поля."""
+    yield f'{{"{field}":'.encode()
+    yield from _iter_array(getattr(model, field), chunk_size)
+    rest = model.model_dump_json(exclude={field}).encode()
+    yield b"}" if rest == b"{}" else b"," + rest[1:]
+
+
+def dump_json(data: Any) -> bytes:
+    """Сериализует модель, список моделей или обычные данные в JSON."""
+    if isinstance(data, BaseModel):
+        return data.model_dump_json().encode()
+    if isinstance(data, list):
+        return b"[" + _dump_items(data) + b"]"
+    return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS)
+
+
+def fast_json(
+    data: Any,
+    array_field: Optional[str] = "items",
+    status_code: int = 200,
+) -> Any:
+    """
+    Возвращает ответ в быстром режиме или data без изменений, если режим выключен.
+
+    Готовый Response FastAPI отдаёт как есть, без валидации по response_model.
+    Массивы длиннее FAST_JSON_STREAM_THRESHOLD (сам список или поле array_field
+    модели) отдаются потоком порциями не длиннее порога.
+    """
+    settings = get_settings()
+    if not settings.fast_json_responses:
+        return data
+
+    threshold = settings.fast_json_stream_threshold
+    chunk_size = _chunk_size(threshold)
+    if isinstance(data, list) and len(data) > threshold:
+        return StreamingResponse(
+            _iter_array(data, chunk_size),
+            status_code=status_code,
+            media_type=JSON_MEDIA_TYPE,
+        )
+    if (
+        isinstance(data, BaseModel)
+        and array_field
+        and len(getattr(data, array_field, None) or ()) > threshold
+    ):
+        return StreamingResponse(
+            _iter_model_with_array(data, array_field, chunk_size),
+            status_code=status_code,
+            media_type=JSON_MEDIA_TYPE,
+        )
+    return Response(
+        content=dump_json(data), status_code=status_code, media_type=JSON_MEDIA_TYPE
+    )
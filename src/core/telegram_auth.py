@@ -1,8 +1,15 @@
+import base64
 import hashlib
 import hmac
+import time
 import urllib.parse
 import json
-from typing import Dict, Any
+import uuid
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, Any, Optional
+
+from src.core.cache import TTLCache
 
 
 def _hex_to_bytes(hex_string: str) -> bytes:
@@ -10,18 +17,19 @@ def _hex_to_bytes(hex_string: str) -> bytes:
     return bytes.fromhex(hex_string)
 
 
-def validate_init_data(init_data: str, bot_token: str) -> bool:
-    """
-    Validates Telegram Mini App initData.
-    More info: https://core.telegram.org/bots/webapps#checking-authorization
-    """
-    if not init_data:
-        return False
+@lru_cache(maxsize=8)
+def webapp_secret(bot_token: str) -> bytes:
+    """HMAC key for initData, derived once per bot token."""
+    return hmac.new(b"WebAppData", bot_token.encode(), hashlib.sha256).digest()
+
+
+@lru_cache(maxsize=8)
+def session_secret(bot_token: str) -> bytes:
+    """HMAC key for Mini App session tokens (separate from the initData key)."""
+    return hmac.new(b"CarWashSession", bot_token.encode(), hashlib.sha256).digest()
 
-    # Parse the init_data string
-    parsed_data = urllib.parse.parse_qs(init_data)
 
-    # Extract hash and other parameters
+def _check_hash(parsed_data: Dict[str, list], secret_key: bytes) -> bool:
     data_check_string_parts = []
     hash_value = None
     for key, value in sorted(parsed_data.items()):
@@ -30,15 +38,24 @@ def validate_init_data(init_data: str, bot_token: str) -> bool:
             hash_value = value
         else:
             data_check_string_parts.append(f"{key}={value}")
+    if hash_value is None:
+        return False
 
     data_check_string = "\n".join(data_check_string_parts)
-
-    secret_key = hmac.new(b"WebAppData", bot_token.encode(), hashlib.sha256).digest()
     calculated_hash = hmac.new(
         secret_key, data_check_string.encode(), hashlib.sha256
     ).hexdigest()
+    return hmac.compare_digest(calculated_hash, hash_value)
 
-    return calculated_hash == hash_value
+
+def validate_init_data(init_data: str, bot_token: str) -> bool:
+    """
+    Validates Telegram Mini App initData.
+    More info: https://core.telegram.org/bots/webapps#checking-authorization
+    """
+    if not init_data:
+        return False
+    return _check_hash(urllib.parse.parse_qs(init_data), webapp_secret(bot_token))
 
 
 def parse_init_data(init_data: str) -> Dict[str, Any]:
@@ -48,3 +65,94 @@ def parse_init_data(init_data: str) -> Dict[str, Any]:
     if "user" in result:
         result["user"] = json.loads(result["user"])
     return result
+
+
+def _copy_init_data(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Copy of parse_init_data output (only 'user' is a nested dict)."""
+    result = dict(data)
+    if "user" in result:
+        result["user"] = dict(result["user"])
+    return result
+
+
+class InitDataValidator:
+    """
+    initData check with a cache of already validated strings.
+
+    The same initData is sent by the Mini App on every reload while the
+    Telegram session lives, so a validated string is cached by its sha256
+    until auth_date + max_age and then re-checked without HMAC and parsing.
+    """
+
+    def __init__(self, bot_token: str, max_age: int, maxsize: int = 10_000):
+        self.secret = webapp_secret(bot_token)
+        self.max_age = max_age
+        self._cache: TTLCache[Dict[str, Any]] = TTLCache(maxsize=maxsize, ttl=max_age)
+
+    def validate(self, init_data: str) -> Optional[Dict[str, Any]]:
+        """
+        Parsed initData, or None if the signature is wrong or it has expired.
+
+        Every call returns its own copy: a caller mutating the result must not
+        change what the next request with the same initData gets.
+        """
+        if not init_data:
+            return None
+        digest = hashlib.sha256(init_data.encode()).digest()
+        cached = self._cache.get(digest)
+        if cached is not None:
+            return _copy_init_data(cached)
+
+        parsed_data = urllib.parse.parse_qs(init_data)
+        if not _check_hash(parsed_data, self.secret):
+            return None
+        try:
+            auth_date = int(parsed_data["auth_date"][0])
+        except (KeyError, ValueError):
+            return None
+        ttl = auth_date + self.max_age - time.time()
+        if ttl <= 0:
+            return None
+
+        result = parse_init_data(init_data)
+        self._cache.set(digest, result, ttl=ttl)
+        return _copy_init_data(result)
+
+
+@dataclass(frozen=True)
+class SessionToken:
+    user_id: uuid.UUID
+    telegram_id: int
+    expires_at: int
+
+
+def _b64(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+
+def issue_session_token(
+    user_id: uuid.UUID, telegram_id: int, bot_token: str, ttl: int
+) -> tuple[str, int]:
+    """Signed token '<user_id>.<telegram_id>.<expires_at>.<sig>' and its expiry."""
+    expires_at = int(time.time()) + ttl
+    payload = f"{user_id.hex}.{telegram_id}.{expires_at}"
+    signature = hmac.new(session_secret(bot_token), payload.encode(), hashlib.sha256)
+    return f"{payload}.{_b64(signature.digest())}", expires_at
+
+
+def verify_session_token(token: str, bot_token: str) -> Optional[SessionToken]:
+    """Token contents, or None if the signature is wrong or it has expired."""
+    payload, _, signature = token.rpartition(".")
+    if not payload:
+        return None
+    expected = hmac.new(session_secret(bot_token), payload.encode(), hashlib.sha256)
+    if not hmac.compare_digest(_b64(expected.digest()), signature):
+        return None
+    try:
+        user_hex, telegram_id, expires_at = payload.split(".")
+        session = SessionToken(uuid.UUID(hex=user_hex), int(telegram_id), int(expires_at))
+    except ValueError:
+        return None
+    if session.expires_at < time.time():
+        return None
+    return session
@@ -5,6 +5,9 @@ from .washbay import WashBay
 from .washtype import WashType
 from .users import User
 from .carwash_admin import CarWashAdmin
+from .payment_event import PaymentEvent
+from .statistic_counter import StatisticCounter, StatisticDelta
+from .analytics import BookingRollup, SlotRollup, RollupWatermark
 
 
-__all__ = ["Booking", "CarWash", "TimeSlot", "WashBay", "WashType", "User", "CarWashAdmin"]
+__all__ = ["Booking", "CarWash", "TimeSlot", "WashBay", "WashType", "User", "CarWashAdmin", "PaymentEvent", "StatisticCounter", "StatisticDelta", "BookingRollup", "SlotRollup", "RollupWatermark"]
@@ -0,0 +1,76 @@
+import uuid
+from datetime import date, datetime
+
+import sqlalchemy as sa
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.core.db import Base
+
+
+class BookingRollup(Base):
+    """
+    Агрегаты броней за час или день по автомойке, боксу и типу мойки.
+
+    Строки пересобираются целиком за (автомойка, день) фоновой задачей
+    (services/analytics.py); day — единица пересборки, bucket — начало часа
+    или дня в зависимости от grain.
+    """
+
+    __tablename__ = "booking_rollups"
+    __table_args__ = (
+        sa.Index("ix_booking_rollups_car_wash_day", "car_wash_id", "day"),
+    )
+
+    car_wash_id: Mapped[uuid.UUID] = mapped_column(
+        sa.ForeignKey("car_washes.id", ondelete="CASCADE"), primary_key=True
+    )
+    grain: Mapped[str] = mapped_column(sa.Text, primary_key=True)
+    bucket: Mapped[datetime] = mapped_column(sa.DateTime, primary_key=True)
+    wash_bay_id: Mapped[uuid.UUID] = mapped_column(
+        sa.ForeignKey("wash_bays.id", ondelete="CASCADE"), primary_key=True
+    )
+    wash_type_id: Mapped[uuid.UUID] = mapped_column(
+        sa.ForeignKey("wash_types.id", ondelete="CASCADE"), primary_key=True
+    )
+    day: Mapped[date] = mapped_column(sa.Date, nullable=False)
+
+    bookings: Mapped[int] = mapped_column(default=0)
+    # Всё ещё confirmed: для прошедших интервалов это неявки
+    confirmed: Mapped[int] = mapped_column(default=0)
+    completed: Mapped[int] = mapped_column(default=0)
+    cancelled: Mapped[int] = mapped_column(default=0)
+    booked_minutes: Mapped[int] = mapped_column(default=0)
+    revenue: Mapped[float] = mapped_column(sa.Float, default=0)
+
+
+class SlotRollup(Base):
+    """Ёмкость бокса за час или день: минуты всех его слотов."""
+
+    __tablename__ = "slot_rollups"
+    __table_args__ = (
+        sa.Index("ix_slot_rollups_car_wash_day", "car_wash_id", "day"),
+    )
+
+    car_wash_id: Mapped[uuid.UUID] = mapped_column(
+        sa.ForeignKey("car_washes.id", ondelete="CASCADE"), primary_key=True
+    )
+    grain: Mapped[str] = mapped_column(sa.Text, primary_key=True)
+    bucket: Mapped[datetime] = mapped_column(sa.DateTime, primary_key=True)
+    wash_bay_id: Mapped[uuid.UUID] = mapped_column(
+        sa.ForeignKey("wash_bays.id", ondelete="CASCADE"), primary_key=True
+    )
+    day: Mapped[date] = mapped_column(sa.Date, nullable=False)
+
+    capacity_minutes: Mapped[int] = mapped_column(default=0)
+
+
+class RollupWatermark(Base):
+    """Момент, до которого изменения броней и слотов уже учтены в агрегатах."""
+
+    __tablename__ = "rollup_watermarks"
+
+    name: Mapped[str] = mapped_column(sa.Text, primary_key=True)
+    watermark: Mapped[datetime] = mapped_column(sa.DateTime, nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(
+        default=datetime.now, onupdate=datetime.now, nullable=False
+    )
@@ -12,6 +12,31 @@ from src.core.db import Base, uniq_str_an
 
 class Booking(Base):
     __tablename__ = "bookings"
+    __table_args__ = (
+        sa.Index(
+            "ix_bookings_guest_phone_slot", "guest_phone", "slot_date", "start_time", "id"
+        ),
+        sa.Index("ix_bookings_guest_phone_status", "guest_phone", "status"),
+        sa.Index(
+            "ix_bookings_car_wash_slot", "car_wash_id", "slot_date", "start_time", "id"
+        ),
+        sa.Index("ix_bookings_payment_status_created_at", "payment_status", "created_at"),
+        sa.Index("ix_bookings_user_id_status", "user_id", "status"),
+        sa.Index(
+            "ix_bookings_pending_expires_at",
+            "expires_at",
+            postgresql_where=sa.text("status = 'pending_payment'"),
+        ),
+        # Поиск изменённых броней для пересборки аналитики (services/analytics.py)
+        sa.Index("ix_bookings_changed_at", sa.text("coalesce(updated_at, created_at)")),
+        sa.Index(
+            "ix_bookings_pending_payment_id",
+            "id",
+            postgresql_where=sa.text(
+                "payment_status = 'pending' AND payment_id IS NOT NULL"
+            ),
+        ),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(primary_key=True, default=uuid.uuid4)
     telegram_id: Mapped[int] = mapped_column(sa.BigInteger, nullable=True)
@@ -49,6 +74,7 @@ class Booking(Base):
 
     status: Mapped[str] = mapped_column(default="confirmed")
     payment_status: Mapped[str] = mapped_column(default="pending")
+    payment_id: Mapped[str] = mapped_column(sa.Text, nullable=True)
 
     expires_at: Mapped[datetime] = mapped_column(sa.DateTime, nullable=True)
     completed_at: Mapped[datetime] = mapped_column(sa.DateTime, nullable=True)
@@ -1,5 +1,5 @@
 import uuid
-from typing import List
+from typing import List, Optional
 
 import sqlalchemy as sa
 from sqlalchemy.orm import relationship, Mapped, mapped_column
@@ -18,6 +18,9 @@ class CarWash(Base):
     address: Mapped[uniq_str_an]
     phone_number: Mapped[uniq_str_an]
     working_hours: Mapped[dict] = mapped_column(JSONB)
+    # Координаты (WGS84); поиск ближайших — по индексу в памяти (services/geo_index)
+    latitude: Mapped[Optional[float]] = mapped_column(nullable=True)
+    longitude: Mapped[Optional[float]] = mapped_column(nullable=True)
     is_active: Mapped[bool] = mapped_column(default=True)
     created_at: Mapped[datetime] = mapped_column(default=datetime.now, nullable=False)
     updated_at: Mapped[datetime] = mapped_column(onupdate=datetime.now, nullable=True)
@@ -0,0 +1,36 @@
+import uuid
+
+import sqlalchemy as sa
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.dialects.postgresql import JSONB
+
+from datetime import datetime
+
+from src.core.db import Base
+
+
+class PaymentEvent(Base):
+    """Входящее уведомление платёжной системы (inbox)."""
+
+    __tablename__ = "payment_events"
+    __table_args__ = (
+        sa.Index(
+            "ix_payment_events_pending",
+            "received_at",
+            postgresql_where=sa.text("status = 'pending'"),
+        ),
+    )
+
+    id: Mapped[uuid.UUID] = mapped_column(primary_key=True, default=uuid.uuid4)
+    # Повторная доставка того же события отбрасывается уникальным ключом
+    event_id: Mapped[str] = mapped_column(sa.Text, unique=True, nullable=False)
+    event: Mapped[str] = mapped_column(sa.Text, nullable=False)
+    payload: Mapped[dict] = mapped_column(JSONB, nullable=False)
+    status: Mapped[str] = mapped_column(default="pending")
+    attempts: Mapped[int] = mapped_column(default=0)
+    error: Mapped[str] = mapped_column(sa.Text, nullable=True)
+    received_at: Mapped[datetime] = mapped_column(default=datetime.now, nullable=False)
+    processed_at: Mapped[datetime] = mapped_column(sa.DateTime, nullable=True)
+
+    def __repr__(self) -> str:
+        return f"<PaymentEvent(event_id={self.event_id}, status={self.status})>"
@@ -0,0 +1,45 @@
+import sqlalchemy as sa
+from sqlalchemy.orm import Mapped, mapped_column
+
+from datetime import datetime
+
+from src.core.db import Base
+
+
+class StatisticCounter(Base):
+    """
+    Свёрнутое значение счётчика статистики.
+
+    Актуальное значение — value плюс ещё не свёрнутые строки statistic_deltas
+    с тем же ключом (см. repositories/statistic.py); полный пересчёт —
+    recount_statistics_service.
+    """
+
+    __tablename__ = "statistic_counters"
+
+    key: Mapped[str] = mapped_column(sa.Text, primary_key=True)
+    value: Mapped[int] = mapped_column(sa.BigInteger, nullable=False, default=0)
+    updated_at: Mapped[datetime] = mapped_column(
+        default=datetime.now, onupdate=datetime.now, nullable=False
+    )
+
+    def __repr__(self) -> str:
+        return f"<StatisticCounter(key={self.key}, value={self.value})>"
+
+
+class StatisticDelta(Base):
+    """
+    Изменение счётчика, записанное транзакцией брони или автомойки.
+
+    Таблица только дополняется: параллельные транзакции не блокируют друг
+    друга на общих строках счётчиков. Фоновая задача сворачивает изменения
+    в statistic_counters (StatisticRepository.fold).
+    """
+
+    __tablename__ = "statistic_deltas"
+    __table_args__ = (sa.Index("ix_statistic_deltas_key", "key"),)
+
+    id: Mapped[int] = mapped_column(sa.BigInteger, sa.Identity(), primary_key=True)
+    key: Mapped[str] = mapped_column(sa.Text, nullable=False)
+    delta: Mapped[int] = mapped_column(sa.BigInteger, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(default=datetime.now, nullable=False)
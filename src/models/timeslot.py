@@ -12,6 +12,23 @@ from src.core.db import Base, uniq_str_an
 
 class TimeSlot(Base):
     __tablename__ = "time_slots"
+    __table_args__ = (
+        sa.Index("ix_time_slots_car_wash_date", "car_wash_id", "slot_date"),
+        sa.Index(
+            "ix_time_slots_available",
+            "car_wash_id",
+            "slot_date",
+            postgresql_where=sa.text("status = 'available'"),
+        ),
+        sa.Index("ix_time_slots_changed_at", sa.text("coalesce(updated_at, created_at)")),
+        sa.Index(
+            "ux_time_slots_bay_date_start",
+            "wash_bay_id",
+            "slot_date",
+            "start_time",
+            unique=True,
+        ),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(primary_key=True, default=uuid.uuid4)
     car_wash_id: Mapped[int] = mapped_column(sa.ForeignKey("car_washes.id"))
@@ -24,7 +24,11 @@ class User(Base):
     created_at: Mapped[datetime] = mapped_column(default=datetime.now, nullable=False)
     updated_at: Mapped[datetime] = mapped_column(onupdate=datetime.now, nullable=True)
 
-    bookings: Mapped[List["Booking"]] = relationship(back_populates="user")
+    # Загружаются только явно (UserRepository.get_one_or_none(*options));
+    # при удалении user_id в бронях обнуляет внешний ключ (ON DELETE SET NULL)
+    bookings: Mapped[List["Booking"]] = relationship(
+        back_populates="user", passive_deletes=True
+    )
     car_wash_admin_roles: Mapped[List["CarWashAdmin"]] = relationship(back_populates="user")
 
 
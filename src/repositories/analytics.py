@@ -0,0 +1,310 @@
+"""
+Репозиторий агрегатов аналитики (booking_rollups, slot_rollups).
+
+Агрегаты пересобираются целиком за пару (автомойка, день): сначала часовые
+строки из bookings/time_slots, затем дневные — из часовых. Пересборка
+идемпотентна, поэтому один и тот же день можно пересобирать повторно.
+Бронь относится к часу своего начала: на часовой гранулярности занятые
+минуты длинной мойки не переносятся на следующий час.
+"""
+
+import uuid
+from datetime import date, datetime, time
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import (
+    Date,
+    DateTime,
+    Integer,
+    Interval,
+    cast,
+    delete,
+    extract,
+    func,
+    literal_column,
+    select,
+    tuple_,
+    union,
+)
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.models.analytics import BookingRollup, RollupWatermark, SlotRollup
+from src.models.booking import Booking
+from src.models.timeslot import TimeSlot
+
+
+CarWashDay = Tuple[uuid.UUID, date]
+
+# Брони, занимающие бокс (для загрузки)
+OCCUPYING_STATUSES = ("confirmed", "in_progress", "completed")
+
+
+# Константы SQL, а не bind-параметры: выражение бакета повторяется в GROUP BY
+ONE_HOUR = literal_column("interval '1 hour'", Interval)
+HOUR_GRAIN = literal_column("'hour'")
+DAY_GRAIN = literal_column("'day'")
+
+
+def _hour_bucket(day, start_time):
+    """Начало часа, в котором начинается слот/бронь: day + час start_time."""
+    return cast(day, DateTime) + cast(extract("hour", start_time), Integer) * ONE_HOUR
+
+
+class AnalyticsRepository:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def get_watermark(self, name: str) -> Optional[datetime]:
+        result = await self.session.execute(
+            select(RollupWatermark.watermark).where(RollupWatermark.name == name)
+        )
+        return result.scalar_one_or_none()
+
+    async def set_watermark(self, name: str, value: datetime) -> None:
+        query = insert(RollupWatermark).values(
+            name=name, watermark=value, updated_at=datetime.now()
+        )
+        query = query.on_conflict_do_update(
+            index_elements=[RollupWatermark.name],
+            set_={
+                "watermark": query.excluded.watermark,
+                "updated_at": query.excluded.updated_at,
+            },
+        )
+        await self.session.execute(query)
+
+    async def changed_days(self, since: Optional[datetime]) -> List[CarWashDay]:
+        """
+        Пары (автомойка, день), у которых брони или слоты менялись после since
+        (по индексам ix_*_changed_at). since=None — все дни.
+        """
+        bookings = select(Booking.car_wash_id, Booking.slot_date)
+        slots = select(TimeSlot.car_wash_id, cast(TimeSlot.slot_date, Date))
+        if since is not None:
+            bookings = bookings.where(
+                func.coalesce(Booking.updated_at, Booking.created_at) > since
+            )
+            slots = slots.where(
+                func.coalesce(TimeSlot.updated_at, TimeSlot.created_at) > since
+            )
+        result = await self.session.execute(union(bookings, slots))
+        return sorted((row[0], row[1]) for row in result.all())
+
+    async def rebuild_days(self, days: Sequence[CarWashDay]) -> None:
+        """Пересобирает часовые и дневные агрегаты за пары (автомойка, день)."""
+        if not days:
+            return
+        days = list(days)
+
+        for model in (BookingRollup, SlotRollup):
+            await self.session.execute(
+                delete(model).where(tuple_(model.car_wash_id, model.day).in_(days))
+            )
+
+        # Брони: часовые строки
+        hour = _hour_bucket(Booking.slot_date, Booking.start_time).label("bucket")
+        occupying = Booking.status.in_(OCCUPYING_STATUSES)
+        await self.session.execute(
+            insert(BookingRollup).from_select(
+                [
+                    "car_wash_id",
+                    "grain",
+                    "bucket",
+                    "wash_bay_id",
+                    "wash_type_id",
+                    "day",
+                    "bookings",
+                    "confirmed",
+                    "completed",
+                    "cancelled",
+                    "booked_minutes",
+                    "revenue",
+                ],
+                select(
+                    Booking.car_wash_id,
+                    HOUR_GRAIN,
+                    hour,
+                    Booking.wash_bay_id,
+                    Booking.wash_type_id,
+                    Booking.slot_date,
+                    func.count(Booking.id),
+                    func.count(Booking.id).filter(Booking.status == "confirmed"),
+                    func.count(Booking.id).filter(Booking.status == "completed"),
+                    func.count(Booking.id).filter(Booking.status == "cancelled"),
+                    func.coalesce(
+                        func.sum(Booking.duration_minutes).filter(occupying), 0
+                    ),
+                    func.coalesce(
+                        func.sum(Booking.final_price).filter(
+                            Booking.payment_status == "paid"
+                        ),
+                        0,
+                    ),
+                )
+                .where(tuple_(Booking.car_wash_id, Booking.slot_date).in_(days))
+                .group_by(
+                    Booking.car_wash_id,
+                    Booking.slot_date,
+                    hour,
+                    Booking.wash_bay_id,
+                    Booking.wash_type_id,
+                ),
+            )
+        )
+
+        # Слоты: ёмкость боксов по часам. slot_date хранится как полночь дня,
+        # поэтому сравниваем с datetime — так работает ix_time_slots_car_wash_date
+        slot_days = [(carwash_id, datetime.combine(day, time.min)) for carwash_id, day in days]
+        slot_day = cast(TimeSlot.slot_date, Date)
+        slot_hour = _hour_bucket(slot_day, TimeSlot.start_time).label("bucket")
+        await self.session.execute(
+            insert(SlotRollup).from_select(
+                ["car_wash_id", "grain", "bucket", "wash_bay_id", "day", "capacity_minutes"],
+                select(
+                    TimeSlot.car_wash_id,
+                    HOUR_GRAIN,
+                    slot_hour,
+                    TimeSlot.wash_bay_id,
+                    slot_day,
+                    cast(
+                        func.sum(extract("epoch", TimeSlot.end_time - TimeSlot.start_time))
+                        / 60,
+                        Integer,
+                    ),
+                )
+                .where(tuple_(TimeSlot.car_wash_id, TimeSlot.slot_date).in_(slot_days))
+                .group_by(TimeSlot.car_wash_id, slot_day, slot_hour, TimeSlot.wash_bay_id),
+            )
+        )
+
+        # Дневные строки — сумма часовых
+        await self.session.execute(
+            insert(BookingRollup).from_select(
+                [
+                    "car_wash_id",
+                    "grain",
+                    "bucket",
+                    "wash_bay_id",
+                    "wash_type_id",
+                    "day",
+                    "bookings",
+                    "confirmed",
+                    "completed",
+                    "cancelled",
+                    "booked_minutes",
+                    "revenue",
+                ],
+                select(
+                    BookingRollup.car_wash_id,
+                    DAY_GRAIN,
+                    cast(BookingRollup.day, DateTime),
+                    BookingRollup.wash_bay_id,
+                    BookingRollup.wash_type_id,
+                    BookingRollup.day,
+                    func.sum(BookingRollup.bookings),
+                    func.sum(BookingRollup.confirmed),
+                    func.sum(BookingRollup.completed),
+                    func.sum(BookingRollup.cancelled),
+                    func.sum(BookingRollup.booked_minutes),
+                    func.sum(BookingRollup.revenue),
+                )
+                .where(
+                    BookingRollup.grain == "hour",
+                    tuple_(BookingRollup.car_wash_id, BookingRollup.day).in_(days),
+                )
+                .group_by(
+                    BookingRollup.car_wash_id,
+                    BookingRollup.day,
+                    BookingRollup.wash_bay_id,
+                    BookingRollup.wash_type_id,
+                ),
+            )
+        )
+        await self.session.execute(
+            insert(SlotRollup).from_select(
+                ["car_wash_id", "grain", "bucket", "wash_bay_id", "day", "capacity_minutes"],
+                select(
+                    SlotRollup.car_wash_id,
+                    DAY_GRAIN,
+                    cast(SlotRollup.day, DateTime),
+                    SlotRollup.wash_bay_id,
+                    SlotRollup.day,
+                    func.sum(SlotRollup.capacity_minutes),
+                )
+                .where(
+                    SlotRollup.grain == "hour",
+                    tuple_(SlotRollup.car_wash_id, SlotRollup.day).in_(days),
+                )
+                .group_by(SlotRollup.car_wash_id, SlotRollup.day, SlotRollup.wash_bay_id),
+            )
+        )
+
+    async def summary(
+        self,
+        carwash_id: uuid.UUID,
+        grain: str,
+        date_from: date,
+        date_to: date,
+        group_by: str,
+        no_show_before: datetime,
+    ) -> Tuple[List[dict], Dict[Optional[str], int]]:
+        """
+        Сводка агрегатов автомойки за [date_from, date_to].
+
+        group_by: bucket | wash_bay | wash_type. Возвращает строки метрик броней
+        (неявки — confirmed в интервалах, начавшихся не позже no_show_before)
+        и ёмкость по тем же ключам; при группировке по типу мойки ёмкость
+        общая, под ключом None.
+        """
+        start = datetime.combine(date_from, time.min)
+        end = datetime.combine(date_to, time.max)
+
+        booking_key = {
+            "bucket": BookingRollup.bucket,
+            "wash_bay": BookingRollup.wash_bay_id,
+            "wash_type": BookingRollup.wash_type_id,
+        }[group_by].label("key")
+        rows = await self.session.execute(
+            select(
+                booking_key,
+                func.sum(BookingRollup.bookings).label("bookings"),
+                func.sum(BookingRollup.completed).label("completed"),
+                func.sum(BookingRollup.cancelled).label("cancelled"),
+                func.coalesce(
+                    func.sum(BookingRollup.confirmed).filter(
+                        BookingRollup.bucket <= no_show_before
+                    ),
+                    0,
+                ).label("no_show"),
+                func.sum(BookingRollup.booked_minutes).label("booked_minutes"),
+                func.sum(BookingRollup.revenue).label("revenue"),
+            )
+            .where(
+                BookingRollup.car_wash_id == carwash_id,
+                BookingRollup.grain == grain,
+                BookingRollup.bucket.between(start, end),
+            )
+            .group_by(booking_key)
+            .order_by(booking_key)
+        )
+
+        capacity = select(func.coalesce(func.sum(SlotRollup.capacity_minutes), 0)).where(
+            SlotRollup.car_wash_id == carwash_id,
+            SlotRollup.grain == grain,
+            SlotRollup.bucket.between(start, end),
+        )
+        if group_by == "wash_type":
+            total = (await self.session.execute(capacity)).scalar_one()
+            return [dict(row._mapping) for row in rows.all()], {None: total}
+
+        slot_key = {"bucket": SlotRollup.bucket, "wash_bay": SlotRollup.wash_bay_id}[
+            group_by
+        ]
+        result = await self.session.execute(
+            capacity.add_columns(slot_key).group_by(slot_key)
+        )
+        return (
+            [dict(row._mapping) for row in rows.all()],
+            {key: minutes for minutes, key in result.all()},
+        )
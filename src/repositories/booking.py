@@ -1,18 +1,25 @@
 import uuid
 import base64
 import hashlib
-from datetime import datetime, timedelta
-from typing import List, Optional
+import math
+from datetime import date, datetime, time, timedelta
+from typing import Any, List, Optional
 
 from fastapi import HTTPException
-from sqlalchemy import select, func
-from sqlalchemy.orm import selectinload
+from sqlalchemy import and_, select, func, update, tuple_
+from sqlalchemy.orm import aliased, joinedload, selectinload
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.models.booking import Booking
 from src.models.carwash import CarWash
 from src.models.timeslot import TimeSlot
+from src.models.washbay import WashBay
 from src.models.washtype import WashType
+from src.repositories.statistic import (
+    StatisticRepository,
+    booking_created_deltas,
+    status_change_deltas,
+)
 from src.schemas.booking import SBookingCreate
 
 
@@ -20,37 +27,6 @@ class BookingRepository:
     def __init__(self, session: AsyncSession):
         self.session = session
 
-    async def statistic_total(self, id: uuid.UUID) -> int:
-        query = select(func.count(Booking.id)).where(Booking.user_id == id)
-        result = await self.session.execute(query)
-        return result.scalar() or 0
-
-    async def statistic_completed(self, id: uuid.UUID) -> int:
-        query = select(func.count(Booking.id)).where(
-            Booking.user_id == id, Booking.status == "completed"
-        )
-        result = await self.session.execute(query)
-        return result.scalar() or 0
-
-    async def get_available_slot(self, time_slot_id: uuid.UUID) -> Optional[TimeSlot]:
-        slot_query = (
-            select(TimeSlot)
-            .where(TimeSlot.id == time_slot_id, TimeSlot.status == "available")
-            .options(selectinload(TimeSlot.wash_bay))
-        )
-        slot_result = await self.session.execute(slot_query)
-        return slot_result.scalar_one_or_none()
-
-    async def get_carwash(self, car_wash_id: uuid.UUID) -> Optional[CarWash]:
-        cw_query = select(CarWash).where(CarWash.id == car_wash_id)
-        cw_result = await self.session.execute(cw_query)
-        return cw_result.scalar_one_or_none()
-
-    async def get_wash_type(self, wash_type_id: uuid.UUID) -> Optional[WashType]:
-        wt_query = select(WashType).where(WashType.id == wash_type_id)
-        wt_result = await self.session.execute(wt_query)
-        return wt_result.scalar_one_or_none()
-
     @staticmethod
     def calculate_price(
         wash_type: WashType, discount: float = 0
@@ -68,26 +44,151 @@ class BookingRepository:
         hash_obj = hashlib.sha256(data.encode())
         return base64.urlsafe_b64encode(hash_obj.digest()[:16]).decode()
 
+    @staticmethod
+    def covered_slots(lead_slot_id: Any, duration_minutes: Any):
+        """
+        id слотов, которые занимает мойка длительностью duration_minutes,
+        начинающаяся в слоте lead_slot_id: слоты того же бокса и дня с началом
+        в [начало ведущего слота, начало + длительность).
+
+        Аргументы — значения или колонки (например, CTE с бронями), поэтому
+        одно и то же условие используется при резервировании, подтверждении
+        и освобождении слотов брони.
+        """
+        lead = aliased(TimeSlot)
+        return (
+            select(TimeSlot.id)
+            .join(
+                lead,
+                and_(
+                    TimeSlot.wash_bay_id == lead.wash_bay_id,
+                    TimeSlot.slot_date == lead.slot_date,
+                ),
+            )
+            .where(
+                lead.id == lead_slot_id,
+                TimeSlot.start_time >= lead.start_time,
+                TimeSlot.start_time
+                < lead.start_time + func.make_interval(0, 0, 0, 0, 0, duration_minutes),
+            )
+        )
+
+    async def reserve_slots(
+        self,
+        time_slot_id: uuid.UUID,
+        car_wash_id: uuid.UUID,
+        wash_type_id: uuid.UUID,
+    ) -> List[Any]:
+        """
+        Атомарно резервирует подряд идущие слоты бокса, которые занимает тип
+        мойки, начиная с time_slot_id, и одним запросом подтягивает автомойку,
+        тип мойки и номер бокса.
+
+        Слоты блокируются FOR UPDATE по возрастанию времени (одинаковый порядок
+        исключает взаимоблокировки), затем UPDATE ... WHERE status = 'available'
+        RETURNING. Возвращает строки зарезервированных слотов по времени
+        начала; если часть слотов занята, строк будет меньше, чем нужно, —
+        вызывающий откатывает транзакцию.
+        """
+        duration = (
+            select(WashType.duration_minutes)
+            .where(WashType.id == wash_type_id)
+            .scalar_subquery()
+        )
+        covered = self.covered_slots(time_slot_id, duration).subquery()
+        locked = (
+            select(TimeSlot.id)
+            .where(TimeSlot.id.in_(select(covered.c.id)))
+            .order_by(TimeSlot.start_time)
+            .with_for_update()
+            .cte("locked")
+        )
+        reserved = (
+            update(TimeSlot)
+            .where(TimeSlot.id.in_(select(locked.c.id)), TimeSlot.status == "available")
+            .values(status="reserved")
+            .returning(
+                TimeSlot.id,
+                TimeSlot.wash_bay_id,
+                TimeSlot.slot_date,
+                TimeSlot.start_time,
+                TimeSlot.end_time,
+            )
+            .cte("reserved")
+        )
+        query = (
+            select(reserved, WashBay.bay_number, CarWash, WashType)
+            .select_from(reserved)
+            .outerjoin(WashBay, WashBay.id == reserved.c.wash_bay_id)
+            .outerjoin(CarWash, CarWash.id == car_wash_id)
+            .outerjoin(WashType, WashType.id == wash_type_id)
+            .order_by(reserved.c.start_time)
+        )
+        result = await self.session.execute(query)
+        return result.all()
+
+    async def set_slots_status(
+        self,
+        booking_ids: List[uuid.UUID],
+        from_statuses: tuple[str, ...],
+        to_status: str,
+    ) -> List[uuid.UUID]:
+        """
+        Переводит все слоты броней (с учётом длительности мойки) из статусов
+        from_statuses в to_status. Возвращает id изменённых слотов.
+        """
+        bookings = (
+            select(Booking.time_slot_id, Booking.duration_minutes)
+            .where(Booking.id.in_(booking_ids))
+            .subquery()
+        )
+        covered = self.covered_slots(bookings.c.time_slot_id, bookings.c.duration_minutes)
+        result = await self.session.execute(
+            update(TimeSlot)
+            .where(TimeSlot.id.in_(covered), TimeSlot.status.in_(from_statuses))
+            .values(status=to_status)
+            .returning(TimeSlot.id)
+            .execution_options(synchronize_session="fetch")
+        )
+        return list(result.scalars().all())
+
     async def create_booking(
-        self, data: SBookingCreate
-    ) -> tuple[Booking, TimeSlot, CarWash, WashType]:
-        # 1. Проверяем доступность слота
-        slot = await self.get_available_slot(data.time_slot_id)
-        if not slot:
+        self, data: SBookingCreate, slot_minutes: int
+    ) -> tuple[Booking, List[Any], CarWash, WashType]:
+        """
+        Создаёт бронирование на столько подряд идущих слотов одного бокса,
+        сколько занимает тип мойки (slot_minutes — длина слота).
+
+        Вместо ORM-объектов слотов возвращает строки резервирования
+        (id, wash_bay_id, slot_date, start_time, end_time, bay_number)
+        по возрастанию времени; первая — слот начала мойки.
+        """
+        # 1-3. Резервируем слоты и получаем автомойку и тип мойки за один запрос.
+        # Ошибки ниже откатывают транзакцию вместе с резервированием слотов.
+        rows = await self.reserve_slots(
+            data.time_slot_id, data.car_wash_id, data.wash_type_id
+        )
+        if not rows or rows[0].id != data.time_slot_id:
             raise HTTPException(
                 status_code=400, detail="Слот недоступен или уже забронирован"
             )
 
-        # 2. Проверяем автомойку
-        carwash = await self.get_carwash(data.car_wash_id)
+        carwash = rows[0].CarWash
         if not carwash:
             raise HTTPException(status_code=404, detail="Автомойка не найдена")
 
-        # 3. Получаем тип мойки
-        wash_type = await self.get_wash_type(data.wash_type_id)
+        wash_type = rows[0].WashType
         if not wash_type:
             raise HTTPException(status_code=404, detail="Тип мойки не найден")
 
+        if len(rows) < math.ceil(wash_type.duration_minutes / slot_minutes):
+            raise HTTPException(
+                status_code=400,
+                detail="Недостаточно свободного времени подряд для выбранного типа мойки",
+            )
+
+        slot = rows[0]
+
         # 4. Рассчитываем цену
         price, discount_amount, final_price = self.calculate_price(
             wash_type, 0
@@ -95,6 +196,8 @@ class BookingRepository:
 
         # 5. Создаем бронирование
         booking = Booking(
+            user_id=data.user_id,
+            telegram_id=data.telegram_id,
             car_wash_id=data.car_wash_id,
             wash_bay_id=slot.wash_bay_id,
             time_slot_id=data.time_slot_id,
@@ -105,7 +208,7 @@ class BookingRepository:
             car_model=data.car_model,
             slot_date=slot.slot_date,
             start_time=slot.start_time,
-            end_time=slot.end_time,
+            end_time=rows[-1].end_time,
             duration_minutes=wash_type.duration_minutes,
             price=price,
             discount=discount_amount,
@@ -116,15 +219,124 @@ class BookingRepository:
             notes=data.notes,
         )
         self.session.add(booking)
+        await StatisticRepository(self.session).increment(
+            booking_created_deltas(booking.status, booking.user_id)
+        )
 
-        # 6. Блокируем слот
-        slot.status = "reserved"
-
-        # 7. Сохраняем изменения в БД
+        # 6. Сохраняем изменения в БД
         await self.session.flush()
         await self.session.refresh(booking)
 
-        return booking, slot, carwash, wash_type
+        return booking, rows, carwash, wash_type
+
+    @staticmethod
+    def details_query():
+        """
+        Проекция бронирования ровно с теми колонками, что нужны
+        SBookingWithDetails: бронь + названия автомойки, типа мойки и номер бокса
+        одним запросом с JOIN, без загрузки ORM-объектов.
+        """
+        return (
+            select(
+                Booking.id,
+                Booking.user_id,
+                Booking.car_wash_id,
+                Booking.wash_bay_id,
+                Booking.time_slot_id,
+                Booking.wash_type_id,
+                Booking.guest_phone,
+                Booking.guest_name,
+                Booking.car_plate,
+                Booking.car_model,
+                Booking.booking_date,
+                Booking.slot_date,
+                Booking.start_time,
+                Booking.end_time,
+                Booking.duration_minutes,
+                Booking.price,
+                Booking.discount,
+                Booking.final_price,
+                Booking.status,
+                Booking.payment_status,
+                Booking.notes,
+                Booking.cancellation_reason,
+                Booking.created_at,
+                CarWash.name.label("car_wash_name"),
+                CarWash.address.label("car_wash_address"),
+                WashType.name.label("wash_type_name"),
+                WashBay.bay_number,
+            )
+            .select_from(Booking)
+            .outerjoin(CarWash, CarWash.id == Booking.car_wash_id)
+            .outerjoin(WashType, WashType.id == Booking.wash_type_id)
+            .outerjoin(WashBay, WashBay.id == Booking.wash_bay_id)
+        )
+
+    @staticmethod
+    def encode_cursor(booking: Any) -> str:
+        """Курсор keyset-пагинации: (slot_date, start_time, id) последней записи."""
+        raw = f"{booking.slot_date.isoformat()}|{booking.start_time.isoformat()}|{booking.id}"
+        return base64.urlsafe_b64encode(raw.encode()).decode()
+
+    @staticmethod
+    def decode_cursor(cursor: str) -> tuple[date, time, uuid.UUID]:
+        try:
+            raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+            slot_date, start_time, booking_id = raw.split("|")
+            return (
+                date.fromisoformat(slot_date),
+                time.fromisoformat(start_time),
+                uuid.UUID(booking_id),
+            )
+        except (ValueError, UnicodeDecodeError):
+            raise HTTPException(status_code=400, detail="Некорректный курсор")
+
+    async def _paginate(
+        self,
+        base_query,
+        descending: bool,
+        page: int,
+        per_page: int,
+        cursor: Optional[str],
+        with_total: bool,
+    ) -> tuple[List[Any], Optional[int], Optional[str]]:
+        """
+        Общая пагинация списков бронирований по ключу (slot_date, start_time, id).
+
+        С курсором выборка продолжается строго после последней записи
+        предыдущей страницы и не зависит от глубины; без курсора используется
+        номер страницы. Общее количество считается только по запросу.
+        """
+        total = None
+        if with_total:
+            count_query = select(func.count()).select_from(base_query.subquery())
+            total = (await self.session.execute(count_query)).scalar() or 0
+
+        key = tuple_(Booking.slot_date, Booking.start_time, Booking.id)
+        data_query = base_query
+        if cursor:
+            after = tuple_(*self.decode_cursor(cursor))
+            data_query = data_query.where(key < after if descending else key > after)
+        else:
+            data_query = data_query.offset((page - 1) * per_page)
+
+        order = (
+            [Booking.slot_date.desc(), Booking.start_time.desc(), Booking.id.desc()]
+            if descending
+            else [Booking.slot_date, Booking.start_time, Booking.id]
+        )
+        # Берём на одну запись больше, чтобы узнать, есть ли следующая страница
+        data_query = data_query.order_by(*order).limit(per_page + 1)
+
+        result = await self.session.execute(data_query)
+        bookings = list(result.all())
+
+        next_cursor = None
+        if len(bookings) > per_page:
+            bookings = bookings[:per_page]
+            next_cursor = self.encode_cursor(bookings[-1])
+
+        return bookings, total, next_cursor
 
     async def get_by_phone(
         self,
@@ -132,36 +344,23 @@ class BookingRepository:
         status: Optional[str],
         page: int,
         per_page: int,
-    ) -> tuple[List[Booking], int]:
-        """Получает бронирования по номеру телефона с пагинацией."""
-        # Базовый запрос для фильтрации
-        base_query = select(Booking).where(Booking.guest_phone == phone)
+        cursor: Optional[str] = None,
+        with_total: bool = False,
+    ) -> tuple[List[Any], Optional[int], Optional[str]]:
+        """Получает бронирования по номеру телефона с пагинацией (строки details_query)."""
+        base_query = self.details_query().where(Booking.guest_phone == phone)
         if status:
             base_query = base_query.where(Booking.status == status)
 
-        # Запрос для подсчета общего количества
-        count_query = select(func.count()).select_from(base_query.subquery())
-        total_result = await self.session.execute(count_query)
-        total = total_result.scalar() or 0
-
-        # Основной запрос для получения данных
-        offset = (page - 1) * per_page
-        data_query = (
-            base_query.order_by(Booking.slot_date.desc(), Booking.start_time.desc())
-            .offset(offset)
-            .limit(per_page)
-            .options(
-                selectinload(Booking.car_wash),
-                selectinload(Booking.wash_type),
-                selectinload(Booking.wash_bay),
-            )
+        return await self._paginate(
+            base_query,
+            descending=True,
+            page=page,
+            per_page=per_page,
+            cursor=cursor,
+            with_total=with_total,
         )
 
-        result = await self.session.execute(data_query)
-        bookings = result.scalars().all()
-
-        return bookings, total
-
     async def get_by_id(self, booking_id: uuid.UUID) -> Optional[Booking]:
         """Получает бронирование по ID с загрузкой связей."""
         query = (
@@ -177,17 +376,28 @@ class BookingRepository:
         result = await self.session.execute(query)
         return result.scalar_one_or_none()
 
+    async def get_details_by_id(self, booking_id: uuid.UUID) -> Optional[Any]:
+        """Получает бронирование для чтения одним запросом (строка details_query)."""
+        query = self.details_query().where(Booking.id == booking_id)
+        result = await self.session.execute(query)
+        return result.one_or_none()
+
     async def get_for_carwash(
         self,
         carwash_id: uuid.UUID,
-        date_from: Optional[datetime.date],
-        date_to: Optional[datetime.date],
+        date_from: Optional[date],
+        date_to: Optional[date],
         status: Optional[str],
         page: int,
         per_page: int,
-    ) -> tuple[List[Booking], int]:
-        """Получает бронирования для конкретной автомойки с фильтрами и пагинацией."""
-        base_query = select(Booking).where(Booking.car_wash_id == carwash_id)
+        cursor: Optional[str] = None,
+        with_total: bool = False,
+    ) -> tuple[List[Any], Optional[int], Optional[str]]:
+        """
+        Получает бронирования для конкретной автомойки с фильтрами и пагинацией
+        (строки details_query).
+        """
+        base_query = self.details_query().where(Booking.car_wash_id == carwash_id)
 
         if date_from:
             base_query = base_query.where(Booking.slot_date >= date_from)
@@ -196,27 +406,22 @@ class BookingRepository:
         if status:
             base_query = base_query.where(Booking.status == status)
 
-        count_query = select(func.count()).select_from(base_query.subquery())
-        total_result = await self.session.execute(count_query)
-        total = total_result.scalar() or 0
-
-        offset = (page - 1) * per_page
-        data_query = (
-            base_query.order_by(Booking.slot_date, Booking.start_time)
-            .offset(offset)
-            .limit(per_page)
-            .options(selectinload(Booking.wash_type), selectinload(Booking.wash_bay))
+        return await self._paginate(
+            base_query,
+            descending=False,
+            page=page,
+            per_page=per_page,
+            cursor=cursor,
+            with_total=with_total,
         )
 
-        result = await self.session.execute(data_query)
-        bookings = result.scalars().all()
-
-        return bookings, total
-
     async def update_status(
         self, booking: Booking, new_status: str, completed_at: Optional[datetime] = None
     ) -> Booking:
         """Обновляет статус бронирования."""
+        await StatisticRepository(self.session).increment(
+            status_change_deltas(booking.status, new_status, booking.user_id)
+        )
         booking.status = new_status
         if completed_at:
             booking.completed_at = completed_at
@@ -231,14 +436,229 @@ class BookingRepository:
         await self.session.refresh(booking)
         return booking
 
+    async def get_for_payment_update(self, booking_id: uuid.UUID) -> Optional[Booking]:
+        """
+        Загружает бронирование со слотом и блокирует строку брони до конца
+        транзакции, чтобы переходы статусов по платежу не пересекались.
+        """
+        query = (
+            select(Booking)
+            .where(Booking.id == booking_id)
+            .options(joinedload(Booking.time_slot))
+            .with_for_update(of=Booking)
+        )
+        result = await self.session.execute(query)
+        return result.scalar_one_or_none()
+
     async def find_pending_payment(self) -> Optional[Booking]:
-        """Находит последнее бронирование, ожидающее оплаты."""
+        """
+        Находит последнее бронирование, ожидающее оплаты, и блокирует его.
+
+        Отменённые по сроку брони сохраняют payment_status="pending" для
+        сверки (expire_unpaid), но их слоты уже освобождены — они не подходят.
+        """
         query = (
             select(Booking)
-            .where(Booking.payment_status == "pending")
+            .where(
+                Booking.status == "pending_payment",
+                Booking.payment_status == "pending",
+            )
             .order_by(Booking.created_at.desc())
             .options(selectinload(Booking.time_slot))
             .limit(1)
+            .with_for_update(of=Booking)
         )
         result = await self.session.execute(query)
         return result.scalar_one_or_none()
+
+    async def try_advisory_lock(self, lock_id: int) -> bool:
+        """
+        Пытается взять транзакционную advisory-блокировку Postgres.
+
+        Блокировка снимается при commit/rollback; False — её держит другой процесс.
+        """
+        result = await self.session.execute(
+            select(func.pg_try_advisory_xact_lock(lock_id))
+        )
+        return bool(result.scalar())
+
+    async def expire_unpaid(
+        self, now: datetime, batch_size: int, reason: str
+    ) -> tuple[int, List[uuid.UUID]]:
+        """
+        Отменяет до batch_size неоплаченных броней с истёкшим expires_at и
+        освобождает их слоты одним запросом.
+
+        Строки выбираются по частичному индексу ix_bookings_pending_expires_at
+        с FOR UPDATE SKIP LOCKED, поэтому параллельные вызовы не пересекаются.
+        payment_status остаётся pending: платёж мог пройти у провайдера уже
+        после срока, и сверка должна найти такую бронь (оплата без
+        подтверждения — возврат). Возвращает (количество отменённых броней,
+        id освобождённых слотов).
+        """
+        expired = (
+            select(Booking.id)
+            .where(Booking.status == "pending_payment", Booking.expires_at < now)
+            .order_by(Booking.expires_at)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+            .cte("expired")
+        )
+        cancelled = (
+            update(Booking)
+            .where(Booking.id.in_(select(expired.c.id)))
+            .values(
+                status="cancelled",
+                cancelled_at=now,
+                cancellation_reason=reason,
+                updated_at=now,
+            )
+            .returning(Booking.id, Booking.time_slot_id, Booking.duration_minutes)
+            .cte("cancelled")
+        )
+        released = (
+            update(TimeSlot)
+            .where(
+                TimeSlot.id.in_(
+                    self.covered_slots(
+                        cancelled.c.time_slot_id, cancelled.c.duration_minutes
+                    )
+                ),
+                TimeSlot.status == "reserved",
+            )
+            .values(status="available", updated_at=now)
+            .returning(TimeSlot.id)
+            .cte("released")
+        )
+        expired, released_ids = await self._count_and_slots(cancelled, released)
+        await StatisticRepository(self.session).increment(
+            status_change_deltas("pending_payment", "cancelled", count=expired)
+        )
+        return expired, released_ids
+
+    async def _count_and_slots(self, bookings, slots) -> tuple[int, List[uuid.UUID]]:
+        """
+        Выполняет пару изменяющих CTE (брони и их слоты) одним запросом и
+        возвращает (количество броней, id слотов).
+        """
+        query = select(
+            select(func.count()).select_from(bookings).scalar_subquery(),
+            select(func.array_agg(slots.c.id)).scalar_subquery(),
+        )
+        count, slot_ids = (await self.session.execute(query)).one()
+        return count, list(slot_ids or [])
+
+    async def get_pending_payments_page(
+        self, after_id: Optional[uuid.UUID], limit: int
+    ) -> List[Any]:
+        """
+        Страница броней, ожидающих подтверждения оплаты, по возрастанию id
+        (keyset по частичному индексу ix_bookings_pending_payment_id).
+        Возвращает строки (id, payment_id).
+        """
+        query = (
+            select(Booking.id, Booking.payment_id)
+            .where(Booking.payment_status == "pending", Booking.payment_id.is_not(None))
+            .order_by(Booking.id)
+            .limit(limit)
+        )
+        if after_id is not None:
+            query = query.where(Booking.id > after_id)
+        result = await self.session.execute(query)
+        return result.all()
+
+    async def _transition_pending_payment(
+        self,
+        booking_ids: List[uuid.UUID],
+        booking_values: dict,
+        slot_from: str,
+        slot_to: str,
+        now: datetime,
+    ) -> tuple[int, List[uuid.UUID]]:
+        """
+        Одним запросом переводит брони со статусом pending_payment из списка
+        в новый статус и меняет статус их слотов slot_from -> slot_to.
+        Возвращает (количество переведённых броней, id изменённых слотов).
+        """
+        moved = (
+            update(Booking)
+            .where(
+                Booking.id.in_(booking_ids),
+                Booking.payment_status == "pending",
+                Booking.status == "pending_payment",
+            )
+            .values(**booking_values, updated_at=now)
+            .returning(Booking.time_slot_id, Booking.duration_minutes)
+            .cte("moved")
+        )
+        slots = (
+            update(TimeSlot)
+            .where(
+                TimeSlot.id.in_(
+                    self.covered_slots(moved.c.time_slot_id, moved.c.duration_minutes)
+                ),
+                TimeSlot.status == slot_from,
+            )
+            .values(status=slot_to, updated_at=now)
+            .returning(TimeSlot.id)
+            .cte("slots")
+        )
+        count, slot_ids = await self._count_and_slots(moved, slots)
+        # pending_payment -> confirmed/cancelled не меняет счётчики пользователя
+        await StatisticRepository(self.session).increment(
+            status_change_deltas("pending_payment", booking_values["status"], count=count)
+        )
+        return count, slot_ids
+
+    async def _set_payment_status(
+        self, booking_ids: List[uuid.UUID], payment_status: str, now: datetime
+    ) -> int:
+        """Меняет только статус оплаты у броней, всё ещё ожидающих оплату."""
+        result = await self.session.execute(
+            update(Booking)
+            .where(Booking.id.in_(booking_ids), Booking.payment_status == "pending")
+            .values(payment_status=payment_status, updated_at=now)
+        )
+        return result.rowcount
+
+    async def bulk_mark_paid(
+        self, booking_ids: List[uuid.UUID], now: datetime
+    ) -> tuple[int, int]:
+        """
+        Отмечает брони оплаченными: pending_payment -> confirmed, слот -> booked.
+
+        Брони, которые уже ушли из pending_payment (например, отменены по
+        истечении срока), только получают payment_status='paid' — по ним
+        нужен возврат. Возвращает (подтверждено, оплачено без подтверждения).
+        """
+        confirmed, _ = await self._transition_pending_payment(
+            booking_ids,
+            {"status": "confirmed", "payment_status": "paid"},
+            slot_from="reserved",
+            slot_to="booked",
+            now=now,
+        )
+        paid_only = await self._set_payment_status(booking_ids, "paid", now)
+        return confirmed, paid_only
+
+    async def bulk_mark_payment_failed(
+        self, booking_ids: List[uuid.UUID], now: datetime
+    ) -> tuple[int, List[uuid.UUID]]:
+        """
+        Отмечает платежи отменёнными: pending_payment -> cancelled, слоты
+        возвращаются в продажу. Возвращает (отменено броней, id освобождённых слотов).
+        """
+        cancelled, released = await self._transition_pending_payment(
+            booking_ids,
+            {
+                "status": "cancelled",
+                "payment_status": "failed",
+                "cancelled_at": now,
+                "cancellation_reason": "Платеж отменен",
+            },
+            slot_from="reserved",
+            slot_to="available",
+            now=now,
+        )
+        await self._set_payment_status(booking_ids, "failed", now)
+        return cancelled, released
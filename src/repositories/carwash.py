@@ -1,12 +1,19 @@
 import uuid
+from collections import Counter
 from typing import List, Optional
 
 from sqlalchemy import select, func
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.core.cache import catalog_cache, CARWASH_LIST_KEY, carwash_key
 from src.models.carwash import CarWash
 from src.models.booking import Booking
 from src.models.washbay import WashBay
+from src.repositories.statistic import (
+    CARWASHES_KEY,
+    StatisticRepository,
+    booking_created_deltas,
+)
 
 from src.schemas.carwash import SCarWashCreate, SCarWashUpdate
 from src.schemas.washbay import SWashBayCreate
@@ -36,8 +43,10 @@ class CarWashRepository:
         """Создать новую автомойку."""
         carwash = CarWash(**data.model_dump())
         self.session.add(carwash)
+        await StatisticRepository(self.session).increment({CARWASHES_KEY: 1})
         await self.session.commit()
         await self.session.refresh(carwash)
+        await catalog_cache.invalidate(CARWASH_LIST_KEY)
         return carwash
 
     async def update(self, carwash: CarWash, data: SCarWashUpdate) -> CarWash:
@@ -48,12 +57,24 @@ class CarWashRepository:
                 setattr(carwash, field, value)
         await self.session.commit()
         await self.session.refresh(carwash)
+        await catalog_cache.invalidate(CARWASH_LIST_KEY, carwash_key(carwash.id))
         return carwash
 
     async def delete(self, carwash: CarWash) -> None:
-        """Удалить автомойку."""
+        """Удалить автомойку (её брони удаляются каскадом — вычитаем их из счётчиков)."""
+        carwash_id = carwash.id
+        removed = await self.session.execute(
+            select(Booking.status, Booking.user_id, func.count(Booking.id))
+            .where(Booking.car_wash_id == carwash_id)
+            .group_by(Booking.status, Booking.user_id)
+        )
+        deltas = Counter({CARWASHES_KEY: -1})
+        for status, user_id, count in removed.all():
+            deltas.update(booking_created_deltas(status, user_id, count=-count))
         await self.session.delete(carwash)
+        await StatisticRepository(self.session).increment(deltas)
         await self.session.commit()
+        await catalog_cache.invalidate(CARWASH_LIST_KEY, carwash_key(carwash_id))
 
     async def add_bay(self, carwash_id: uuid.UUID, data: SWashBayCreate) -> WashBay:
         """Добавляет моечный бокс к автомойке."""
@@ -66,28 +87,3 @@ class CarWashRepository:
         await self.session.commit()
         await self.session.refresh(wash_bay)
         return wash_bay
-
-    async def get_stats(self) -> dict:
-        """Получить статистику."""
-        carwash_count_query = select(func.count(CarWash.id))
-        carwash_count = (await self.session.execute(carwash_count_query)).scalar() or 0
-
-        # Другую статистику можно добавить здесь, если они не связаны с бронированиями
-        return {"carwash_count": carwash_count}
-
-    async def total_bookings(self) -> dict:
-        # Статистика общая , а не под пользователя
-        total_bookings_query = select(func.count(Booking.id))
-        total_bookings = (
-            await self.session.execute(total_bookings_query)
-        ).scalar() or 0
-        return {"total_bookings": total_bookings}
-
-    async def confirmed_bookings(self) -> dict:
-        confirmed_bookings_query = select(func.count(Booking.id)).where(
-            Booking.status == "confirmed"
-        )
-        confirmed_bookings = (
-            await self.session.execute(confirmed_bookings_query)
-        ).scalar() or 0
-        return {"confirmed_bookings": confirmed_bookings}
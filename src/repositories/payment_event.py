@@ -0,0 +1,46 @@
+"""
+Репозиторий входящих событий платёжной системы.
+"""
+
+from typing import List
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.models.payment_event import PaymentEvent
+
+
+class PaymentEventRepository:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def add(self, event_id: str, event: str, payload: dict) -> bool:
+        """
+        Сохраняет событие. Возвращает False, если событие с таким
+        event_id уже было принято.
+        """
+        query = (
+            insert(PaymentEvent)
+            .values(event_id=event_id, event=event, payload=payload)
+            .on_conflict_do_nothing(index_elements=["event_id"])
+            .returning(PaymentEvent.id)
+        )
+        result = await self.session.execute(query)
+        return result.scalar_one_or_none() is not None
+
+    async def claim_pending(self, batch_size: int) -> List[PaymentEvent]:
+        """
+        Забирает пачку необработанных событий в порядке поступления.
+
+        FOR UPDATE SKIP LOCKED: параллельные воркеры получают разные события.
+        """
+        query = (
+            select(PaymentEvent)
+            .where(PaymentEvent.status == "pending")
+            .order_by(PaymentEvent.received_at)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+        )
+        result = await self.session.execute(query)
+        return list(result.scalars().all())
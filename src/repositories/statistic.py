@@ -0,0 +1,200 @@
+"""
+Репозиторий счётчиков статистики.
+
+Транзакции броней и автомоек не обновляют строки счётчиков, а дописывают
+изменения в statistic_deltas (только INSERT): общие строки вроде
+bookings:total не сериализуют запись броней и не участвуют во
+взаимоблокировках. Значение счётчика — свёрнутое value из statistic_counters
+плюс ещё не свёрнутые изменения; фоновая задача регулярно сворачивает их
+(fold), поэтому чтение — выборка по ключу вместо count(*) по bookings.
+
+Ключи:
+- carwashes — количество автомоек;
+- bookings:total — всего броней;
+- bookings:status:<status> — броней в статусе;
+- user:<id>:total, user:<id>:completed — брони пользователя.
+"""
+
+import uuid
+from collections import Counter
+from datetime import datetime
+from typing import Dict, Iterable, Mapping, Optional
+
+from sqlalchemy import DateTime, delete, func, literal, select, union_all
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.models.booking import Booking
+from src.models.carwash import CarWash
+from src.models.statistic_counter import StatisticCounter, StatisticDelta
+
+
+CARWASHES_KEY = "carwashes"
+BOOKINGS_TOTAL_KEY = "bookings:total"
+
+
+def booking_status_key(status: str) -> str:
+    return f"bookings:status:{status}"
+
+
+def user_total_key(user_id: uuid.UUID) -> str:
+    return f"user:{user_id}:total"
+
+
+def user_completed_key(user_id: uuid.UUID) -> str:
+    return f"user:{user_id}:completed"
+
+
+def booking_created_deltas(
+    status: str, user_id: Optional[uuid.UUID] = None, count: int = 1
+) -> Dict[str, int]:
+    """Изменения счётчиков при создании count броней в статусе status."""
+    deltas = {BOOKINGS_TOTAL_KEY: count, booking_status_key(status): count}
+    if user_id is not None:
+        deltas[user_total_key(user_id)] = count
+        if status == "completed":
+            deltas[user_completed_key(user_id)] = count
+    return deltas
+
+
+def status_change_deltas(
+    old_status: str,
+    new_status: str,
+    user_id: Optional[uuid.UUID] = None,
+    count: int = 1,
+) -> Dict[str, int]:
+    """Изменения счётчиков при переводе count броней old_status -> new_status."""
+    if old_status == new_status or not count:
+        return {}
+    deltas = {booking_status_key(old_status): -count, booking_status_key(new_status): count}
+    if user_id is not None:
+        if new_status == "completed":
+            deltas[user_completed_key(user_id)] = count
+        elif old_status == "completed":
+            deltas[user_completed_key(user_id)] = -count
+    return deltas
+
+
+class StatisticRepository:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def increment(self, deltas: Mapping[str, int]) -> None:
+        """Дописывает изменения счётчиков одним INSERT, без блокировки строк."""
+        now = datetime.now()
+        rows = [
+            {"key": key, "delta": value, "created_at": now}
+            for key, value in deltas.items()
+            if value
+        ]
+        if rows:
+            await self.session.execute(insert(StatisticDelta).values(rows))
+
+    async def get_many(self, keys: Iterable[str]) -> Dict[str, int]:
+        """Значения счётчиков с учётом несвёрнутых изменений; нет ключа — 0."""
+        keys = list(keys)
+        parts = union_all(
+            select(StatisticCounter.key, StatisticCounter.value.label("value")).where(
+                StatisticCounter.key.in_(keys)
+            ),
+            select(StatisticDelta.key, StatisticDelta.delta.label("value")).where(
+                StatisticDelta.key.in_(keys)
+            ),
+        ).subquery()
+        query = select(parts.c.key, func.sum(parts.c.value)).group_by(parts.c.key)
+        values = {key: int(value) for key, value in (await self.session.execute(query)).all()}
+        return {key: values.get(key, 0) for key in keys}
+
+    async def fold(self, batch_size: int) -> int:
+        """
+        Переносит до batch_size изменений в statistic_counters одним запросом.
+
+        Удаляются только видимые (закоммиченные) строки: изменение транзакции,
+        которая закоммитится позже, останется и свернётся в следующий раз.
+        Возвращает количество свёрнутых изменений.
+        """
+        batch = (
+            select(StatisticDelta.id)
+            .order_by(StatisticDelta.id)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+            .scalar_subquery()
+        )
+        folded = (
+            delete(StatisticDelta)
+            .where(StatisticDelta.id.in_(batch))
+            .returning(StatisticDelta.key, StatisticDelta.delta)
+            .cte("folded")
+        )
+        summed = (
+            select(
+                folded.c.key,
+                func.sum(folded.c.delta).label("value"),
+                literal(datetime.now(), DateTime).label("updated_at"),
+            )
+            .group_by(folded.c.key)
+            # Порядок ключей одинаков во всех свёртках
+            .order_by(folded.c.key)
+        )
+        upsert = insert(StatisticCounter).from_select(
+            ["key", "value", "updated_at"], summed
+        )
+        upsert = upsert.on_conflict_do_update(
+            index_elements=[StatisticCounter.key],
+            set_={
+                "value": StatisticCounter.value + upsert.excluded.value,
+                "updated_at": upsert.excluded.updated_at,
+            },
+        ).cte("upsert")
+        result = await self.session.execute(
+            select(select(func.count()).select_from(folded).scalar_subquery()).add_cte(
+                upsert
+            )
+        )
+        return result.scalar_one()
+
+    async def recount(self) -> Dict[str, int]:
+        """
+        Пересчитывает все счётчики по снимку данных и перезаписывает их.
+
+        Вызывается в транзакции REPEATABLE READ: подсчёт и удаление изменений
+        видят один снимок. Изменения, видимые в снимке, уже учтены подсчётом и
+        удаляются; изменения транзакций, закоммиченных после снимка, ему не
+        видны, остаются в statistic_deltas и свернутся поверх пересчитанных
+        значений. Запись броней при этом не блокируется.
+        """
+        values: Counter = Counter()
+        values[CARWASHES_KEY] = (
+            await self.session.execute(select(func.count(CarWash.id)))
+        ).scalar_one()
+
+        by_status = await self.session.execute(
+            select(Booking.status, func.count(Booking.id)).group_by(Booking.status)
+        )
+        for status, count in by_status.all():
+            values[booking_status_key(status)] = count
+            values[BOOKINGS_TOTAL_KEY] += count
+
+        by_user = await self.session.execute(
+            select(
+                Booking.user_id,
+                func.count(Booking.id),
+                func.count(Booking.id).filter(Booking.status == "completed"),
+            )
+            .where(Booking.user_id.is_not(None))
+            .group_by(Booking.user_id)
+        )
+        for user_id, total, completed in by_user.all():
+            values[user_total_key(user_id)] = total
+            if completed:
+                values[user_completed_key(user_id)] = completed
+
+        await self.session.execute(delete(StatisticDelta))
+        await self.session.execute(delete(StatisticCounter))
+        now = datetime.now()
+        self.session.add_all(
+            StatisticCounter(key=key, value=value, updated_at=now)
+            for key, value in values.items()
+        )
+        await self.session.flush()
+        return dict(values)
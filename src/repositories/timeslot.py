@@ -3,34 +3,125 @@
 """
 
 import uuid
-from typing import List, Dict, Any
-from datetime import date
+from itertools import islice
+from typing import Iterable, Dict, Any
+from datetime import date, timedelta
 
-from sqlalchemy import select, func, insert
+from sqlalchemy import Date, cast, select, func
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.models.timeslot import TimeSlot
+from src.models.washbay import WashBay
+from src.models.carwash import CarWash
+
+# Размер порции для массовой вставки слотов
+BULK_CHUNK_SIZE = 1000
 
 
 class TimeSlotRepository:
     model = TimeSlot
 
     def __init__(self, session: AsyncSession):
-        super().__init__(session)
+        self.session = session
+
+    async def count_available_by_day(
+        self, carwash_id: uuid.UUID, date_from: date, date_to: date
+    ):
+        """
+        Количество свободных слотов автомойки по дням диапазона одним запросом
+        (slot_day, available). Дни без единого слота в результат не попадают.
+        """
+        slot_day = cast(self.model.slot_date, Date).label("slot_day")
+        query = (
+            select(
+                slot_day,
+                func.count(self.model.id)
+                .filter(self.model.status == "available")
+                .label("available"),
+            )
+            .where(
+                self.model.car_wash_id == carwash_id,
+                self.model.slot_date >= date_from,
+                self.model.slot_date < date_to + timedelta(days=1),
+            )
+            .group_by(slot_day)
+        )
+        result = await self.session.execute(query)
+        return result.all()
 
-    async def count_available_slots(self, carwash_id: uuid.UUID, on_date: date) -> int:
-        """Подсчитывает количество свободных слотов для автомойки на указанную дату."""
-        query = select(func.count(self.model.id)).where(
+    async def get_day_slots(self, carwash_id: uuid.UUID, on_date: date):
+        """Возвращает все слоты автомойки на дату (id, бокс, начало, статус)."""
+        query = select(
+            self.model.id,
+            self.model.wash_bay_id,
+            self.model.start_time,
+            self.model.status,
+        ).where(
             self.model.car_wash_id == carwash_id,
             self.model.slot_date == on_date,
-            self.model.status == "available",
         )
         result = await self.session.execute(query)
-        return result.scalar_one()
-
-    async def bulk_create(self, slots_data: List[Dict[str, Any]]):
-        """Выполняет массовое создание слотов."""
-        if not slots_data:
-            return
-        query = insert(self.model).values(slots_data)
-        await self.session.execute(query)
+        return result.all()
+
+    async def get_bays_without_slots(self, carwash_id: uuid.UUID, on_date: date):
+        """
+        Возвращает активные боксы автомойки, у которых нет слотов на дату
+        (wash_bay_id, working_hours).
+        """
+        has_slots = (
+            select(self.model.id)
+            .where(
+                self.model.wash_bay_id == WashBay.id,
+                self.model.slot_date == on_date,
+            )
+            .exists()
+        )
+        query = (
+            select(WashBay.id.label("wash_bay_id"), CarWash.working_hours)
+            .join(CarWash, CarWash.id == WashBay.car_wash_id)
+            .where(
+                WashBay.car_wash_id == carwash_id,
+                WashBay.is_active.is_(True),
+                CarWash.is_active.is_(True),
+                ~has_slots,
+            )
+        )
+        result = await self.session.execute(query)
+        return result.all()
+
+    async def get_bay_horizons(self):
+        """
+        Возвращает активные боксы с датой их последнего слота
+        (wash_bay_id, car_wash_id, working_hours, last_slot_date).
+        """
+        query = (
+            select(
+                WashBay.id.label("wash_bay_id"),
+                WashBay.car_wash_id,
+                CarWash.working_hours,
+                func.max(self.model.slot_date).label("last_slot_date"),
+            )
+            .join(CarWash, CarWash.id == WashBay.car_wash_id)
+            .outerjoin(self.model, self.model.wash_bay_id == WashBay.id)
+            .where(WashBay.is_active.is_(True), CarWash.is_active.is_(True))
+            .group_by(WashBay.id, CarWash.id)
+        )
+        result = await self.session.execute(query)
+        return result.all()
+
+    async def bulk_create(
+        self, slots_data: Iterable[Dict[str, Any]], chunk_size: int = BULK_CHUNK_SIZE
+    ):
+        """
+        Выполняет массовое создание слотов порциями по chunk_size строк.
+
+        Уже существующие слоты (тот же бокс, дата и время начала) пропускаются,
+        поэтому ленивая генерация и фоновая задача могут пересекаться.
+        """
+        query = insert(self.model).on_conflict_do_nothing(
+            index_elements=["wash_bay_id", "slot_date", "start_time"]
+        )
+        slots = iter(slots_data)
+        while chunk := list(islice(slots, chunk_size)):
+            await self.session.execute(query, chunk)
@@ -1,32 +1,62 @@
-from typing import List, Optional
-from sqlalchemy import select, or_
-from sqlalchemy.orm import selectinload
+from typing import List, Optional, Sequence
+from sqlalchemy import Row, select, or_
+from sqlalchemy.orm import InstrumentedAttribute
+from sqlalchemy.sql.base import ExecutableOption
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.models.users import User
 
 
+# Колонки списка пользователей (поля SUserResponse без статистики)
+USER_LIST_COLUMNS = (
+    User.id,
+    User.telegram_id,
+    User.username,
+    User.email,
+    User.first_name,
+    User.last_name,
+    User.phone_number,
+    User.is_verified,
+    User.created_at,
+)
+
+
 class UserRepository:
     model = User
 
     def __init__(self, session: AsyncSession):
         self.session = session
 
-    async def get_one_or_none(self, **filter_by) -> Optional[User]:
-        query = select(User).options(selectinload(User.bookings)).filter_by(**filter_by)
+    async def get_one_or_none(
+        self, *options: ExecutableOption, **filter_by
+    ) -> Optional[User]:
+        """
+        Пользователь по фильтру. Связи не загружаются: нужные передаются
+        опциями вызова, например selectinload(User.bookings).
+        """
+        query = select(User).filter_by(**filter_by)
+        if options:
+            query = query.options(*options)
         result = await self.session.execute(query)
         return result.scalar_one_or_none()
 
-    async def get_all(self, skip: int = 0, limit: int = 100, **filter_by) -> List[User]:
+    async def get_all(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        columns: Sequence[InstrumentedAttribute] = USER_LIST_COLUMNS,
+        **filter_by,
+    ) -> List[Row]:
+        """Страница пользователей: только колонки columns, без ORM-объектов."""
         query = (
-            select(User)
-            .options(selectinload(User.bookings))
+            select(*columns)
             .filter_by(**filter_by)
+            .order_by(User.created_at, User.id)
             .offset(skip)
             .limit(limit)
         )
         result = await self.session.execute(query)
-        return result.scalars().unique().all()
+        return result.all()
 
     async def find_by_telegram_id(self, telegram_id: int) -> Optional[User]:
         return await self.get_one_or_none(telegram_id=telegram_id)
@@ -8,6 +8,7 @@ from typing import List, Optional
 from sqlalchemy import select, func
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.core.cache import catalog_cache, WASH_TYPE_LIST_KEY, wash_type_key
 from src.models.washtype import WashType
 from src.schemas.washtype import SWashTypeCreate, SWashTypeUpdate
 
@@ -38,6 +39,7 @@ class WashTypeRepository:
         self.session.add(wash_type)
         await self.session.commit()
         await self.session.refresh(wash_type)
+        await catalog_cache.invalidate(WASH_TYPE_LIST_KEY)
         return wash_type
 
     async def update(self, wash_type: WashType, data: SWashTypeUpdate) -> WashType:
@@ -47,9 +49,12 @@ class WashTypeRepository:
             setattr(wash_type, field, value)
         await self.session.commit()
         await self.session.refresh(wash_type)
+        await catalog_cache.invalidate(WASH_TYPE_LIST_KEY, wash_type_key(wash_type.id))
         return wash_type
 
     async def delete(self, wash_type: WashType) -> None:
         """Удалить тип мойки."""
+        wash_type_id = wash_type.id
         await self.session.delete(wash_type)
         await self.session.commit()
+        await catalog_cache.invalidate(WASH_TYPE_LIST_KEY, wash_type_key(wash_type_id))
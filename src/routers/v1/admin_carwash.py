@@ -0,0 +1,64 @@
+"""
+API роутер для администраторов автомоек
+"""
+
+import uuid
+from typing import Literal, Optional
+from datetime import date
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.db import get_async_session
+from src.core.responses import fast_json
+from src.schemas.analytics import SAnalyticsResponse
+from src.schemas.booking import SBookingListResponse
+from src.services.analytics import get_carwash_analytics_service
+from src.services.booking import get_carwash_bookings_service
+
+router = APIRouter(prefix="/api/v1/admin/carwash", tags=["Admin: CarWash"])
+
+
+@router.get("/{carwash_id}/bookings", response_model=SBookingListResponse)
+async def get_carwash_bookings(
+    carwash_id: uuid.UUID,
+    date_from: Optional[date] = Query(None, description="Дата слота с"),
+    date_to: Optional[date] = Query(None, description="Дата слота по"),
+    status: Optional[str] = Query(None, description="Фильтр по статусу"),
+    page: int = Query(1, ge=1),
+    per_page: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Курсор из next_cursor"),
+    with_total: bool = Query(False, description="Посчитать общее количество"),
+    session: AsyncSession = Depends(get_async_session),
+):
+    """Получить бронирования автомойки (по возрастанию даты и времени слота)"""
+    result = await get_carwash_bookings_service(
+        carwash_id=carwash_id,
+        date_from=date_from,
+        date_to=date_to,
+        status=status,
+        page=page,
+        per_page=per_page,
+        session=session,
+        cursor=cursor,
+        with_total=with_total,
+    )
+    return fast_json(result)
+
+
+@router.get("/{carwash_id}/analytics", response_model=SAnalyticsResponse)
+async def get_carwash_analytics(
+    carwash_id: uuid.UUID,
+    grain: Literal["hour", "day"] = Query("day", description="Интервал агрегатов"),
+    date_from: Optional[date] = Query(None, description="С даты (по умолчанию неделя)"),
+    date_to: Optional[date] = Query(None, description="По дату (по умолчанию сегодня)"),
+    group_by: Literal["bucket", "wash_bay", "wash_type"] = Query(
+        "bucket", description="Группировка: по интервалам, боксам или типам мойки"
+    ),
+    session: AsyncSession = Depends(get_async_session),
+):
+    """Выручка, загрузка и неявки автомойки по предрасчитанным агрегатам"""
+    result = await get_carwash_analytics_service(
+        carwash_id, grain, date_from, date_to, group_by, session
+    )
+    return fast_json(result)
@@ -10,6 +10,8 @@ from fastapi import APIRouter, Depends, HTTPException, Query, Header
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.core.db import get_async_session
+from src.core.responses import fast_json
+from src.core.telegram_auth import SessionToken
 
 from src.schemas.booking import (
     SBookingCreate,
@@ -18,6 +20,7 @@ from src.schemas.booking import (
     SBookingConfirmation,
 )
 
+from src.services.auth import get_optional_session
 from src.services.booking import (
     create_booking_service,
     get_my_bookings_service,
@@ -34,8 +37,19 @@ router = APIRouter(prefix="/api/v1/bookings", tags=["Bookings"])
 @router.post("/create")
 async def create(
     data: SBookingCreate,
+    auth: Optional[SessionToken] = Depends(get_optional_session),
     session: AsyncSession = Depends(get_async_session),
 ) -> SBookingConfirmation:
+    """
+    Создать бронирование
+
+    С токеном сессии Mini App бронь привязывается к его владельцу,
+    telegram_id и user_id из тела игнорируются.
+    """
+    if auth is not None:
+        data = data.model_copy(
+            update={"telegram_id": auth.telegram_id, "user_id": auth.user_id}
+        )
     return await create_booking_service(data, session)
 
 
@@ -45,11 +59,16 @@ async def get_my_bookings(
     status: Optional[str] = Query(None, description="Фильтр по статусу"),
     page: int = Query(1, ge=1),
     per_page: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Курсор из next_cursor"),
+    with_total: bool = Query(False, description="Посчитать общее количество"),
     session: AsyncSession = Depends(get_async_session),
 ):
     """
     Получить мои бронирования по номеру телефона
 
+    Для перехода на следующую страницу передайте cursor из next_cursor
+    предыдущего ответа (page при этом игнорируется).
+
     Статусы:
     - pending_payment - ожидает оплаты
     - confirmed - подтверждено
@@ -57,13 +76,16 @@ async def get_my_bookings(
     - completed - завершено
     - cancelled - отменено
     """
-    return await get_my_bookings_service(
+    result = await get_my_bookings_service(
         phone=phone,
         status=status,
         page=page,
         per_page=per_page,
         session=session,
+        cursor=cursor,
+        with_total=with_total,
     )
+    return fast_json(result)
 
 
 @router.get("/{booking_id}", response_model=SBookingWithDetails)
@@ -72,7 +94,7 @@ async def get_booking(
     session: AsyncSession = Depends(get_async_session),
 ):
     """Получить бронирование по ID"""
-    return await get_booking_by_id_service(booking_id, session)
+    return fast_json(await get_booking_by_id_service(booking_id, session))
 
 
 @router.post("/{booking_id}/cancel")
@@ -3,37 +3,72 @@ API эндпоинты для работы с автомойками.
 """
 
 import uuid
+from datetime import date
 from typing import List, Optional
 
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.core.cache import etag_response
 from src.core.db import get_async_session
-from src.schemas.carwash import SCarWashResponse
+from src.core.responses import fast_json
+from src.schemas.carwash import SCarWashNearbyResponse, SCarWashResponse
+from src.schemas.timeslot import SAvailabilityResponse, SFreeSlotResponse
 from src.services.carwash import (
-    get_all_carwashes_service,
-    get_carwash_by_id_service,
+    get_carwash_availability_service,
+    get_free_slots_json_service,
+    get_all_carwashes_json_service,
+    search_carwashes_nearby_service,
+    get_carwash_by_id_json_service,
     get_carwash_slots_stats_service,
 )
 
 router = APIRouter(prefix="/api/v1/carwashes", tags=["CarWashes"])
 
 
-@router.get("/", status_code=status.HTTP_200_OK)
+@router.get(
+    "/", response_model=List[SCarWashNearbyResponse], status_code=status.HTTP_200_OK
+)
 async def get_all_carwashes(
+    request: Request,
+    latitude: Optional[float] = Query(None, ge=-90, le=90),
+    longitude: Optional[float] = Query(None, ge=-180, le=180),
+    radius: Optional[float] = Query(None, gt=0, le=500, description="Радиус, км"),
+    page: int = Query(1, ge=1),
+    per_page: int = Query(20, ge=1, le=100),
     session: AsyncSession = Depends(get_async_session),
-) -> List[SCarWashResponse]:
-    """Получение списка всех автомоек."""
-    return await get_all_carwashes_service(session)
+):
+    """
+    Получение списка автомоек.
 
+    Без координат — все автомойки (поддерживает If-None-Match).
+    С latitude и longitude — ближайшие по возрастанию distance (км),
+    в пределах radius, если он задан; постранично через page/per_page.
+    """
+    if latitude is None and longitude is None:
+        cached = await get_all_carwashes_json_service(session)
+        return etag_response(request, cached)
+    if latitude is None or longitude is None:
+        raise HTTPException(
+            status_code=400, detail="Нужно передать и latitude, и longitude"
+        )
+    result = await search_carwashes_nearby_service(
+        latitude, longitude, radius, page, per_page, session
+    )
+    return fast_json(result)
 
-@router.get("/{carwash_id}", status_code=status.HTTP_200_OK)
+
+@router.get(
+    "/{carwash_id}", response_model=SCarWashResponse, status_code=status.HTTP_200_OK
+)
 async def get_carwash_by_id(
     carwash_id: uuid.UUID,
+    request: Request,
     session: AsyncSession = Depends(get_async_session),
-) -> SCarWashResponse:
-    """Получение информации об одной автомойке по ID."""
-    return await get_carwash_by_id_service(carwash_id, session)
+) -> Response:
+    """Получение информации об одной автомойке по ID (поддерживает If-None-Match)."""
+    cached = await get_carwash_by_id_json_service(carwash_id, session)
+    return etag_response(request, cached)
 
 
 @router.get(
@@ -46,3 +81,40 @@ async def get_carwash_slots_stats(
 ):
     """Получение количества свободных слотов для автомойки на дату."""
     return await get_carwash_slots_stats_service(carwash_id, date, session)
+
+
+@router.get(
+    "/{carwash_id}/availability",
+    response_model=SAvailabilityResponse,
+    status_code=status.HTTP_200_OK,
+)
+async def get_carwash_availability(
+    carwash_id: uuid.UUID,
+    date_from: Optional[date] = Query(None, description="Первый день (по умолчанию сегодня)"),
+    days: int = Query(7, ge=1, le=31),
+    session: AsyncSession = Depends(get_async_session),
+):
+    """Количество свободных слотов автомойки на каждый день диапазона."""
+    return await get_carwash_availability_service(carwash_id, date_from, days, session)
+
+
+@router.get(
+    "/{carwash_id}/slots",
+    response_model=List[SFreeSlotResponse],
+    status_code=status.HTTP_200_OK,
+)
+async def get_carwash_free_slots(
+    carwash_id: uuid.UUID,
+    on_date: Optional[date] = Query(None, alias="date", description="Дата (по умолчанию сегодня)"),
+    slot_date: Optional[date] = Query(None, description="Синоним date"),
+    wash_type_id: Optional[uuid.UUID] = Query(
+        None, description="Только слоты, в которые помещается этот тип мойки"
+    ),
+    per_bay: bool = Query(False, description="Все боксы, а не одно время — один слот"),
+    session: AsyncSession = Depends(get_async_session),
+) -> Response:
+    """Свободные слоты автомойки на дату, по возрастанию времени начала."""
+    body = await get_free_slots_json_service(
+        carwash_id, on_date or slot_date, wash_type_id, per_bay, session
+    )
+    return Response(content=body, media_type="application/json")
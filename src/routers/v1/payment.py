@@ -18,7 +18,7 @@ from src.schemas.payment import (
 from src.services.payment_gateway import PaymentGatewayService, get_payment_gateway
 from src.services.payment import (
     create_payment_service,
-    process_webhook_service,
+    ingest_webhook_service,
     create_refund_service,
     confirm_demo_payment_service,
 )
@@ -66,12 +66,13 @@ async def payment_webhook(
     """
     Webhook для получения уведомлений от платежной системы
 
-    Обрабатывает события:
+    Событие сохраняется в inbox и подтверждается сразу; повторная доставка
+    того же события отбрасывается. Воркеры обрабатывают события:
     - payment.succeeded - платеж успешен
     - payment.canceled - платеж отменен
     - refund.succeeded - возврат выполнен
     """
-    return await process_webhook_service(request, gateway, session)
+    return await ingest_webhook_service(request, gateway, session)
 
 
 @router.post("/refund", response_model=SRefundResponse)
@@ -0,0 +1,43 @@
+"""
+Эндпоинт вебхука Telegram (режим BOT_MODE=webhook).
+"""
+
+import json
+import secrets
+
+from fastapi import APIRouter, Header, HTTPException, Request, status
+from pydantic import ValidationError
+
+from src.bot.webhook import WEBHOOK_PATH
+
+router = APIRouter(tags=["Telegram"])
+
+
+@router.post(WEBHOOK_PATH, include_in_schema=False)
+async def telegram_webhook(
+    request: Request,
+    x_telegram_bot_api_secret_token: str | None = Header(default=None),
+):
+    """Принимает обновление Telegram и ставит его в очередь обработки."""
+    feeder = getattr(request.app.state, "bot_feeder", None)
+    if feeder is None:
+        raise HTTPException(status_code=404, detail="Вебхук бота отключён")
+
+    if not secrets.compare_digest(
+        (x_telegram_bot_api_secret_token or "").encode(), feeder.secret_token.encode()
+    ):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN)
+
+    try:
+        accepted = feeder.submit(await request.json())
+    except (json.JSONDecodeError, UnicodeDecodeError, ValidationError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Некорректное обновление Telegram",
+        )
+    if not accepted:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Очередь обновлений заполнена",
+        )
+    return {"ok": True}
@@ -1,19 +1,22 @@
 import uuid
-from typing import Optional
 
 from fastapi import APIRouter, Depends, Header, status, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.core.config import Settings, get_settings
 from src.core.db import get_async_session
 
+from src.core.telegram_auth import SessionToken
 from src.schemas.users import (
     SUserUpdate,
     SUserResponse,
+    SPhoneNumber,
     SPhoneVerification,
+    STelegramAuthResponse,
 )
 from src.services.users import UserService
 
-from src.services.auth import get_or_create_user_by_init_data
+from src.services.auth import get_current_session, get_or_create_user_by_init_data
 
 
 router = APIRouter(prefix="/api/v1/users", tags=["Users"])
@@ -27,44 +30,56 @@ router = APIRouter(prefix="/api/v1/users", tags=["Users"])
 async def telegram_auth(
     init_data: str = Header(..., alias="X-Telegram-Init-Data"),
     session: AsyncSession = Depends(get_async_session),
-) -> SUserResponse:
+    settings: Settings = Depends(get_settings),
+) -> STelegramAuthResponse:
     """
     Эндпоинт для аутентификации пользователя Mini App через Telegram Init Data.
     Если пользователь существует, возвращает его данные. Если нет - создает нового.
+    В ответе — session_token для заголовка 'Authorization: Bearer' следующих запросов.
     """
-    user = await get_or_create_user_by_init_data(init_data, session)
+    user = await get_or_create_user_by_init_data(init_data, session, settings)
     return user
 
 
 @router.post("/verify-phone")
 async def verify_phone(
-    data: SPhoneVerification, session: AsyncSession = Depends(get_async_session)
+    data: SPhoneNumber,
+    auth: SessionToken = Depends(get_current_session),
+    session: AsyncSession = Depends(get_async_session),
 ):
     """
     Верификация номера телефона
 
-    Telegram Mini App отправляет номер телефона через requestContact
+    Telegram Mini App отправляет номер телефона через requestContact;
+    пользователь — владелец токена сессии.
     """
     user_service = UserService(session)
-    return await user_service.verify_user(data)
+    return await user_service.verify_user(
+        SPhoneVerification(telegram_id=auth.telegram_id, phone_number=data.phone_number)
+    )
 
 
 @router.get("/me")
 async def get_current_user(
-    x_telegram_id: int = Header(..., description="Telegram ID пользователя"),
+    auth: SessionToken = Depends(get_current_session),
     session: AsyncSession = Depends(get_async_session),
 ) -> SUserResponse:
+    """Профиль владельца токена сессии (поиск по первичному ключу из токена)."""
     user_service = UserService(session)
-    return await user_service.find_user(telegram_id=x_telegram_id)
+    return await user_service.find_user(id=auth.user_id)
 
 
 @router.patch("/me")
 async def update_current_user(
     data: SUserUpdate,
+    auth: SessionToken = Depends(get_current_session),
     session: AsyncSession = Depends(get_async_session),
 ) -> SUserResponse:
+    """Изменить профиль владельца токена; telegram_id из тела игнорируется."""
     user_service = UserService(session)
-    return await user_service.update_user(data)
+    return await user_service.update_user(
+        data.model_copy(update={"telegram_id": auth.telegram_id})
+    )
 
 
 @router.get("/{user_id}")
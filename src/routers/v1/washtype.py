@@ -5,9 +5,10 @@ API роутер для работы с типами мойки
 import uuid
 from typing import Optional, List
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.core.cache import etag_response
 from src.core.db import get_async_session
 from src.schemas.washtype import (
     SWashTypeCreate,
@@ -16,8 +17,8 @@ from src.schemas.washtype import (
     SWashTypeListResponse,
 )
 from src.services.washtype import (
-    get_all_wash_types_service,
-    get_wash_type_by_id_service,
+    get_all_wash_types_json_service,
+    get_wash_type_by_id_json_service,
     create_wash_type_service,
     update_wash_type_service,
     delete_wash_type_service,
@@ -28,19 +29,23 @@ router = APIRouter(prefix="/api/v1/wash-types", tags=["WashTypes"])
 
 @router.get("/", response_model=SWashTypeListResponse)
 async def get_wash_types(
+    request: Request,
     session: AsyncSession = Depends(get_async_session),
 ):
-    """Получить все типы мойки"""
-    return await get_all_wash_types_service(session)
+    """Получить все типы мойки (поддерживает If-None-Match)"""
+    cached = await get_all_wash_types_json_service(session)
+    return etag_response(request, cached)
 
 
 @router.get("/{wash_type_id}", response_model=SWashTypeResponse)
 async def get_wash_type(
     wash_type_id: uuid.UUID,
+    request: Request,
     session: AsyncSession = Depends(get_async_session),
 ):
-    """Получить тип мойки по ID"""
-    return await get_wash_type_by_id_service(wash_type_id, session)
+    """Получить тип мойки по ID (поддерживает If-None-Match)"""
+    cached = await get_wash_type_by_id_json_service(wash_type_id, session)
+    return etag_response(request, cached)
 
 
 @router.post("/", response_model=SWashTypeResponse)
@@ -0,0 +1,31 @@
+import uuid
+from datetime import date
+from typing import List, Literal
+
+from pydantic import BaseModel
+
+
+class SAnalyticsRow(BaseModel):
+    # Начало часа/дня (ISO), id бокса или id типа мойки — по group_by
+    key: str
+    bookings: int
+    completed: int
+    cancelled: int
+    no_show: int
+    revenue: float
+    booked_minutes: int
+    capacity_minutes: int
+    # Доля занятых минут от ёмкости боксов
+    utilization: float
+    # Доля неявок среди прошедших броней (completed + no_show)
+    no_show_rate: float
+
+
+class SAnalyticsResponse(BaseModel):
+    carwash_id: uuid.UUID
+    grain: Literal["hour", "day"]
+    group_by: Literal["bucket", "wash_bay", "wash_type"]
+    date_from: date
+    date_to: date
+    items: List[SAnalyticsRow]
+    totals: SAnalyticsRow
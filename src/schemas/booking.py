@@ -100,10 +100,11 @@ class SBookingListResponse(BaseModel):
     """Список бронирований с пагинацией"""
 
     items: List[SBookingWithDetails]
-    total: int
+    total: Optional[int] = None  # Заполняется только при with_total=true
     page: int
     per_page: int
-    pages: int
+    pages: Optional[int] = None
+    next_cursor: Optional[str] = None  # Курсор следующей страницы, None - конец списка
 
 
 class SPaymentInfo(BaseModel):
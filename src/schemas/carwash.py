@@ -12,6 +12,8 @@ class SCarWashCreate(BaseModel):
     address: str = Field(..., min_length=1, max_length=100)
     phone_number: str = Field(...)
     working_hours: dict = Field(...)
+    latitude: Optional[float] = Field(None, ge=-90, le=90)
+    longitude: Optional[float] = Field(None, ge=-180, le=180)
 
     model_config = ConfigDict(from_attributes=True)
 
@@ -70,6 +72,8 @@ class SCarWashUpdate(BaseModel):
     address: Optional[str] = Field(None, min_length=1, max_length=100)
     phone_number: Optional[str] = Field(None)
     working_hours: Optional[dict] = Field(None)
+    latitude: Optional[float] = Field(None, ge=-90, le=90)
+    longitude: Optional[float] = Field(None, ge=-180, le=180)
 
     model_config = ConfigDict(from_attributes=True)
 
@@ -137,5 +141,12 @@ class SCarWashResponse(BaseModel):
     address: str
     phone_number: str
     working_hours: dict
+    latitude: Optional[float] = None
+    longitude: Optional[float] = None
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class SCarWashNearbyResponse(SCarWashResponse):
+    # Расстояние до точки поиска, км (только при поиске по координатам)
+    distance: Optional[float] = None
@@ -1,7 +1,7 @@
 import re
 import uuid
-from datetime import datetime
-from typing import Optional
+from datetime import date, datetime
+from typing import List, Optional
 
 from pydantic import BaseModel, Field, ConfigDict, field_validator, model_validator
 
@@ -60,3 +60,22 @@ class STimeResponse(BaseModel):
     is_booked: bool
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class SDayAvailability(BaseModel):
+    date: date
+    available_slots_count: int
+
+
+class SAvailabilityResponse(BaseModel):
+    carwash_id: uuid.UUID
+    days: List[SDayAvailability]
+
+
+class SFreeSlotResponse(BaseModel):
+    id: uuid.UUID
+    wash_bay_id: uuid.UUID
+    slot_date: date
+    # Время в формате 'HH:MM'
+    start_time: str
+    end_time: str
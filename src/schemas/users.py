@@ -31,6 +31,12 @@ class SPhoneVerification(BaseModel):
         return values
 
 
+class SPhoneNumber(BaseModel):
+    """Номер телефона из Mini App; пользователь определяется по токену сессии."""
+
+    phone_number: str = Field(...)
+
+
 class SUserCreate(BaseModel):
     telegram_id: int = Field(...)
     username: str = Field(..., min_length=3, max_length=32)
@@ -120,6 +126,14 @@ class SUserResponse(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 
+class STelegramAuthResponse(SUserResponse):
+    """Пользователь Mini App и токен сессии для следующих запросов."""
+
+    session_token: str
+    # Unix-время истечения токена
+    session_expires_at: int
+
+
 class STelegramAuth(BaseModel):
     """Авторизация через Telegram"""
 
@@ -0,0 +1,164 @@
+"""
+Аналитика автомоек по предрасчитанным агрегатам.
+
+Фоновая задача находит пары (автомойка, день), у которых после водяного
+знака менялись брони или слоты (coalesce(updated_at, created_at)), и
+пересобирает агрегаты за эти дни. Запросы админов читают только таблицы
+агрегатов, поэтому отчёт за год — несколько сотен строк по первичному ключу.
+
+Неявка — бронь, которая всё ещё в статусе confirmed, когда её час (день) уже
+прошёл. Течение времени не меняет updated_at, поэтому неявки считаются при
+чтении из счётчика confirmed.
+"""
+
+import logging
+import time
+import uuid
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional
+
+from fastapi import HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.db import async_session_maker
+from src.repositories.analytics import AnalyticsRepository
+from src.repositories.booking import BookingRepository
+from src.schemas.analytics import SAnalyticsResponse, SAnalyticsRow
+
+
+logger = logging.getLogger(__name__)
+
+# Ключ advisory-блокировки: агрегаты пересобирает один воркер
+ROLLUP_REFRESH_LOCK_ID = 7_301_022
+ROLLUP_WATERMARK = "bookings"
+# Транзакция может закоммититься позже, чем записан её updated_at:
+# изменения ищутся с таким перекрытием, повторная пересборка дня безвредна
+CHANGE_LAG = timedelta(minutes=5)
+# Дней (автомойка, день), пересобираемых в одной транзакции
+DAYS_PER_BATCH = 100
+MAX_RANGE_DAYS = 366
+
+GRAIN_LENGTH = {"hour": timedelta(hours=1), "day": timedelta(days=1)}
+
+
+async def refresh_rollups_service(session: AsyncSession) -> Optional[int]:
+    """
+    Пересобирает агрегаты за дни, изменившиеся после водяного знака.
+
+    Каждая порция — отдельная транзакция под advisory-блокировкой; знак
+    сдвигается после последней порции. Возвращает количество пересобранных
+    дней или None, если пересборку выполняет другой воркер.
+    """
+    repo = AnalyticsRepository(session)
+    lock = BookingRepository(session)
+    if not await lock.try_advisory_lock(ROLLUP_REFRESH_LOCK_ID):
+        await session.rollback()
+        return None
+
+    started = datetime.now()
+    watermark = await repo.get_watermark(ROLLUP_WATERMARK)
+    days = await repo.changed_days(watermark - CHANGE_LAG if watermark else None)
+
+    for start in range(0, len(days), DAYS_PER_BATCH):
+        if start and not await lock.try_advisory_lock(ROLLUP_REFRESH_LOCK_ID):
+            await session.rollback()
+            return None
+        await repo.rebuild_days(days[start : start + DAYS_PER_BATCH])
+        await session.commit()
+
+    if not await lock.try_advisory_lock(ROLLUP_REFRESH_LOCK_ID):
+        await session.rollback()
+        return None
+    await repo.set_watermark(ROLLUP_WATERMARK, started)
+    await session.commit()
+    return len(days)
+
+
+async def rollup_refresh_job() -> None:
+    """Фоновая задача пересборки агрегатов: пишет объём и время в лог."""
+    started = time.perf_counter()
+    async with async_session_maker() as session:
+        rebuilt = await refresh_rollups_service(session)
+    if rebuilt:
+        logger.info(
+            f"Агрегаты аналитики: пересобрано дней {rebuilt} "
+            f"за {(time.perf_counter() - started) * 1000:.0f} мс"
+        )
+
+
+def _analytics_row(key: str, row: Dict[str, float], capacity: int) -> SAnalyticsRow:
+    booked_minutes = int(row["booked_minutes"] or 0)
+    completed = int(row["completed"] or 0)
+    no_show = int(row["no_show"] or 0)
+    finished = completed + no_show
+    return SAnalyticsRow(
+        key=key,
+        bookings=int(row["bookings"] or 0),
+        completed=completed,
+        cancelled=int(row["cancelled"] or 0),
+        no_show=no_show,
+        revenue=round(float(row["revenue"] or 0), 2),
+        booked_minutes=booked_minutes,
+        capacity_minutes=int(capacity or 0),
+        utilization=round(booked_minutes / capacity, 4) if capacity else 0.0,
+        no_show_rate=round(no_show / finished, 4) if finished else 0.0,
+    )
+
+
+async def get_carwash_analytics_service(
+    carwash_id: uuid.UUID,
+    grain: str,
+    date_from: Optional[date],
+    date_to: Optional[date],
+    group_by: str,
+    session: AsyncSession,
+) -> SAnalyticsResponse:
+    """Выручка, загрузка и неявки автомойки за период по агрегатам."""
+    date_to = date_to or date.today()
+    date_from = date_from or date_to - timedelta(days=6)
+    if date_from > date_to:
+        raise HTTPException(status_code=400, detail="date_from позже date_to")
+    if (date_to - date_from).days >= MAX_RANGE_DAYS:
+        raise HTTPException(
+            status_code=400, detail=f"Период не может превышать {MAX_RANGE_DAYS} дней"
+        )
+
+    rows, capacity = await AnalyticsRepository(session).summary(
+        carwash_id,
+        grain,
+        date_from,
+        date_to,
+        group_by,
+        no_show_before=datetime.now() - GRAIN_LENGTH[grain],
+    )
+
+    items: List[SAnalyticsRow] = []
+    totals: Dict[str, float] = {
+        "bookings": 0,
+        "completed": 0,
+        "cancelled": 0,
+        "no_show": 0,
+        "booked_minutes": 0,
+        "revenue": 0,
+    }
+    for row in rows:
+        key = row["key"]
+        items.append(
+            _analytics_row(
+                key.isoformat() if isinstance(key, datetime) else str(key),
+                row,
+                capacity.get(None if group_by == "wash_type" else key, 0),
+            )
+        )
+        for field in totals:
+            totals[field] += row[field] or 0
+
+    return SAnalyticsResponse(
+        carwash_id=carwash_id,
+        grain=grain,
+        group_by=group_by,
+        date_from=date_from,
+        date_to=date_to,
+        items=items,
+        totals=_analytics_row("total", totals, sum(capacity.values())),
+    )
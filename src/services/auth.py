@@ -1,21 +1,45 @@
-from fastapi import HTTPException
+from functools import lru_cache
+from typing import Optional
+
+from fastapi import Depends, Header, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.core.telegram_auth import validate_init_data, parse_init_data
-from src.schemas.users import SUserCreate, SUserResponse, STelegramAuth
+from src.core.telegram_auth import (
+    InitDataValidator,
+    SessionToken,
+    issue_session_token,
+    verify_session_token,
+)
+from src.schemas.users import SUserCreate, STelegramAuthResponse
 from src.services.users import UserService
 
-from src.core.config import Settings
+from src.core.config import Settings, get_settings, on_settings_reload
+
+
+@lru_cache(maxsize=2)
+def _init_data_validator(bot_token: str, max_age: int) -> InitDataValidator:
+    """
+    Секрет initData считается один раз на токен бота; проверенные строки
+    кэшируются до истечения auth_date. Ключ — все настройки, которые
+    использует валидатор; reload_settings к тому же сбрасывает кэш целиком.
+    """
+    return InitDataValidator(bot_token, max_age)
+
+
+on_settings_reload(_init_data_validator.cache_clear)
 
 
 async def get_or_create_user_by_init_data(
-    init_data: str, session: AsyncSession
-) -> SUserResponse:
+    init_data: str, session: AsyncSession, settings: Settings
+) -> STelegramAuthResponse:
 
-    if not validate_init_data(init_data, Settings().bot_token):
+    validator = _init_data_validator(
+        settings.bot_token, settings.webapp_init_data_max_age_seconds
+    )
+    parsed_data = validator.validate(init_data)
+    if parsed_data is None:
         raise HTTPException(status_code=401, detail="Invalid Telegram Init Data")
 
-    parsed_data = parse_init_data(init_data)
     telegram_user_data = parsed_data.get("user")
 
     if not telegram_user_data or not telegram_user_data.get("id"):
@@ -41,4 +65,41 @@ async def get_or_create_user_by_init_data(
 
     user_service = UserService(session)
     user = await user_service.create_user(user_create_data)
-    return user
+
+    # Токен сессии: следующие запросы Mini App не проверяют initData и не ищут пользователя
+    token, expires_at = issue_session_token(
+        user.id, telegram_id, settings.bot_token, settings.webapp_session_ttl_seconds
+    )
+    return STelegramAuthResponse(
+        **user.model_dump(), session_token=token, session_expires_at=expires_at
+    )
+
+
+async def get_optional_session(
+    authorization: Optional[str] = Header(None),
+    settings: Settings = Depends(get_settings),
+) -> Optional[SessionToken]:
+    """
+    Сессия Mini App из заголовка 'Authorization: Bearer <token>', если он есть.
+
+    Идентификаторы пользователя берутся из подписанного токена, без запроса
+    к БД. Запросы без заголовка (бот) передают идентификаторы сами.
+    """
+    if not authorization:
+        return None
+    scheme, _, token = authorization.partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        raise HTTPException(status_code=401, detail="Invalid session token")
+    session = verify_session_token(token, settings.bot_token)
+    if session is None:
+        raise HTTPException(status_code=401, detail="Invalid session token")
+    return session
+
+
+async def get_current_session(
+    auth: Optional[SessionToken] = Depends(get_optional_session),
+) -> SessionToken:
+    """Сессия Mini App для эндпоинтов, доступных только с токеном."""
+    if auth is None:
+        raise HTTPException(status_code=401, detail="Требуется авторизация")
+    return auth
@@ -0,0 +1,347 @@
+"""
+Движок доступности слотов на битовых картах.
+
+Для каждой пары (моечный бокс, дата) хранится одно целое число фиксированной
+ширины: бит i установлен, если слот, начинающийся в i * SLOT_MINUTES минут от
+полуночи, свободен. Источник истины — таблица time_slots: день загружается из
+неё одним запросом при первом обращении, после чего ответы на вопросы
+«какие слоты свободны», «сколько их» и «первый свободный после T» строятся
+без обращения к Postgres. Пути резервирования и освобождения слотов обязаны
+сообщать движку об изменениях через reserve()/release() — только после
+успешного commit, иначе откат оставит в движке несуществующее состояние.
+
+Движок свой в каждом процессе и не видит изменений, сделанных другими
+воркерами, поэтому загруженный день живёт DAY_TTL секунд и затем
+перечитывается из БД. Бронирование всё равно проверяет слот в Postgres
+(FOR UPDATE), так что устаревший день может лишь показать занятый слот
+свободным, но не допустить двойную бронь.
+"""
+
+import asyncio
+import uuid
+from dataclasses import dataclass, field
+from datetime import date, datetime, time, timedelta
+from time import monotonic
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.cache import TTLCache
+from src.core.config import get_settings
+from src.repositories.timeslot import TimeSlotRepository
+from src.services.timeslot import ensure_slots_for_date
+
+
+SLOT_MINUTES = 30
+SLOTS_PER_DAY = 24 * 60 // SLOT_MINUTES
+# Сколько секунд помнить счётчики незагруженных дней, посчитанные в БД
+DAY_COUNTS_TTL = 10
+# Сколько секунд загруженный день считается актуальным (изменения других
+# воркеров видны не позже чем через DAY_TTL)
+DAY_TTL = 30
+
+
+def _as_date(value: date | datetime) -> date:
+    return value.date() if isinstance(value, datetime) else value
+
+
+def _as_time(value: time | datetime) -> time:
+    return value.time() if isinstance(value, datetime) else value
+
+
+def slot_index(start_time: time | datetime) -> int:
+    """Номер слота в сутках по времени его начала."""
+    t = _as_time(start_time)
+    return (t.hour * 60 + t.minute) // SLOT_MINUTES
+
+
+def index_to_time(index: int) -> time:
+    minutes = index * SLOT_MINUTES
+    return time(hour=minutes // 60, minute=minutes % 60)
+
+
+@dataclass(slots=True)
+class FreeSlot:
+    """Свободный слот, найденный по битовой карте."""
+
+    id: uuid.UUID
+    wash_bay_id: uuid.UUID
+    slot_date: date
+    start_time: time
+    end_time: time
+
+
+@dataclass(slots=True)
+class BayDay:
+    """Битовая карта одного бокса на одну дату."""
+
+    wash_bay_id: uuid.UUID
+    free: int = 0
+    # Все слоты бокса на день, включая занятые: индекс -> id слота
+    slot_ids: Dict[int, uuid.UUID] = field(default_factory=dict)
+
+    def set_free(self, index: int, is_free: bool) -> None:
+        if is_free:
+            self.free |= 1 << index
+        else:
+            self.free &= ~(1 << index)
+
+
+class AvailabilityEngine:
+    """
+    Процессный индекс свободных слотов.
+
+    Дни хранятся по ключу (car_wash_id, slot_date); внутри — битовая карта на
+    каждый бокс. Отсутствие ключа или истёкший ttl означают, что день нужно
+    загрузить из БД.
+    """
+
+    def __init__(self, ttl: float = DAY_TTL):
+        self.ttl = ttl
+        self._days: Dict[Tuple[uuid.UUID, date], Dict[uuid.UUID, BayDay]] = {}
+        # Момент загрузки дня (time.monotonic)
+        self._loaded_at: Dict[Tuple[uuid.UUID, date], float] = {}
+        # Загрузка одного дня выполняется одной корутиной
+        self._load_locks: Dict[Tuple[uuid.UUID, date], asyncio.Lock] = {}
+        # Обратный индекс для reserve/release по id слота
+        self._slots: Dict[uuid.UUID, Tuple[uuid.UUID, date, uuid.UUID, int]] = {}
+        # Версия дня растёт при любом изменении: по ней сбрасываются
+        # закэшированные ответы, построенные из битовых карт
+        self._versions: Dict[Tuple[uuid.UUID, date], int] = {}
+
+    def _bump(self, key: Tuple[uuid.UUID, date]) -> None:
+        self._versions[key] = self._versions.get(key, 0) + 1
+
+    def day_version(self, carwash_id: uuid.UUID, on_date: date) -> int:
+        return self._versions.get((carwash_id, _as_date(on_date)), 0)
+
+    def is_loaded(self, carwash_id: uuid.UUID, on_date: date) -> bool:
+        """День загружен и моложе ttl."""
+        loaded_at = self._loaded_at.get((carwash_id, _as_date(on_date)))
+        return loaded_at is not None and monotonic() - loaded_at < self.ttl
+
+    def load_lock(self, carwash_id: uuid.UUID, on_date: date) -> asyncio.Lock:
+        key = (carwash_id, _as_date(on_date))
+        lock = self._load_locks.get(key)
+        if lock is None:
+            lock = self._load_locks[key] = asyncio.Lock()
+        return lock
+
+    def evict_before(self, on_date: date) -> None:
+        """Выгружает дни раньше on_date: прошедшие даты больше не запрашиваются."""
+        for key in [key for key in self._days if key[1] < on_date]:
+            self._drop(key)
+            self._versions.pop(key, None)
+        for key in [key for key in self._load_locks if key[1] < on_date]:
+            if not self._load_locks[key].locked():
+                del self._load_locks[key]
+
+    def load_day(
+        self, carwash_id: uuid.UUID, on_date: date, rows: Iterable[Any]
+    ) -> None:
+        """
+        Заменяет битовые карты дня данными из БД.
+
+        :param rows: строки с полями id, wash_bay_id, start_time, status.
+        """
+        on_date = _as_date(on_date)
+        self.invalidate(carwash_id, on_date)
+        self.evict_before(date.today())
+
+        bays: Dict[uuid.UUID, BayDay] = {}
+        for row in rows:
+            bay = bays.get(row.wash_bay_id)
+            if bay is None:
+                bay = bays[row.wash_bay_id] = BayDay(wash_bay_id=row.wash_bay_id)
+            index = slot_index(row.start_time)
+            bay.slot_ids[index] = row.id
+            bay.set_free(index, row.status == "available")
+            self._slots[row.id] = (carwash_id, on_date, row.wash_bay_id, index)
+
+        self._days[(carwash_id, on_date)] = bays
+        self._loaded_at[(carwash_id, on_date)] = monotonic()
+        self._bump((carwash_id, on_date))
+
+    def invalidate(
+        self, carwash_id: uuid.UUID, on_date: Optional[date] = None
+    ) -> None:
+        """Сбрасывает день (или все дни автомойки), чтобы он перечитался из БД."""
+        if on_date is not None:
+            keys = [(carwash_id, _as_date(on_date))]
+        else:
+            keys = [key for key in self._days if key[0] == carwash_id]
+
+        for key in keys:
+            self._bump(key)
+            self._drop(key)
+
+    def _drop(self, key: Tuple[uuid.UUID, date]) -> None:
+        self._loaded_at.pop(key, None)
+        bays = self._days.pop(key, None)
+        if not bays:
+            return
+        for bay in bays.values():
+            for slot_id in bay.slot_ids.values():
+                self._slots.pop(slot_id, None)
+
+    def _mark(self, slot_id: uuid.UUID, is_free: bool) -> bool:
+        location = self._slots.get(slot_id)
+        if location is None:
+            # День не загружен — нечего обновлять, он прочитается из БД
+            return False
+        carwash_id, on_date, bay_id, index = location
+        self._days[(carwash_id, on_date)][bay_id].set_free(index, is_free)
+        self._bump((carwash_id, on_date))
+        return True
+
+    def reserve(self, slot_id: uuid.UUID) -> bool:
+        """Помечает слот занятым. Возвращает False, если день не загружен."""
+        return self._mark(slot_id, False)
+
+    def release(self, slot_id: uuid.UUID) -> bool:
+        """Помечает слот свободным. Возвращает False, если день не загружен."""
+        return self._mark(slot_id, True)
+
+    def _bays(self, carwash_id: uuid.UUID, on_date: date) -> Dict[uuid.UUID, BayDay]:
+        return self._days.get((carwash_id, _as_date(on_date)), {})
+
+    def count_free(self, carwash_id: uuid.UUID, on_date: date) -> int:
+        return sum(bay.free.bit_count() for bay in self._bays(carwash_id, on_date).values())
+
+    def free_slots(
+        self,
+        carwash_id: uuid.UUID,
+        on_date: date,
+        after: Optional[time] = None,
+        span: int = 1,
+    ) -> List[FreeSlot]:
+        """
+        Свободные слоты дня, отсортированные по времени начала.
+
+        span > 1 — только слоты, с которых в том же боксе свободны span
+        слотов подряд (end_time — конец последнего из них).
+        """
+        on_date = _as_date(on_date)
+        min_index = slot_index(after) if after is not None else 0
+        result = []
+        for bay in self._bays(carwash_id, on_date).values():
+            mask = bay.free
+            for shift in range(1, span):
+                mask &= bay.free >> shift
+            mask = mask >> min_index << min_index
+            while mask:
+                low = mask & -mask
+                index = low.bit_length() - 1
+                result.append(
+                    FreeSlot(
+                        id=bay.slot_ids[index],
+                        wash_bay_id=bay.wash_bay_id,
+                        slot_date=on_date,
+                        start_time=index_to_time(index),
+                        end_time=index_to_time((index + span) % SLOTS_PER_DAY),
+                    )
+                )
+                mask ^= low
+        result.sort(key=lambda s: (s.start_time, str(s.wash_bay_id)))
+        return result
+
+    def first_free_after(
+        self, carwash_id: uuid.UUID, on_date: date, after: time
+    ) -> Optional[FreeSlot]:
+        """Первый свободный слот, начинающийся не раньше after."""
+        on_date = _as_date(on_date)
+        min_index = slot_index(after)
+        if _as_time(after) > index_to_time(min_index):
+            min_index += 1
+
+        best: Optional[Tuple[int, BayDay]] = None
+        for bay in self._bays(carwash_id, on_date).values():
+            mask = bay.free >> min_index << min_index
+            if not mask:
+                continue
+            index = (mask & -mask).bit_length() - 1
+            if best is None or index < best[0]:
+                best = (index, bay)
+
+        if best is None:
+            return None
+        index, bay = best
+        return FreeSlot(
+            id=bay.slot_ids[index],
+            wash_bay_id=bay.wash_bay_id,
+            slot_date=on_date,
+            start_time=index_to_time(index),
+            end_time=index_to_time((index + 1) % SLOTS_PER_DAY),
+        )
+
+
+# Общий для процесса экземпляр
+availability = AvailabilityEngine()
+
+
+async def ensure_day_loaded(
+    carwash_id: uuid.UUID, on_date: date, session: AsyncSession
+) -> AvailabilityEngine:
+    """
+    Загружает день в движок из БД, если он не загружен или устарел.
+
+    Перед загрузкой досоздаются слоты боксов, у которых их на эту дату нет;
+    они коммитятся до загрузки, чтобы движок не увидел слоты, которые затем
+    откатятся. Параллельные запросы одного дня ждут одну загрузку.
+    """
+    if availability.is_loaded(carwash_id, on_date):
+        return availability
+    async with availability.load_lock(carwash_id, on_date):
+        if not availability.is_loaded(carwash_id, on_date):
+            created = await ensure_slots_for_date(
+                carwash_id,
+                _as_date(on_date),
+                session,
+                horizon_days=get_settings().slot_horizon_days,
+            )
+            if created:
+                await session.commit()
+            repo = TimeSlotRepository(session)
+            rows = await repo.get_day_slots(carwash_id=carwash_id, on_date=on_date)
+            availability.load_day(carwash_id, on_date, rows)
+    return availability
+
+
+# Счётчики свободных слотов дней, не загруженных в движок: (автомойка, дата) -> число
+_day_counts: TTLCache[int] = TTLCache(maxsize=10_000, ttl=DAY_COUNTS_TTL)
+
+
+async def count_free_by_day(
+    carwash_id: uuid.UUID, date_from: date, days: int, session: AsyncSession
+) -> Dict[date, int]:
+    """
+    Количество свободных слотов автомойки на каждый день диапазона.
+
+    Загруженные в движок дни считаются по битовым картам, остальные — одним
+    сгруппированным запросом (результат кэшируется на DAY_COUNTS_TTL секунд).
+    Дни, на которые слотов ещё нет, догружаются через ensure_day_loaded.
+    """
+    counts: Dict[date, int] = {}
+    missing: List[date] = []
+    for offset in range(days):
+        on_date = date_from + timedelta(days=offset)
+        if availability.is_loaded(carwash_id, on_date):
+            counts[on_date] = availability.count_free(carwash_id, on_date)
+        elif (cached := _day_counts.get((carwash_id, on_date))) is not None:
+            counts[on_date] = cached
+        else:
+            missing.append(on_date)
+
+    if missing:
+        repo = TimeSlotRepository(session)
+        rows = await repo.count_available_by_day(carwash_id, missing[0], missing[-1])
+        found = {_as_date(row.slot_day): row.available for row in rows}
+        for on_date in missing:
+            if on_date in found:
+                counts[on_date] = found[on_date]
+                _day_counts.set((carwash_id, on_date), found[on_date])
+            else:
+                engine = await ensure_day_loaded(carwash_id, on_date, session)
+                counts[on_date] = engine.count_free(carwash_id, on_date)
+
+    return dict(sorted(counts.items()))
@@ -1,5 +1,5 @@
 import uuid
-from typing import Optional
+from typing import Any, Optional
 from datetime import datetime, date, timedelta
 
 from fastapi import HTTPException
@@ -7,6 +7,8 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 
 from src.repositories.booking import BookingRepository
+from src.repositories.statistic import StatisticRepository, status_change_deltas
+from src.services.availability import SLOT_MINUTES, availability
 
 from src.schemas.booking import (
     SBookingCreate,
@@ -19,6 +21,26 @@ from src.schemas.booking import (
 )
 
 
+def to_booking_details(
+    source: Any, with_qr: bool = True, **extra: Any
+) -> SBookingWithDetails:
+    """
+    Единый маппер бронирования в SBookingWithDetails.
+
+    :param source: строка BookingRepository.details_query() или ORM-объект Booking.
+    :param with_qr: добавить QR-код подтверждённой брони.
+    :param extra: поля, которых нет в source (например, при создании брони).
+    """
+    details = SBookingWithDetails.model_validate(source, from_attributes=True)
+    if with_qr and details.status == "confirmed":
+        details.qr_code = BookingRepository.generate_qr_data(
+            details.id, details.guest_phone
+        )
+    for field, value in extra.items():
+        setattr(details, field, value)
+    return details
+
+
 async def create_booking_service(
     data: SBookingCreate, session: AsyncSession
 ) -> SBookingConfirmation:
@@ -29,41 +51,21 @@ async def create_booking_service(
     """
     repo = BookingRepository(session)
 
-    # 1. Создаем бронирование через репозиторий
-    booking, slot, carwash, wash_type = await repo.create_booking(data)
+    # 1. Создаем бронирование через репозиторий: занимаем столько слотов
+    # подряд, сколько длится мойка
+    booking, slots, carwash, wash_type = await repo.create_booking(data, SLOT_MINUTES)
+    slot = slots[0]
 
     # 2. Генерируем QR-код
     qr_data = repo.generate_qr_data(booking.id, booking.guest_phone)
 
     # 3. Формируем детальную схему бронирования
-    booking_details = SBookingWithDetails(
-        id=booking.id,
-        user_id=booking.user_id,
-        car_wash_id=booking.car_wash_id,
-        wash_bay_id=booking.wash_bay_id,
-        time_slot_id=booking.time_slot_id,
-        wash_type_id=booking.wash_type_id,
-        guest_phone=booking.guest_phone,
-        guest_name=booking.guest_name,
-        car_plate=booking.car_plate,
-        car_model=booking.car_model,
-        booking_date=booking.booking_date,
-        slot_date=booking.slot_date,
-        start_time=booking.start_time,
-        end_time=booking.end_time,
-        duration_minutes=booking.duration_minutes,
-        price=booking.price,
-        discount=booking.discount,
-        final_price=booking.final_price,
-        status=booking.status,
-        payment_status=booking.payment_status,
-        notes=booking.notes,
-        cancellation_reason=booking.cancellation_reason,
-        created_at=booking.created_at,
+    booking_details = to_booking_details(
+        booking,
         car_wash_name=carwash.name,
         car_wash_address=carwash.address,
         wash_type_name=wash_type.name,
-        bay_number=slot.wash_bay.bay_number if slot.wash_bay else None,
+        bay_number=slot.bay_number,
         qr_code=qr_data,
     )
 
@@ -78,11 +80,18 @@ async def create_booking_service(
         expires_at=booking.expires_at,
     )
 
-    # 5. Возвращаем итоговый объект
-    return SBookingConfirmation(
+    confirmation = SBookingConfirmation(
         booking=booking_details, payment=payment_info, qr_code=qr_data
     )
 
+    # 5. Фиксируем бронь и только после commit занимаем слоты в движке:
+    # при откате движок не должен считать их занятыми
+    await session.commit()
+    for reserved in slots:
+        availability.reserve(reserved.id)
+
+    return confirmation
+
 
 async def get_my_bookings_service(
     phone: str,
@@ -90,58 +99,31 @@ async def get_my_bookings_service(
     page: int,
     per_page: int,
     session: AsyncSession,
+    cursor: Optional[str] = None,
+    with_total: bool = False,
 ) -> SBookingListResponse:
     """Сервисная функция для получения бронирований пользователя."""
     repo = BookingRepository(session)
-    bookings, total = await repo.get_by_phone(
-        phone=phone, status=status, page=page, per_page=per_page
+    bookings, total, next_cursor = await repo.get_by_phone(
+        phone=phone,
+        status=status,
+        page=page,
+        per_page=per_page,
+        cursor=cursor,
+        with_total=with_total,
     )
 
-    items = []
-    for b in bookings:
-        qr_data = (
-            repo.generate_qr_data(b.id, b.guest_phone)
-            if b.status == "confirmed"
-            else None
-        )
-
-        items.append(
-            SBookingWithDetails(
-                id=b.id,
-                user_id=b.user_id,
-                car_wash_id=b.car_wash_id,
-                wash_bay_id=b.wash_bay_id,
-                time_slot_id=b.time_slot_id,
-                wash_type_id=b.wash_type_id,
-                guest_phone=b.guest_phone,
-                guest_name=b.guest_name,
-                car_plate=b.car_plate,
-                car_model=b.car_model,
-                booking_date=b.booking_date,
-                slot_date=b.slot_date,
-                start_time=b.start_time,
-                end_time=b.end_time,
-                duration_minutes=b.duration_minutes,
-                price=b.price,
-                discount=b.discount,
-                final_price=b.final_price,
-                status=b.status,
-                payment_status=b.payment_status,
-                notes=b.notes,
-                cancellation_reason=b.cancellation_reason,
-                created_at=b.created_at,
-                car_wash_name=b.car_wash.name if b.car_wash else None,
-                car_wash_address=b.car_wash.address if b.car_wash else None,
-                wash_type_name=b.wash_type.name if b.wash_type else None,
-                bay_number=b.wash_bay.bay_number if b.wash_bay else None,
-                qr_code=qr_data,
-            )
-        )
+    items = [to_booking_details(row) for row in bookings]
 
-    pages = (total + per_page - 1) // per_page
+    pages = (total + per_page - 1) // per_page if total is not None else None
 
     return SBookingListResponse(
-        items=items, total=total, page=page, per_page=per_page, pages=pages
+        items=items,
+        total=total,
+        page=page,
+        per_page=per_page,
+        pages=pages,
+        next_cursor=next_cursor,
     )
 
 
@@ -150,47 +132,12 @@ async def get_booking_by_id_service(
 ) -> SBookingWithDetails:
     """Сервисная функция для получения одного бронирования по ID."""
     repo = BookingRepository(session)
-    booking = await repo.get_by_id(booking_id)
+    row = await repo.get_details_by_id(booking_id)
 
-    if not booking:
+    if not row:
         raise HTTPException(status_code=404, detail="Бронирование не найдено")
 
-    qr_data = (
-        repo.generate_qr_data(booking.id, booking.guest_phone)
-        if booking.status == "confirmed"
-        else None
-    )
-
-    return SBookingWithDetails(
-        id=booking.id,
-        user_id=booking.user_id,
-        car_wash_id=booking.car_wash_id,
-        wash_bay_id=booking.wash_bay_id,
-        time_slot_id=booking.time_slot_id,
-        wash_type_id=booking.wash_type_id,
-        guest_phone=booking.guest_phone,
-        guest_name=booking.guest_name,
-        car_plate=booking.car_plate,
-        car_model=booking.car_model,
-        booking_date=booking.booking_date,
-        slot_date=booking.slot_date,
-        start_time=booking.start_time,
-        end_time=booking.end_time,
-        duration_minutes=booking.duration_minutes,
-        price=booking.price,
-        discount=booking.discount,
-        final_price=booking.final_price,
-        status=booking.status,
-        payment_status=booking.payment_status,
-        notes=booking.notes,
-        cancellation_reason=booking.cancellation_reason,
-        created_at=booking.created_at,
-        car_wash_name=booking.car_wash.name if booking.car_wash else None,
-        car_wash_address=booking.car_wash.address if booking.car_wash else None,
-        wash_type_name=booking.wash_type.name if booking.wash_type else None,
-        bay_number=booking.wash_bay.bay_number if booking.wash_bay else None,
-        qr_code=qr_data,
-    )
+    return to_booking_details(row)
 
 
 async def cancel_booking_service(
@@ -218,15 +165,23 @@ async def cancel_booking_service(
         )
 
     # Отменяем бронирование
+    old_status = booking.status
     booking.status = "cancelled"
     booking.cancelled_at = datetime.now()
     booking.cancellation_reason = reason
 
-    # Освобождаем слот
-    if booking.time_slot:
-        booking.time_slot.status = "available"
+    # Освобождаем все слоты брони; счётчики — после слотов, как во всех
+    # путях изменения броней
+    released = await repo.set_slots_status(
+        [booking.id], ("reserved", "booked"), "available"
+    )
+    await StatisticRepository(session).increment(
+        status_change_deltas(old_status, "cancelled", booking.user_id)
+    )
 
     await session.commit()
+    for slot_id in released:
+        availability.release(slot_id)
 
     # TODO: Логика возврата средств (можно вызвать другой сервис)
 
@@ -245,26 +200,33 @@ async def get_carwash_bookings_service(
     page: int,
     per_page: int,
     session: AsyncSession,
+    cursor: Optional[str] = None,
+    with_total: bool = False,
 ) -> SBookingListResponse:
     """Сервисная функция для получения бронирований автомойки."""
     repo = BookingRepository(session)
-    bookings, total = await repo.get_for_carwash(
+    bookings, total, next_cursor = await repo.get_for_carwash(
         carwash_id=carwash_id,
         date_from=date_from,
         date_to=date_to,
         status=status,
         page=page,
         per_page=per_page,
+        cursor=cursor,
+        with_total=with_total,
     )
 
-    items = [
-        SBookingWithDetails.model_validate(b, from_attributes=True) for b in bookings
-    ]
+    items = [to_booking_details(row, with_qr=False) for row in bookings]
 
-    pages = (total + per_page - 1) // per_page
+    pages = (total + per_page - 1) // per_page if total is not None else None
 
     return SBookingListResponse(
-        items=items, total=total, page=page, per_page=per_page, pages=pages
+        items=items,
+        total=total,
+        page=page,
+        per_page=per_page,
+        pages=pages,
+        next_cursor=next_cursor,
     )
 
 
@@ -0,0 +1,93 @@
+"""
+Автоматическая отмена неоплаченных бронирований.
+
+create_booking выставляет expires_at = now + 15 минут и резервирует слот.
+Фоновая задача отменяет просроченные брони пачками и возвращает их слоты
+в продажу. Лидер выбирается через pg_try_advisory_xact_lock: если задачу
+одновременно запускают несколько воркеров, пачку обрабатывает только один.
+"""
+
+import logging
+import time
+from dataclasses import dataclass
+from datetime import datetime
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.db import async_session_maker
+from src.repositories.booking import BookingRepository
+from src.services.availability import availability
+
+
+logger = logging.getLogger(__name__)
+
+# Ключ advisory-блокировки задачи отмены
+BOOKING_EXPIRY_LOCK_ID = 7_301_011
+EXPIRY_REASON = "Истекло время оплаты"
+
+
+@dataclass
+class ExpiryStats:
+    """Счётчики задачи с момента запуска процесса."""
+
+    runs: int = 0
+    skipped_not_leader: int = 0
+    expired_total: int = 0
+    last_expired: int = 0
+    last_duration_ms: float = 0.0
+
+
+expiry_stats = ExpiryStats()
+
+
+async def expire_unpaid_bookings_service(
+    session: AsyncSession, batch_size: int, max_batches: int = 20
+) -> int | None:
+    """
+    Отменяет просроченные неоплаченные брони пачками по batch_size.
+
+    Каждая пачка — отдельная транзакция под advisory-блокировкой.
+    Возвращает количество отменённых броней или None, если блокировку
+    держит другой воркер.
+    """
+    repo = BookingRepository(session)
+    expired_count = 0
+    for _ in range(max_batches):
+        if not await repo.try_advisory_lock(BOOKING_EXPIRY_LOCK_ID):
+            await session.rollback()
+            return expired_count or None
+
+        # expires_at пишется как datetime.now(), поэтому сравниваем с ним же
+        expired, released = await repo.expire_unpaid(
+            datetime.now(), batch_size, EXPIRY_REASON
+        )
+        await session.commit()
+
+        for slot_id in released:
+            availability.release(slot_id)
+        expired_count += expired
+        if expired < batch_size:
+            break
+    return expired_count
+
+
+async def booking_expiry_job(batch_size: int = 500) -> None:
+    """Фоновая задача: отменяет просроченные брони и пишет метрики в лог."""
+    started = time.perf_counter()
+    async with async_session_maker() as session:
+        expired = await expire_unpaid_bookings_service(session, batch_size)
+
+    expiry_stats.runs += 1
+    expiry_stats.last_duration_ms = (time.perf_counter() - started) * 1000
+    if expired is None:
+        expiry_stats.skipped_not_leader += 1
+        return
+
+    expiry_stats.last_expired = expired
+    expiry_stats.expired_total += expired
+    if expired:
+        logger.info(
+            f"Отменено неоплаченных броней: {expired} "
+            f"за {expiry_stats.last_duration_ms:.0f} мс "
+            f"(всего {expiry_stats.expired_total})"
+        )
@@ -2,35 +2,120 @@
 Сервисный слой для работы с автомойками
 """
 
+import math
 import uuid
 from typing import List, Optional
 from datetime import date, datetime
 
 from fastapi import HTTPException
+from pydantic import TypeAdapter
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.core.cache import (
+    catalog_cache,
+    CachedJSON,
+    CARWASH_LIST_KEY,
+    TTLCache,
+    carwash_key,
+)
 from src.repositories.carwash import CarWashRepository
-from src.repositories.timeslot import TimeSlotRepository
-from src.services.timeslot import generate_slots_for_bay_service
+from src.repositories.statistic import (
+    CARWASHES_KEY,
+    BOOKINGS_TOTAL_KEY,
+    StatisticRepository,
+    booking_status_key,
+)
+from src.services.availability import (
+    SLOT_MINUTES,
+    SLOTS_PER_DAY,
+    availability,
+    count_free_by_day,
+    ensure_day_loaded,
+    index_to_time,
+)
+from src.services.geo_index import carwash_geo_index
+from src.services.washtype import get_wash_type_by_id_service
 
-from src.schemas.carwash import SCarWashCreate, SCarWashResponse, SCarWashUpdate
+from src.schemas.carwash import (
+    SCarWashCreate,
+    SCarWashNearbyResponse,
+    SCarWashResponse,
+    SCarWashUpdate,
+)
+from src.schemas.timeslot import SAvailabilityResponse, SDayAvailability, SFreeSlotResponse
 from src.schemas.washbay import SWashBayCreate, SWashBayResponse
 
 
+_carwash_list_adapter = TypeAdapter(List[SCarWashResponse])
+_free_slots_adapter = TypeAdapter(List[SFreeSlotResponse])
+
+# Готовые ответы /slots: ключ включает версию дня в движке доступности,
+# поэтому reserve/release/отмена сразу делают старый ответ недостижимым
+_free_slots_cache: TTLCache[bytes] = TTLCache(maxsize=4096, ttl=60)
+
+
+async def get_all_carwashes_json_service(session: AsyncSession) -> CachedJSON:
+    """Список автомоек в виде готового JSON из кэша справочников."""
+
+    async def load() -> bytes:
+        repo = CarWashRepository(session)
+        carwashes = await repo.get_all()
+        return _carwash_list_adapter.dump_json(
+            [SCarWashResponse.model_validate(cw) for cw in carwashes]
+        )
+
+    return await catalog_cache.get_or_load(CARWASH_LIST_KEY, load)
+
+
 async def get_all_carwashes_service(session: AsyncSession) -> List[SCarWashResponse]:
-    repo = CarWashRepository(session)
-    carwashes = await repo.get_all()
-    return [SCarWashResponse.model_validate(cw) for cw in carwashes]
+    cached = await get_all_carwashes_json_service(session)
+    return _carwash_list_adapter.validate_json(cached.body)
+
+
+async def search_carwashes_nearby_service(
+    latitude: float,
+    longitude: float,
+    radius_km: Optional[float],
+    page: int,
+    per_page: int,
+    session: AsyncSession,
+) -> List[SCarWashNearbyResponse]:
+    """
+    Автомойки рядом с точкой по возрастанию расстояния.
+
+    Без radius_km — просто ближайшие (nearest-K), страница за страницей.
+    Мойки без координат в поиск не попадают.
+    """
+    cached = await get_all_carwashes_json_service(session)
+    hits = carwash_geo_index.refresh(cached).nearest(
+        latitude, longitude, limit=page * per_page, radius_km=radius_km
+    )
+    return [
+        SCarWashNearbyResponse(**card, distance=round(distance, 2))
+        for distance, card in hits[(page - 1) * per_page :]
+    ]
+
+
+async def get_carwash_by_id_json_service(
+    carwash_id: uuid.UUID, session: AsyncSession
+) -> CachedJSON:
+    """Автомойка по ID в виде готового JSON из кэша справочников."""
+
+    async def load() -> bytes:
+        repo = CarWashRepository(session)
+        carwash = await repo.get_by_id(carwash_id)
+        if not carwash:
+            raise HTTPException(status_code=404, detail="Автомойка не найдена")
+        return SCarWashResponse.model_validate(carwash).model_dump_json().encode()
+
+    return await catalog_cache.get_or_load(carwash_key(carwash_id), load)
 
 
 async def get_carwash_by_id_service(
     carwash_id: uuid.UUID, session: AsyncSession
 ) -> SCarWashResponse:
-    repo = CarWashRepository(session)
-    carwash = await repo.get_by_id(carwash_id)
-    if not carwash:
-        raise HTTPException(status_code=404, detail="Автомойка не найдена")
-    return SCarWashResponse.model_validate(carwash)
+    cached = await get_carwash_by_id_json_service(carwash_id, session)
+    return SCarWashResponse.model_validate_json(cached.body)
 
 
 async def create_carwash_service(
@@ -52,12 +137,17 @@ async def create_carwash_service(
 async def add_wash_bay_service(
     carwash_id: uuid.UUID, data: SWashBayCreate, session: AsyncSession
 ) -> SWashBayResponse:
-    """Сервис для добавления моечного бокса и запуска генерации слотов."""
+    """
+    Сервис для добавления моечного бокса.
+
+    Слоты не генерируются сразу: они создаются лениво при первом запросе даты
+    и фоновой задачей продления горизонта.
+    """
     repo = CarWashRepository(session)
     wash_bay = await repo.add_bay(carwash_id, data)
 
-    # Запускаем генерацию слотов для нового бокса
-    await generate_slots_for_bay_service(carwash_id, wash_bay, session)
+    # Загруженные дни не знают о новом боксе — перечитаем их из БД
+    availability.invalidate(carwash_id)
 
     return SWashBayResponse.model_validate(wash_bay)
 
@@ -85,19 +175,15 @@ async def delete_carwash_service(carwash_id: uuid.UUID, session: AsyncSession) -
 
 
 async def get_statistics_service(session: AsyncSession) -> dict:
-    carwash_repo = CarWashRepository(session)
-    carwash_count = (await carwash_repo.get_stats())["carwash_count"]
-
-    total = await carwash_repo.total_bookings()
-    total_bookings = total["total_bookings"]
-
-    confirmed = await carwash_repo.confirmed_bookings()
-    confirmed_bookings = confirmed["confirmed_bookings"]
-
+    """Общая статистика — из инкрементальных счётчиков, без count(*) по броням."""
+    confirmed_key = booking_status_key("confirmed")
+    counters = await StatisticRepository(session).get_many(
+        [CARWASHES_KEY, BOOKINGS_TOTAL_KEY, confirmed_key]
+    )
     return {
-        "carwashes_count": carwash_count,
-        "total_bookings": total_bookings,
-        "confirmed_bookings": confirmed_bookings,
+        "carwashes_count": counters[CARWASHES_KEY],
+        "total_bookings": counters[BOOKINGS_TOTAL_KEY],
+        "confirmed_bookings": counters[confirmed_key],
     }
 
 
@@ -105,9 +191,97 @@ async def get_carwash_slots_stats_service(
     carwash_id: uuid.UUID, on_date_str: Optional[str], session: AsyncSession
 ) -> dict:
     """Сервис для получения количества свободных слотов."""
-    repo = TimeSlotRepository(session)
     on_date = date.fromisoformat(on_date_str) if on_date_str else date.today()
 
-    count = await repo.count_available_slots(carwash_id=carwash_id, on_date=on_date)
+    engine = await ensure_day_loaded(carwash_id, on_date, session)
+    count = engine.count_free(carwash_id, on_date)
 
     return {"available_slots_count": count, "date": on_date.isoformat()}
+
+
+async def get_carwash_availability_service(
+    carwash_id: uuid.UUID,
+    date_from: Optional[date],
+    days: int,
+    session: AsyncSession,
+) -> SAvailabilityResponse:
+    """Количество свободных слотов по дням — для выбора даты за один запрос."""
+    counts = await count_free_by_day(
+        carwash_id, date_from or date.today(), days, session
+    )
+    return SAvailabilityResponse(
+        carwash_id=carwash_id,
+        days=[
+            SDayAvailability(date=on_date, available_slots_count=count)
+            for on_date, count in counts.items()
+        ],
+    )
+
+
+async def get_free_slots_json_service(
+    carwash_id: uuid.UUID,
+    on_date: Optional[date],
+    wash_type_id: Optional[uuid.UUID],
+    per_bay: bool,
+    session: AsyncSession,
+) -> bytes:
+    """
+    Свободные слоты автомойки на дату в виде готового JSON.
+
+    С wash_type_id — только слоты, с которых в одном боксе хватает подряд
+    идущих свободных слотов на длительность мойки. Без per_bay на каждое
+    время начала возвращается один слот (первый подходящий бокс).
+    На сегодня отдаются только слоты, которые ещё не начались.
+    """
+    on_date = on_date or date.today()
+    span = 1
+    if wash_type_id is not None:
+        wash_type = await get_wash_type_by_id_service(wash_type_id, session)
+        span = max(1, math.ceil(wash_type.duration_minutes / SLOT_MINUTES))
+
+    today = date.today()
+    if on_date < today:
+        return b"[]"
+    first_index = 0
+    if on_date == today:
+        # Уже начавшиеся слоты не предлагаем
+        now = datetime.now()
+        first_index = -(-(now.hour * 60 + now.minute) // SLOT_MINUTES)
+        if first_index >= SLOTS_PER_DAY:
+            return b"[]"
+
+    engine = await ensure_day_loaded(carwash_id, on_date, session)
+    key = (
+        carwash_id,
+        on_date,
+        span,
+        per_bay,
+        first_index,
+        engine.day_version(carwash_id, on_date),
+    )
+    body = _free_slots_cache.get(key)
+    if body is not None:
+        return body
+
+    slots = engine.free_slots(
+        carwash_id, on_date, after=index_to_time(first_index), span=span
+    )
+    if not per_bay:
+        by_start = {}
+        for slot in slots:
+            by_start.setdefault(slot.start_time, slot)
+        slots = list(by_start.values())
+    body = _free_slots_adapter.dump_json(
+        [
+            SFreeSlotResponse(
+                id=s.id,
+                wash_bay_id=s.wash_bay_id,
+                slot_date=s.slot_date,
+                start_time=s.start_time.strftime("%H:%M"),
+                end_time=s.end_time.strftime("%H:%M"),
+            )
+            for s in slots
+        ]
+    )
+    _free_slots_cache.set(key, body)
+    return body
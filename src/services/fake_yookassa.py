@@ -0,0 +1,111 @@
+"""
+Локальный фейковый провайдер, повторяющий нужную часть API ЮKassa v3.
+
+Нужен, чтобы проверять задержки и отказы платежного шлюза без сети:
+    uvicorn src.services.fake_yookassa:create_fake_yookassa_app --factory --port 8100
+или внутри процесса через PAYMENT_GATEWAY_MODE=fake.
+
+Параметры берутся из окружения:
+- FAKE_YOOKASSA_LATENCY_MS — задержка каждого ответа;
+- FAKE_YOOKASSA_FAILURE_RATE — доля ответов 503 (0..1).
+"""
+
+import asyncio
+import os
+import random
+import uuid
+from datetime import datetime
+from typing import Dict, Optional
+
+from fastapi import FastAPI, Header, HTTPException, Request
+from fastapi.responses import JSONResponse
+
+
+def create_fake_yookassa_app(
+    latency_ms: Optional[float] = None, failure_rate: Optional[float] = None
+) -> FastAPI:
+    """Создаёт ASGI-приложение фейкового провайдера."""
+    if latency_ms is None:
+        latency_ms = float(os.getenv("FAKE_YOOKASSA_LATENCY_MS", "0"))
+    if failure_rate is None:
+        failure_rate = float(os.getenv("FAKE_YOOKASSA_FAILURE_RATE", "0"))
+
+    app = FastAPI(title="Fake YooKassa", docs_url=None, openapi_url=None)
+    payments: Dict[str, dict] = {}
+    refunds: Dict[str, dict] = {}
+    # Ответы по Idempotence-Key: повтор запроса возвращает тот же объект
+    idempotent: Dict[str, dict] = {}
+
+    @app.middleware("http")
+    async def simulate_network(request: Request, call_next):
+        if latency_ms:
+            await asyncio.sleep(latency_ms / 1000)
+        if failure_rate and random.random() < failure_rate:
+            return JSONResponse(
+                {"type": "error", "code": "internal_server_error"}, status_code=503
+            )
+        return await call_next(request)
+
+    @app.post("/v3/payments")
+    async def create_payment(
+        data: dict, idempotence_key: str = Header(..., alias="Idempotence-Key")
+    ):
+        if idempotence_key in idempotent:
+            return idempotent[idempotence_key]
+        payment_id = str(uuid.uuid4())
+        payment = {
+            "id": payment_id,
+            "status": "pending",
+            "paid": False,
+            "amount": data["amount"],
+            "description": data.get("description"),
+            "metadata": data.get("metadata", {}),
+            "confirmation": {
+                "type": "redirect",
+                "confirmation_url": f"/fake-yookassa/checkout/{payment_id}",
+            },
+            "created_at": datetime.now().isoformat(),
+        }
+        payments[payment_id] = idempotent[idempotence_key] = payment
+        return payment
+
+    @app.get("/v3/payments/{payment_id}")
+    async def get_payment(payment_id: str):
+        payment = payments.get(payment_id)
+        if payment is None:
+            raise HTTPException(status_code=404, detail="Payment not found")
+        return payment
+
+    @app.post("/v3/payments/{payment_id}/succeed", include_in_schema=False)
+    async def succeed_payment(payment_id: str):
+        """Служебный метод: эмулирует оплату покупателем."""
+        payment = await get_payment(payment_id)
+        payment.update(status="succeeded", paid=True)
+        return payment
+
+    @app.post("/v3/refunds")
+    async def create_refund(
+        data: dict, idempotence_key: str = Header(..., alias="Idempotence-Key")
+    ):
+        if idempotence_key in idempotent:
+            return idempotent[idempotence_key]
+        if data.get("payment_id") not in payments:
+            raise HTTPException(status_code=404, detail="Payment not found")
+        refund = {
+            "id": str(uuid.uuid4()),
+            "payment_id": data["payment_id"],
+            "status": "succeeded",
+            "amount": data["amount"],
+            "created_at": datetime.now().isoformat(),
+        }
+        refunds[refund["id"]] = idempotent[idempotence_key] = refund
+        return refund
+
+    @app.get("/v3/refunds/{refund_id}")
+    async def get_refund(refund_id: str):
+        refund = refunds.get(refund_id)
+        if refund is None:
+            raise HTTPException(status_code=404, detail="Refund not found")
+        return refund
+
+    return app
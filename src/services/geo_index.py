@@ -0,0 +1,176 @@
+"""
+Пространственный индекс автомоек в памяти процесса.
+
+Автомойки с координатами раскладываются по ячейкам сетки CELL_DEG x CELL_DEG
+градусов. Поиск ближайших обходит кольца ячеек вокруг точки и останавливается,
+как только следующее кольцо заведомо дальше k-й найденной мойки (или радиуса),
+поэтому время ответа зависит от плотности моек рядом с точкой, а не от размера
+каталога.
+
+Индекс строится из закэшированного списка автомоек (catalog_cache) и
+перестраивается, когда у списка меняется ETag: изменения каталога в любом
+процессе инвалидируют кэш, а значит и индекс.
+"""
+
+import heapq
+import json
+import math
+import uuid
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from src.core.cache import CachedJSON
+
+
+EARTH_RADIUS_KM = 6371.0
+KM_PER_DEGREE = math.pi * EARTH_RADIUS_KM / 180
+# ~11 км по широте: в ячейку попадает район города
+CELL_DEG = 0.1
+# Обход колец прекращается, когда квадрат колец больше занятых ячеек во
+# столько раз: остальное дешевле досмотреть перебором занятых ячеек
+RING_SCAN_FACTOR = 4
+
+Cell = Tuple[int, int]
+
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Расстояние по большому кругу в километрах."""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi = phi2 - phi1
+    dlmb = math.radians(lon2 - lon1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlmb / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def _cell(latitude: float, longitude: float) -> Cell:
+    return math.floor(latitude / CELL_DEG), math.floor(longitude / CELL_DEG)
+
+
+class GeoIndex:
+    """Сетка ячеек: ячейка -> [(широта, долгота, id)]; карточки моек по id."""
+
+    def __init__(self) -> None:
+        self.etag: Optional[str] = None
+        self._cells: Dict[Cell, List[Tuple[float, float, uuid.UUID]]] = {}
+        self._items: Dict[uuid.UUID, dict] = {}
+        # Границы занятых ячеек: (min_row, max_row, min_col, max_col)
+        self._bounds = (0, 0, 0, 0)
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def build(self, carwashes: Iterable[dict], etag: Optional[str] = None) -> None:
+        """Перестраивает индекс по карточкам автомоек (без координат — пропускаются)."""
+        cells: Dict[Cell, List[Tuple[float, float, uuid.UUID]]] = defaultdict(list)
+        items: Dict[uuid.UUID, dict] = {}
+        for cw in carwashes:
+            lat, lon = cw.get("latitude"), cw.get("longitude")
+            if lat is None or lon is None:
+                continue
+            carwash_id = uuid.UUID(str(cw["id"]))
+            cells[_cell(lat, lon)].append((lat, lon, carwash_id))
+            items[carwash_id] = cw
+
+        self._cells = dict(cells)
+        self._items = items
+        self.etag = etag
+        if cells:
+            rows = [c[0] for c in cells]
+            cols = [c[1] for c in cells]
+            self._bounds = (min(rows), max(rows), min(cols), max(cols))
+
+    def refresh(self, cached: CachedJSON) -> "GeoIndex":
+        """Перестраивает индекс, если список автомоек в кэше изменился."""
+        if cached.etag != self.etag:
+            self.build(json.loads(cached.body), cached.etag)
+        return self
+
+    @staticmethod
+    def _ring_of(center: Cell, cell: Cell) -> int:
+        """Номер кольца вокруг center, в котором лежит cell."""
+        return max(abs(cell[0] - center[0]), abs(cell[1] - center[1]))
+
+    def _max_ring(self, center: Cell) -> int:
+        """Кольцо, за которым занятых ячеек уже нет."""
+        min_row, max_row, min_col, max_col = self._bounds
+        return max(
+            abs(center[0] - min_row),
+            abs(center[0] - max_row),
+            abs(center[1] - min_col),
+            abs(center[1] - max_col),
+        )
+
+    def _ring(self, center: Cell, r: int) -> Iterable[Cell]:
+        """Ячейки на границе квадрата (2r+1) x (2r+1) вокруг center."""
+        row, col = center
+        if r == 0:
+            yield center
+            return
+        for dc in range(-r, r + 1):
+            yield row - r, col + dc
+            yield row + r, col + dc
+        for dr in range(-r + 1, r):
+            yield row + dr, col - r
+            yield row + dr, col + r
+
+    @staticmethod
+    def _ring_min_km(latitude: float, r: int) -> float:
+        """
+        Нижняя оценка расстояния до любой точки в кольцах r и дальше:
+        r - 1 целых ячеек по долготе на самой «узкой» широте квадрата.
+        """
+        if r <= 1:
+            return 0.0
+        edge_lat = min(90.0, abs(latitude) + (r + 1) * CELL_DEG)
+        return (r - 1) * CELL_DEG * KM_PER_DEGREE * math.cos(math.radians(edge_lat))
+
+    def nearest(
+        self,
+        latitude: float,
+        longitude: float,
+        limit: int,
+        radius_km: Optional[float] = None,
+    ) -> List[Tuple[float, dict]]:
+        """
+        До limit ближайших автомоек (в пределах radius_km, если задан),
+        отсортированных по расстоянию: [(км, карточка)].
+        """
+        if not self._items or limit <= 0:
+            return []
+
+        center = _cell(latitude, longitude)
+        # max-heap из limit лучших: (-расстояние, id)
+        best: List[Tuple[float, uuid.UUID]] = []
+
+        def visit(cell: Cell) -> None:
+            for lat, lon, carwash_id in self._cells.get(cell, ()):
+                dist = haversine_km(latitude, longitude, lat, lon)
+                if radius_km is not None and dist > radius_km:
+                    continue
+                if len(best) < limit:
+                    heapq.heappush(best, (-dist, carwash_id))
+                elif dist < -best[0][0]:
+                    heapq.heapreplace(best, (-dist, carwash_id))
+
+        r = 0
+        max_ring = self._max_ring(center)
+        while r <= max_ring:
+            bound = self._ring_min_km(latitude, r)
+            if radius_km is not None and bound > radius_km:
+                break
+            if len(best) == limit and bound > -best[0][0]:
+                break
+            if (2 * r + 1) ** 2 > RING_SCAN_FACTOR * len(self._cells):
+                # Вокруг точки пусто: дешевле досмотреть оставшиеся занятые ячейки
+                for cell in self._cells:
+                    if self._ring_of(center, cell) >= r:
+                        visit(cell)
+                break
+            for cell in self._ring(center, r):
+                visit(cell)
+            r += 1
+
+        return [(-neg, self._items[cid]) for neg, cid in sorted(best, reverse=True)]
+
+
+carwash_geo_index = GeoIndex()
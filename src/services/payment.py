@@ -2,14 +2,18 @@
 Сервисный слой для работы с платежами.
 """
 
-import uuid
-from typing import Optional
+import json
+import hashlib
 from datetime import datetime
+from typing import Optional
 
 from fastapi import HTTPException, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.repositories.booking import BookingRepository
+from src.repositories.payment_event import PaymentEventRepository
+from src.repositories.statistic import StatisticRepository, status_change_deltas
+from src.services.payment_inbox import notify_payment_inbox
 from src.services.payment_gateway import PaymentGatewayService
 from src.schemas.payment import (
     SPaymentCreate,
@@ -65,58 +69,90 @@ async def create_payment_service(
     )
 
 
-async def process_webhook_service(
+def _webhook_event_id(data: dict, body: bytes) -> str:
+    """
+    Ключ идемпотентности уведомления.
+
+    ЮKassa не присылает id уведомления, но пара (событие, id объекта)
+    уникальна; для прочих тел берётся хэш содержимого. Вызывается только
+    для проверенного уведомления (_verified_notification): иначе поддельное
+    тело заняло бы ключ настоящего события.
+    """
+    object_id = (data.get("object") or {}).get("id")
+    if data.get("event") and object_id:
+        return f"{data['event']}:{object_id}"
+    return hashlib.sha256(body).hexdigest()
+
+
+async def _verified_notification(
+    data: dict, signed: bool, gateway: PaymentGatewayService
+) -> Optional[dict]:
+    """
+    Уведомление, которому можно верить, или None.
+
+    Подписанное тело (и тело для демо-шлюза, которому не у кого уточнять)
+    принимается как есть. В неподписанном теле верим только id объекта:
+    объект запрашивается у провайдера, а событие выводится из его текущего
+    статуса. Если объект не платёж и не возврат, проверить его нечем.
+    """
+    if signed or gateway.demo_mode:
+        return data
+    event = data.get("event") or ""
+    object_id = (data.get("object") or {}).get("id")
+    if not object_id:
+        return None
+    if event.startswith("payment."):
+        verified = await gateway.get_payment(object_id)
+        kind = "payment"
+    elif event.startswith("refund."):
+        verified = await gateway.get_refund(object_id)
+        kind = "refund"
+    else:
+        return None
+    return {
+        "type": "notification",
+        "event": f"{kind}.{verified['status']}",
+        "object": verified,
+    }
+
+
+async def ingest_webhook_service(
     request: Request, gateway: PaymentGatewayService, session: AsyncSession
 ) -> dict:
-    """Сервис для обработки webhook от платежной системы."""
+    """
+    Принимает webhook платежной системы: проверяет подпись, один раз разбирает
+    тело и сохраняет событие в inbox. Обработка выполняется воркерами
+    (src.services.payment_inbox), поэтому ответ не ждёт изменений брони.
+
+    Неподписанное уведомление сверяется с провайдером до записи в inbox
+    (запрос идёт до открытия транзакции).
+    """
     body = await request.body()
     signature = request.headers.get("X-Signature", "")
-    # Если провайдер не прислал подпись — считаем, что это демо-режим и не блокируем запрос.
-    # В проде нужно гарантировать наличие подписи и выбрасывать ошибку.
     if signature and not gateway.verify_signature(body, signature):
         raise HTTPException(status_code=400, detail="Invalid signature")
 
-    data = await request.json()
-    event = data.get("event")
-    payment_object = data.get("object", {})
-    booking_id_str = payment_object.get("metadata", {}).get("booking_id")
-
-    if not booking_id_str:
-        return {"status": "ignored", "reason": "no booking_id in metadata"}
-
-    repo = BookingRepository(session)
     try:
-        booking = await repo.get_by_id(uuid.UUID(booking_id_str))
+        data = json.loads(body)
     except ValueError:
-        return {"status": "ignored", "reason": "invalid booking_id format"}
-
-    if not booking:
-        return {"status": "ignored", "reason": "booking not found"}
-
-    if event == "payment.succeeded":
-        booking.payment_status = "paid"
-        booking.status = "confirmed"
-        if booking.time_slot:
-            booking.time_slot.status = "booked"
-        await session.commit()
-        # TODO: Отправить уведомление пользователю и автомойке
-        return {"status": "processed", "booking_status": "confirmed"}
-
-    elif event == "payment.canceled":
-        booking.payment_status = "failed"
-        booking.status = "cancelled"
-        booking.cancellation_reason = "Платеж отменен"
-        if booking.time_slot:
-            booking.time_slot.status = "available"
-        await session.commit()
-        return {"status": "processed", "booking_status": "cancelled"}
-
-    elif event == "refund.succeeded":
-        booking.payment_status = "refunded"
-        await session.commit()
-        return {"status": "processed", "payment_status": "refunded"}
-
-    return {"status": "ignored", "reason": "unknown event"}
+        raise HTTPException(status_code=400, detail="Invalid JSON")
+    if not isinstance(data, dict):
+        raise HTTPException(status_code=400, detail="Invalid JSON")
+
+    data = await _verified_notification(data, bool(signature), gateway)
+    if data is None:
+        return {"status": "ignored"}
+
+    repo = PaymentEventRepository(session)
+    accepted = await repo.add(
+        event_id=_webhook_event_id(data, body),
+        event=data.get("event") or "unknown",
+        payload=data,
+    )
+    await session.commit()
+    if accepted:
+        notify_payment_inbox()
+    return {"status": "accepted" if accepted else "duplicate"}
 
 
 async def create_refund_service(
@@ -168,10 +204,13 @@ async def confirm_demo_payment_service(session: AsyncSession) -> dict:
             status_code=404, detail="Бронирование для оплаты не найдено"
         )
 
+    old_status = booking.status
     booking.payment_status = "paid"
     booking.status = "confirmed"
-    if booking.time_slot:
-        booking.time_slot.status = "booked"
+    await repo.set_slots_status([booking.id], ("reserved",), "booked")
+    await StatisticRepository(session).increment(
+        status_change_deltas(old_status, "confirmed", booking.user_id)
+    )
     await session.commit()
 
     return {
@@ -1,30 +1,200 @@
 """
-Сервис-шлюз для интеграции с внешней платежной системой (например, ЮKassa).
-В данном проекте используется заглушка для демонстрации, но конфигурация
-shop_id/secret_key уже берётся из Settings, чтобы при деплое можно было
-просто подставить боевые данные.
+Сервис-шлюз для интеграции с внешней платежной системой (ЮKassa).
+
+Режимы (PAYMENT_GATEWAY_MODE):
+- demo — заглушка без сетевых запросов (по умолчанию, для разработки);
+- yookassa — асинхронный клиент API ЮKassa;
+- fake — тот же клиент, но запросы уходят в локальный фейковый провайдер
+  (src.services.fake_yookassa) внутри процесса, без сети.
+
+Клиент создаётся один раз на процесс: общий httpx.AsyncClient переиспользует
+соединения, POST-запросы повторяются с тем же Idempotence-Key, а после серии
+ошибок circuit breaker временно перестаёт обращаться к провайдеру.
 """
 
+import asyncio
 import uuid
 import hashlib
 import hmac
+import logging
+import random
+import time
 from datetime import datetime
-from typing import Optional
+from typing import Any, Optional
+
+import httpx
+from fastapi import HTTPException
+
+from src.core.config import Settings, get_settings
+
+
+logger = logging.getLogger(__name__)
+
+YOOKASSA_API_URL = "https://api.yookassa.ru/v3"
+
+# Ответы, после которых запрос имеет смысл повторить
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class CircuitBreaker:
+    """
+    Размыкатель цепи: после failure_threshold ошибок подряд запросы не
+    отправляются reset_timeout секунд, затем пропускается один пробный
+    запрос. Пока он выполняется, остальные отклоняются; успех пробного
+    запроса замыкает цепь, ошибка — снова размыкает на reset_timeout.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._trial_in_flight = False
 
-from src.core.config import Settings
+    @property
+    def is_open(self) -> bool:
+        if self._opened_at is None:
+            return False
+        if time.monotonic() - self._opened_at >= self.reset_timeout:
+            # Полуоткрытое состояние: открыта, пока идёт пробный запрос
+            return self._trial_in_flight
+        return True
+
+    def allow_request(self) -> bool:
+        """Можно ли отправить запрос; в полуоткрытом состоянии — только один."""
+        if self.is_open:
+            return False
+        if self._opened_at is not None:
+            self._trial_in_flight = True
+        return True
+
+    @property
+    def trial_in_flight(self) -> bool:
+        return self._trial_in_flight
+
+    def release_trial(self) -> None:
+        """Пробный запрос завершился без record_*: следующий снова разрешён."""
+        self._trial_in_flight = False
+
+    def record_success(self) -> None:
+        self._failures = 0
+        self._opened_at = None
+        self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        self._failures += 1
+        self._trial_in_flight = False
+        if self._failures >= self.failure_threshold:
+            if self._opened_at is None:
+                logger.warning("Платежный шлюз недоступен, цепь разомкнута")
+            self._opened_at = time.monotonic()
 
 
 class PaymentGatewayService:
     """
     Сервис интеграции с платежной системой.
-    В продакшене здесь будет реальная интеграция с ЮKassa/Stripe/Т-Касса.
+
+    В демо-режиме возвращает заглушки, иначе работает с API ЮKassa.
     """
 
-    def __init__(self, shop_id: str | None = None, secret_key: str | None = None):
+    def __init__(
+        self,
+        shop_id: str | None = None,
+        secret_key: str | None = None,
+        base_url: str = YOOKASSA_API_URL,
+        demo_mode: bool = True,
+        timeout: float = 10.0,
+        retries: int = 2,
+        retry_backoff: float = 0.2,
+        breaker: Optional[CircuitBreaker] = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
         self.shop_id = shop_id or "demo_shop"
         self.secret_key = secret_key or "demo_secret"
-        # Для реальной интеграции можно будет вынести в настройки
-        self.base_url = "https://api.yookassa.ru/v3"
+        self.base_url = base_url
+        self.demo_mode = demo_mode
+        self.retries = retries
+        self.retry_backoff = retry_backoff
+        self.breaker = breaker or CircuitBreaker()
+        self._client: Optional[httpx.AsyncClient] = None
+        if not demo_mode:
+            self._client = httpx.AsyncClient(
+                base_url=base_url,
+                auth=(self.shop_id, self.secret_key),
+                timeout=httpx.Timeout(timeout, connect=3.0),
+                limits=httpx.Limits(max_connections=50, max_keepalive_connections=20),
+                transport=transport,
+            )
+
+    async def close(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+
+    async def _request(
+        self,
+        method: str,
+        url: str,
+        json: Optional[dict] = None,
+        idempotence_key: Optional[str] = None,
+    ) -> dict:
+        """
+        Запрос к API провайдера с повторами и circuit breaker.
+
+        Повтор POST безопасен: провайдер узнаёт его по Idempotence-Key.
+        """
+        if not self.breaker.allow_request():
+            raise HTTPException(
+                status_code=503, detail="Платежная система временно недоступна"
+            )
+        # Разрешённый запрос при пробном в полёте — это и есть пробный
+        trial = self.breaker.trial_in_flight
+        try:
+            return await self._send(method, url, json, idempotence_key)
+        finally:
+            if trial:
+                # Запрос мог быть отменён до record_*: освобождаем пробный слот
+                self.breaker.release_trial()
+
+    async def _send(
+        self,
+        method: str,
+        url: str,
+        json: Optional[dict],
+        idempotence_key: Optional[str],
+    ) -> dict:
+        headers = {"Idempotence-Key": idempotence_key} if idempotence_key else None
+        for attempt in range(self.retries + 1):
+            last_attempt = attempt == self.retries
+            try:
+                response = await self._client.request(
+                    method, url, json=json, headers=headers
+                )
+            except httpx.TransportError as e:
+                logger.error(f"Payment gateway request error on {method} {url}: {e}")
+                if last_attempt:
+                    self.breaker.record_failure()
+                    raise HTTPException(
+                        status_code=502, detail="Платежная система не отвечает"
+                    )
+            else:
+                if response.status_code not in RETRY_STATUSES:
+                    # 4xx — ошибка запроса, а не провайдера: цепь не размыкаем
+                    self.breaker.record_success()
+                    if response.is_error:
+                        logger.error(
+                            f"Payment gateway error on {method} {url}: "
+                            f"{response.status_code} - {response.text}"
+                        )
+                        raise HTTPException(
+                            status_code=502, detail="Платежная система отклонила запрос"
+                        )
+                    return response.json()
+                if last_attempt:
+                    self.breaker.record_failure()
+                    raise HTTPException(
+                        status_code=502, detail="Платежная система не отвечает"
+                    )
+            await asyncio.sleep(random.uniform(0, self.retry_backoff * 2**attempt))
 
     async def create_payment(
         self,
@@ -34,43 +204,74 @@ class PaymentGatewayService:
         return_url: str,
         metadata: dict = None,
     ) -> dict:
-        """
-        Создать платеж в ЮKassa.
-        В демо-режиме возвращает заглушку.
-        """
-        payment_id = f"pay_{uuid.uuid4().hex[:16]}"
-
-        # В реальной интеграции здесь будет асинхронный HTTP-запрос к API ЮKassa
-
-        return {
-            "id": payment_id,
-            "status": "pending",
-            "amount": {"value": str(amount), "currency": "RUB"},
-            "confirmation": {
-                "type": "redirect",
-                "confirmation_url": f"/api/v1/payments/demo-pay?payment_id={payment_id}&amount={amount}",
-            },
-            "created_at": datetime.now().isoformat(),
-            "metadata": {"booking_id": str(booking_id)},
+        """Создать платеж в ЮKassa."""
+        if self.demo_mode:
+            payment_id = f"pay_{uuid.uuid4().hex[:16]}"
+            return {
+                "id": payment_id,
+                "status": "pending",
+                "amount": {"value": str(amount), "currency": "RUB"},
+                "confirmation": {
+                    "type": "redirect",
+                    "confirmation_url": f"/api/v1/payments/demo-pay?payment_id={payment_id}&amount={amount}",
+                },
+                "created_at": datetime.now().isoformat(),
+                "metadata": {"booking_id": str(booking_id)},
+            }
+
+        payload = {
+            "amount": {"value": f"{amount:.2f}", "currency": "RUB"},
+            "capture": True,
+            "confirmation": {"type": "redirect", "return_url": return_url},
+            "description": description[:128],
+            "metadata": {**(metadata or {}), "booking_id": str(booking_id)},
         }
+        # Ключ из id брони: повторное создание платежа (повтор запроса
+        # клиентом, ретрай после таймаута) вернёт тот же платёж
+        return await self._request(
+            "POST", "/payments", json=payload, idempotence_key=f"pay:{booking_id}"
+        )
 
     async def get_payment(self, payment_id: str) -> dict:
         """Получить информацию о платеже."""
-        return {"id": payment_id, "status": "succeeded", "paid": True}
+        if self.demo_mode:
+            return {"id": payment_id, "status": "succeeded", "paid": True}
+        return await self._request("GET", f"/payments/{payment_id}")
+
+    async def get_refund(self, refund_id: str) -> dict:
+        """Получить информацию о возврате."""
+        if self.demo_mode:
+            return {"id": refund_id, "status": "succeeded"}
+        return await self._request("GET", f"/refunds/{refund_id}")
 
     async def create_refund(
         self, payment_id: str, amount: float, reason: Optional[str] = None
     ) -> dict:
         """Создать возврат."""
-        refund_id = f"ref_{uuid.uuid4().hex[:16]}"
+        if self.demo_mode:
+            refund_id = f"ref_{uuid.uuid4().hex[:16]}"
+            return {
+                "id": refund_id,
+                "payment_id": payment_id,
+                "status": "succeeded",
+                "amount": {"value": str(amount), "currency": "RUB"},
+                "created_at": datetime.now().isoformat(),
+            }
 
-        return {
-            "id": refund_id,
+        payload: dict[str, Any] = {
             "payment_id": payment_id,
-            "status": "succeeded",
-            "amount": {"value": str(amount), "currency": "RUB"},
-            "created_at": datetime.now().isoformat(),
+            "amount": {"value": f"{amount:.2f}", "currency": "RUB"},
         }
+        if reason:
+            payload["description"] = reason[:250]
+        # Повтор того же возврата (та же сумма по тому же платежу) не
+        # создаёт второй возврат
+        return await self._request(
+            "POST",
+            "/refunds",
+            json=payload,
+            idempotence_key=f"refund:{payment_id}:{amount:.2f}",
+        )
 
     def verify_signature(self, body: bytes, signature: str) -> bool:
         """Проверить подпись webhook."""
@@ -78,17 +279,52 @@ class PaymentGatewayService:
         return hmac.compare_digest(expected, signature)
 
 
+_gateway: Optional[PaymentGatewayService] = None
+
+
+def create_payment_gateway(settings: Settings) -> PaymentGatewayService:
+    """Создаёт шлюз по настройке PAYMENT_GATEWAY_MODE."""
+    options = dict(
+        shop_id=settings.yookassa_shop_id,
+        secret_key=settings.yookassa_secret_key,
+        timeout=settings.payment_gateway_timeout,
+        retries=settings.payment_gateway_retries,
+    )
+    if settings.payment_gateway_mode == "demo":
+        return PaymentGatewayService(demo_mode=True, **options)
+    if settings.payment_gateway_mode == "fake":
+        # Импорт здесь: фейковый провайдер нужен только в этом режиме
+        from src.services.fake_yookassa import create_fake_yookassa_app
+
+        return PaymentGatewayService(
+            demo_mode=False,
+            base_url="http://fake-yookassa/v3",
+            transport=httpx.ASGITransport(app=create_fake_yookassa_app()),
+            **options,
+        )
+    return PaymentGatewayService(
+        demo_mode=False, base_url=settings.yookassa_api_url, **options
+    )
+
+
 def get_payment_gateway() -> PaymentGatewayService:
     """
-    DI-функция для получения экземпляра сервиса платежного шлюза.
+    DI-функция для получения общего экземпляра платежного шлюза.
 
-    Важно: shop_id и secret_key берутся из .env через Settings, так что
+    Важно: shop_id и secret_key берутся из .env через get_settings, так что
     при деплое достаточно задать переменные окружения:
       - yookassa_shop_id
       - yookassa_secret_key
+      - payment_gateway_mode=yookassa
     """
-    settings = Settings()
-    return PaymentGatewayService(
-        shop_id=settings.yookassa_shop_id,
-        secret_key=settings.yookassa_secret_key,
-    )
+    global _gateway
+    if _gateway is None:
+        _gateway = create_payment_gateway(get_settings())
+    return _gateway
+
+
+async def close_payment_gateway() -> None:
+    global _gateway
+    if _gateway is not None:
+        await _gateway.close()
+        _gateway = None
@@ -0,0 +1,157 @@
+"""
+Обработка входящих событий платёжной системы из inbox (таблица payment_events).
+
+Webhook только сохраняет событие и сразу отвечает провайдеру. Пул воркеров
+забирает события пачками (FOR UPDATE SKIP LOCKED) и применяет переходы
+статусов брони. Переходы идемпотентны: повторное или запоздавшее событие
+не меняет бронь, которая уже ушла из ожидаемого статуса.
+"""
+
+import asyncio
+import logging
+import uuid
+from datetime import datetime
+from typing import List, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.db import async_session_maker
+from src.models.payment_event import PaymentEvent
+from src.repositories.booking import BookingRepository
+from src.repositories.payment_event import PaymentEventRepository
+from src.repositories.statistic import StatisticRepository, status_change_deltas
+from src.services.availability import availability
+
+
+logger = logging.getLogger(__name__)
+
+# После стольких неудачных попыток событие помечается failed
+MAX_ATTEMPTS = 5
+
+# Будит воркеров, когда webhook принял новое событие
+_wakeup = asyncio.Event()
+
+
+def notify_payment_inbox() -> None:
+    _wakeup.set()
+
+
+async def _apply_event(
+    event: PaymentEvent, session: AsyncSession, released_slots: List[uuid.UUID]
+) -> str:
+    """Применяет событие к брони и возвращает итоговый статус события."""
+    payment_object = event.payload.get("object") or {}
+    booking_id_str = (payment_object.get("metadata") or {}).get("booking_id")
+    if not booking_id_str:
+        return "ignored"
+    try:
+        booking_id = uuid.UUID(booking_id_str)
+    except ValueError:
+        return "ignored"
+
+    repo = BookingRepository(session)
+    booking = await repo.get_for_payment_update(booking_id)
+    if not booking:
+        return "ignored"
+
+    if event.event == "payment.succeeded":
+        if booking.payment_status == "paid":
+            return "processed"
+        booking.payment_status = "paid"
+        if booking.status == "pending_payment":
+            booking.status = "confirmed"
+            await repo.set_slots_status([booking.id], ("reserved",), "booked")
+            await StatisticRepository(session).increment(
+                status_change_deltas("pending_payment", "confirmed", booking.user_id)
+            )
+        else:
+            # Бронь уже отменена (например, истекло время оплаты) — слот
+            # не возвращаем, деньги нужно вернуть
+            logger.warning(
+                f"Оплата пришла для брони {booking.id} в статусе {booking.status}, "
+                "требуется возврат"
+            )
+        return "processed"
+
+    if event.event == "payment.canceled":
+        if booking.status != "pending_payment":
+            return "processed"
+        booking.payment_status = "failed"
+        booking.status = "cancelled"
+        booking.cancelled_at = datetime.now()
+        booking.cancellation_reason = "Платеж отменен"
+        released_slots.extend(
+            await repo.set_slots_status([booking.id], ("reserved",), "available")
+        )
+        await StatisticRepository(session).increment(
+            status_change_deltas("pending_payment", "cancelled", booking.user_id)
+        )
+        return "processed"
+
+    if event.event == "refund.succeeded":
+        booking.payment_status = "refunded"
+        return "processed"
+
+    return "ignored"
+
+
+async def process_payment_inbox_batch(batch_size: int) -> int:
+    """
+    Обрабатывает одну пачку событий в одной транзакции.
+
+    Каждое событие применяется в SAVEPOINT: ошибка одного события не
+    откатывает остальные. Возвращает количество забранных событий.
+    """
+    released_slots: List[uuid.UUID] = []
+    async with async_session_maker() as session:
+        repo = PaymentEventRepository(session)
+        events = await repo.claim_pending(batch_size)
+        for event in events:
+            event.attempts += 1
+            event_slots: List[uuid.UUID] = []
+            try:
+                # Меняем в SAVEPOINT только бронь: при откате SQLAlchemy
+                # сбрасывает изменённые в нём объекты, событие должно уцелеть
+                async with session.begin_nested():
+                    status = await _apply_event(event, session, event_slots)
+            except Exception as e:
+                logger.error(f"Ошибка обработки платежного события {event.event_id}: {e}")
+                event.error = str(e)
+                if event.attempts >= MAX_ATTEMPTS:
+                    event.status = "failed"
+                continue
+
+            event.status = status
+            event.processed_at = datetime.now()
+            event.error = None
+            released_slots.extend(event_slots)
+        await session.commit()
+
+    for slot_id in released_slots:
+        availability.release(slot_id)
+    return len(events)
+
+
+async def payment_inbox_worker(
+    batch_size: int, poll_interval: float, name: Optional[str] = None
+) -> None:
+    """
+    Воркер inbox: разбирает события, пока они есть, затем ждёт сигнала
+    от webhook или poll_interval секунд (события от других процессов API).
+    """
+    logger.info(f"Воркер платежных событий {name or ''} запущен")
+    while True:
+        try:
+            claimed = await process_payment_inbox_batch(batch_size)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Ошибка воркера платежных событий: {e}", exc_info=True)
+            claimed = 0
+
+        if claimed < batch_size:
+            _wakeup.clear()
+            try:
+                await asyncio.wait_for(_wakeup.wait(), timeout=poll_interval)
+            except asyncio.TimeoutError:
+                pass
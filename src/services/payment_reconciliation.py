@@ -0,0 +1,159 @@
+"""
+Сверка статусов платежей с платежной системой.
+
+Если webhook потерялся, бронь навсегда остаётся с payment_status='pending'.
+Задача постранично (keyset по id) проходит такие брони, запрашивает статус
+платежа у провайдера с ограниченной параллельностью и применяет результаты
+массовыми UPDATE на страницу.
+
+Запросы к провайдеру идут вне транзакций: страница читается в короткой
+сессии, результаты применяются в новой короткой транзакции, а единственность
+сверки обеспечивает сессионная advisory-блокировка без открытой транзакции.
+"""
+
+import asyncio
+import logging
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from fastapi import HTTPException
+
+from src.core.db import advisory_lock, async_session_maker
+from src.repositories.booking import BookingRepository
+from src.services.availability import availability
+from src.services.payment_gateway import PaymentGatewayService
+
+
+logger = logging.getLogger(__name__)
+
+# Ключ advisory-блокировки: сверку выполняет один воркер
+PAYMENT_RECONCILE_LOCK_ID = 7_301_014
+
+
+@dataclass
+class ReconcileStats:
+    """Результаты одного прохода сверки."""
+
+    scanned: int = 0
+    confirmed: int = 0
+    paid_without_booking: int = 0
+    cancelled: int = 0
+    unchanged: int = 0
+    errors: int = 0
+    duration_s: float = 0.0
+
+    @property
+    def per_minute(self) -> float:
+        return self.scanned / self.duration_s * 60 if self.duration_s else 0.0
+
+
+async def _fetch_statuses(
+    gateway: PaymentGatewayService, payment_ids: List[str], concurrency: int
+) -> Dict[str, Optional[str]]:
+    """Статусы платежей у провайдера; None — запрос не удался."""
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def fetch(payment_id: str) -> Optional[str]:
+        async with semaphore:
+            try:
+                payment = await gateway.get_payment(payment_id)
+            except HTTPException as e:
+                logger.warning(f"Сверка: статус платежа {payment_id} недоступен: {e.detail}")
+                return None
+            return payment.get("status")
+
+    statuses = await asyncio.gather(*(fetch(pid) for pid in payment_ids))
+    return dict(zip(payment_ids, statuses))
+
+
+async def reconcile_payments_service(
+    gateway: PaymentGatewayService, page_size: int = 500, concurrency: int = 20
+) -> Optional[ReconcileStats]:
+    """
+    Проходит все брони с неподтверждённой оплатой.
+
+    Возвращает статистику прохода или None, если сверку уже выполняет
+    другой воркер.
+    """
+    stats = ReconcileStats()
+    started = time.perf_counter()
+    after_id: Optional[uuid.UUID] = None
+
+    async with advisory_lock(PAYMENT_RECONCILE_LOCK_ID) as locked:
+        if not locked:
+            return None
+        while True:
+            async with async_session_maker() as session:
+                rows = await BookingRepository(session).get_pending_payments_page(
+                    after_id, page_size
+                )
+            if not rows:
+                break
+            after_id = rows[-1].id
+
+            statuses = await _fetch_statuses(
+                gateway, [row.payment_id for row in rows], concurrency
+            )
+            paid: List[uuid.UUID] = []
+            failed: List[uuid.UUID] = []
+            for row in rows:
+                status = statuses[row.payment_id]
+                if status == "succeeded":
+                    paid.append(row.id)
+                elif status == "canceled":
+                    failed.append(row.id)
+                elif status is None:
+                    stats.errors += 1
+                else:
+                    # pending / waiting_for_capture — покупатель ещё платит
+                    stats.unchanged += 1
+
+            released: List[uuid.UUID] = []
+            if paid or failed:
+                # Пока шли запросы, бронь могла измениться (webhook, отмена):
+                # bulk_mark_* меняют только брони, всё ещё ожидающие оплату
+                async with async_session_maker() as session:
+                    repo = BookingRepository(session)
+                    now = datetime.now()
+                    if paid:
+                        confirmed, paid_only = await repo.bulk_mark_paid(paid, now)
+                        stats.confirmed += confirmed
+                        stats.paid_without_booking += paid_only
+                    if failed:
+                        cancelled, released = await repo.bulk_mark_payment_failed(
+                            failed, now
+                        )
+                        stats.cancelled += cancelled
+                    await session.commit()
+
+            for slot_id in released:
+                availability.release(slot_id)
+            stats.scanned += len(rows)
+            if len(rows) < page_size:
+                break
+
+    stats.duration_s = time.perf_counter() - started
+    return stats
+
+
+async def payment_reconciliation_job(
+    gateway: PaymentGatewayService, page_size: int, concurrency: int
+) -> None:
+    """Фоновая задача сверки: пишет метрики прохода в лог."""
+    stats = await reconcile_payments_service(gateway, page_size, concurrency)
+    if stats is None or not stats.scanned:
+        return
+    logger.info(
+        f"Сверка платежей: проверено {stats.scanned} за {stats.duration_s:.1f} с "
+        f"({stats.per_minute:.0f}/мин), подтверждено {stats.confirmed}, "
+        f"отменено {stats.cancelled}, без изменений {stats.unchanged}, "
+        f"ошибок {stats.errors}"
+    )
+    if stats.paid_without_booking:
+        logger.warning(
+            f"Сверка платежей: {stats.paid_without_booking} оплат пришли для "
+            "уже отменённых броней, требуется возврат"
+        )
@@ -0,0 +1,95 @@
+"""
+Свёртка и пересчёт счётчиков статистики.
+
+Транзакции броней и автомоек дописывают изменения в statistic_deltas;
+фоновая задача (STATISTICS_FOLD_INTERVAL_SECONDS) сворачивает их в
+statistic_counters короткими транзакциями.
+
+Полный пересчёт — инструмент восстановления: после ручных правок в БД или
+миграций данных он приводит счётчики к точным значениям. Выполняется по
+расписанию (STATISTICS_RECOUNT_INTERVAL_SECONDS) или вручную из админки и
+не блокирует запись броней.
+"""
+
+import logging
+import time
+from typing import Dict, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.db import async_session_maker
+from src.repositories.booking import BookingRepository
+from src.repositories.statistic import StatisticRepository
+
+
+logger = logging.getLogger(__name__)
+
+# Ключ advisory-блокировки: свёртку и пересчёт выполняет один воркер
+STATISTICS_LOCK_ID = 7_301_021
+# Изменений, сворачиваемых одной транзакцией
+FOLD_BATCH_SIZE = 10_000
+
+
+async def fold_statistics_service(
+    session: AsyncSession, batch_size: int = FOLD_BATCH_SIZE, max_batches: int = 20
+) -> Optional[int]:
+    """
+    Сворачивает накопленные изменения счётчиков порциями по batch_size.
+
+    Каждая порция — отдельная транзакция под advisory-блокировкой.
+    Возвращает количество свёрнутых изменений или None, если блокировку
+    держит другой воркер.
+    """
+    repo = StatisticRepository(session)
+    lock = BookingRepository(session)
+    folded = 0
+    for _ in range(max_batches):
+        if not await lock.try_advisory_lock(STATISTICS_LOCK_ID):
+            await session.rollback()
+            return folded or None
+        batch = await repo.fold(batch_size)
+        await session.commit()
+        folded += batch
+        if batch < batch_size:
+            break
+    return folded
+
+
+async def statistics_fold_job() -> None:
+    """Фоновая задача свёртки изменений счётчиков."""
+    async with async_session_maker() as session:
+        await fold_statistics_service(session)
+
+
+async def recount_statistics_service() -> Optional[Dict[str, int]]:
+    """
+    Пересчитывает все счётчики в одной транзакции REPEATABLE READ.
+
+    Подсчёт идёт по снимку, видимые в нём изменения удаляются как учтённые,
+    а более поздние сворачиваются поверх (см. StatisticRepository.recount).
+    Возвращает новые значения или None, если свёртку или пересчёт уже
+    выполняет другой воркер.
+    """
+    async with async_session_maker() as session:
+        # Уровень изоляции задаётся до первого запроса транзакции
+        await session.connection(
+            execution_options={"isolation_level": "REPEATABLE READ"}
+        )
+        if not await BookingRepository(session).try_advisory_lock(STATISTICS_LOCK_ID):
+            await session.rollback()
+            return None
+        values = await StatisticRepository(session).recount()
+        await session.commit()
+    return values
+
+
+async def statistics_recount_job() -> None:
+    """Фоновая задача пересчёта: пишет в лог количество счётчиков и время."""
+    started = time.perf_counter()
+    values = await recount_statistics_service()
+    if values is None:
+        return
+    logger.info(
+        f"Пересчёт статистики: {len(values)} счётчиков "
+        f"за {(time.perf_counter() - started) * 1000:.0f} мс"
+    )
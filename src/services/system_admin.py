@@ -3,7 +3,7 @@ API эндпоинты для системных администраторов.
 """
 
 import uuid
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.core.db import get_async_session
@@ -16,6 +16,7 @@ from src.services.carwash import (
     get_statistics_service,
     add_wash_bay_service,
 )
+from src.services.statistics import recount_statistics_service
 
 router = APIRouter(prefix="/admin/system", tags=["Admin: System"])
 
@@ -68,3 +69,12 @@ async def add_wash_bay(
 async def get_system_statistics(session: AsyncSession = Depends(get_async_session)):
     """Получение общей статистики по системе."""
     return await get_statistics_service(session)
+
+
+@router.post("/statistics/recount", response_model=dict)
+async def recount_system_statistics():
+    """Полный пересчёт счётчиков статистики по данным."""
+    values = await recount_statistics_service()
+    if values is None:
+        raise HTTPException(status_code=409, detail="Пересчёт уже выполняется")
+    return {"status": "recounted", "counters": len(values)}
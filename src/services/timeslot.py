@@ -1,65 +1,136 @@
 """
 Сервисный слой для работы с временными слотами.
+
+Слоты создаются не заранее на 30 дней, а по мере необходимости:
+- лениво, при первом запросе даты (ensure_slots_for_date);
+- фоновой задачей, которая сдвигает горизонт вперёд (extend_slot_horizon_service).
 """
 
 import uuid
+import logging
 from datetime import date, time, timedelta, datetime
+from typing import Any, Dict, Iterator, List
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.core.db import async_session_maker
 from src.repositories.timeslot import TimeSlotRepository
-from src.repositories.carwash import CarWashRepository
-from src.models.washbay import WashBay
 
 
-async def generate_slots_for_bay_service(
+logger = logging.getLogger(__name__)
+
+SLOT_DURATION_MINUTES = 30
+DEFAULT_HORIZON_DAYS = 30
+
+
+def _parse_time(value: Any) -> time:
+    """Время работы хранится в JSONB строкой 'HH:MM'."""
+    if isinstance(value, time):
+        return value
+    return time.fromisoformat(value)
+
+
+def build_day_slots(
     carwash_id: uuid.UUID,
-    wash_bay: WashBay,
+    wash_bay_id: uuid.UUID,
+    working_hours: dict,
+    on_date: date,
+    slot_duration_minutes: int = SLOT_DURATION_MINUTES,
+) -> List[Dict[str, Any]]:
+    """
+    Строит слоты одного бокса на одну дату в пределах рабочих часов.
+
+    start_time и end_time в time_slots — timestamp, поэтому пишутся
+    datetime, а не time.
+    """
+    slot_time = datetime.combine(on_date, _parse_time(working_hours["start"]))
+    end_datetime = datetime.combine(on_date, _parse_time(working_hours["end"]))
+    step = timedelta(minutes=slot_duration_minutes)
+
+    slots = []
+    while slot_time < end_datetime:
+        slots.append(
+            {
+                "car_wash_id": carwash_id,
+                "wash_bay_id": wash_bay_id,
+                "slot_date": on_date,
+                "start_time": slot_time,
+                "end_time": slot_time + step,
+                "status": "available",
+            }
+        )
+        slot_time += step
+    return slots
+
+
+async def ensure_slots_for_date(
+    carwash_id: uuid.UUID,
+    on_date: date,
     session: AsyncSession,
-    days_ahead: int = 30,
-    slot_duration_minutes: int = 30,
-):
+    horizon_days: int = DEFAULT_HORIZON_DAYS,
+) -> int:
     """
-    Генерирует временные слоты для одного моечного бокса на N дней вперед.
+    Лениво создаёт слоты на дату для боксов автомойки, у которых их ещё нет.
 
-    :param carwash_id: ID автомойки.
-    :param wash_bay: Объект моечного бокса.
-    :param session: Сессия базы данных.
-    :param days_ahead: Количество дней для генерации.
-    :param slot_duration_minutes: Длительность одного слота в минутах.
+    Даты в прошлом и за пределами горизонта не генерируются.
+    Возвращает количество созданных слотов.
     """
-    carwash_repo = CarWashRepository(session)
-    timeslot_repo = TimeSlotRepository(session)
+    today = date.today()
+    if not today <= on_date <= today + timedelta(days=horizon_days):
+        return 0
+
+    repo = TimeSlotRepository(session)
+    bays = await repo.get_bays_without_slots(carwash_id=carwash_id, on_date=on_date)
+    if not bays:
+        return 0
+
+    slots = []
+    for bay in bays:
+        slots.extend(
+            build_day_slots(carwash_id, bay.wash_bay_id, bay.working_hours, on_date)
+        )
+    await repo.bulk_create(slots)
+    return len(slots)
 
-    carwash = await carwash_repo.get_by_id(carwash_id)
-    if not carwash:
-        # В реальном приложении здесь лучше выбрасывать исключение
-        return
 
-    start_time: time = carwash.working_hours["start"]
-    end_time: time = carwash.working_hours["end"]
+async def extend_slot_horizon_service(
+    session: AsyncSession, horizon_days: int = DEFAULT_HORIZON_DAYS
+) -> int:
+    """
+    Досоздаёт слоты всех активных боксов до today + horizon_days.
 
-    slots_to_create = []
+    Для каждого бокса генерация продолжается со дня после последнего
+    существующего слота. Возвращает количество созданных слотов.
+    """
+    repo = TimeSlotRepository(session)
     today = date.today()
+    last_day = today + timedelta(days=horizon_days)
+    created = 0
+
+    def slots(bays) -> Iterator[Dict[str, Any]]:
+        nonlocal created
+        for bay in bays:
+            last_slot_date = bay.last_slot_date
+            if isinstance(last_slot_date, datetime):
+                last_slot_date = last_slot_date.date()
+            day = max(today, last_slot_date + timedelta(days=1)) if last_slot_date else today
+            while day <= last_day:
+                for slot in build_day_slots(
+                    bay.car_wash_id, bay.wash_bay_id, bay.working_hours, day
+                ):
+                    created += 1
+                    yield slot
+                day += timedelta(days=1)
+
+    bays = await repo.get_bay_horizons()
+    await repo.bulk_create(slots(bays))
+    return created
+
 
-    for day_offset in range(days_ahead):
-        current_date = today + timedelta(days=day_offset)
-        slot_time = datetime.combine(current_date, start_time)
-        end_datetime = datetime.combine(current_date, end_time)
-
-        while slot_time < end_datetime:
-            slots_to_create.append(
-                {
-                    "car_wash_id": carwash_id,
-                    "wash_bay_id": wash_bay.id,
-                    "slot_date": current_date,
-                    "start_time": slot_time.time(),
-                    "end_time": (
-                        slot_time + timedelta(minutes=slot_duration_minutes)
-                    ).time(),
-                    "status": "available",
-                }
-            )
-            slot_time += timedelta(minutes=slot_duration_minutes)
-
-    await timeslot_repo.bulk_create(slots_to_create)
+async def slot_horizon_job(horizon_days: int = DEFAULT_HORIZON_DAYS) -> None:
+    """Фоновая задача: сдвигает горизонт слотов вперёд."""
+    async with async_session_maker() as session:
+        created = await extend_slot_horizon_service(session, horizon_days)
+        await session.commit()
+    if created:
+        logger.info(f"Горизонт слотов продлён: создано {created} слотов")
@@ -6,6 +6,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import HTTPException
 
 from src.models.carwash_admin import CarWashAdmin
+from src.models.users import User
 from src.repositories.carwash_admin import CarWashAdminRepository
 from src.repositories.users import UserRepository
 from src.schemas.users import (
@@ -15,6 +16,11 @@ from src.schemas.users import (
     SPhoneVerification,
 )
 from src.repositories.booking import BookingRepository
+from src.repositories.statistic import (
+    StatisticRepository,
+    user_completed_key,
+    user_total_key,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -27,6 +33,7 @@ class UserService:
         self.session = session
         self.user_repo = UserRepository(session)
         self.booking_repo = BookingRepository(session)
+        self.statistic_repo = StatisticRepository(session)
         self.carwash_admin_repo = CarWashAdminRepository() # No session needed for its methods
 
     async def create_user(self, user_data: SUserCreate) -> SUserResponse:
@@ -37,7 +44,7 @@ class UserService:
             logger.warning(
                 f"Попытка создать уже существующего пользователя: {user_data.telegram_id}"
             )
-            return await self.find_user(telegram_id=int(user_data.telegram_id))
+            return await self._with_statistics(existing_user)
 
         new_user_orm = self.user_repo.model(**user_data.model_dump())
         self.session.add(new_user_orm)
@@ -45,7 +52,7 @@ class UserService:
         await self.session.refresh(new_user_orm)
         logger.info(f"Создан новый пользователь: {new_user_orm.telegram_id}")
 
-        return await self.find_user(telegram_id=new_user_orm.telegram_id)
+        return await self._with_statistics(new_user_orm)
 
     async def verify_user(self, data: SPhoneVerification):
         user = await self.user_repo.get_one_or_none(telegram_id=data.telegram_id)
@@ -55,22 +62,25 @@ class UserService:
         user.phone_number = data.phone_number
         user.is_verified = True
         await self.session.flush()
-        return await self.find_user(telegram_id=data.telegram_id)
+        return await self._with_statistics(user)
 
     async def find_user(self, **filter_by) -> SUserResponse:
         user = await self.user_repo.get_one_or_none(**filter_by)
         if not user:
             logger.error(f"Пользователь не найден: {filter_by}")
             raise HTTPException(detail="Пользователь не найден", status_code=404)
-        total_booking = await self.booking_repo.statistic_total(user.id)
-        completed_booking = await self.booking_repo.statistic_completed(user.id)
-
-        # Собираем ответ, включая статистику
-        user_data_dict = user.__dict__
-        user_data_dict["total_bookings"] = total_booking
-        user_data_dict["completed_bookings"] = completed_booking
-
-        return SUserResponse.model_validate(user_data_dict)
+        return await self._with_statistics(user)
+
+    async def _with_statistics(self, user: User) -> SUserResponse:
+        """Ответ по пользователю со счётчиками броней."""
+        total_key, completed_key = user_total_key(user.id), user_completed_key(user.id)
+        counters = await self.statistic_repo.get_many([total_key, completed_key])
+        return SUserResponse.model_validate(user).model_copy(
+            update={
+                "total_bookings": counters[total_key],
+                "completed_bookings": counters[completed_key],
+            }
+        )
 
     async def find_all_users(
         self, skip: int = 0, limit: int = 100, **filter_by
@@ -7,6 +7,7 @@ import uuid
 from fastapi import HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.core.cache import catalog_cache, CachedJSON, WASH_TYPE_LIST_KEY, wash_type_key
 from src.repositories.washtype import WashTypeRepository
 from src.schemas.washtype import (
     SWashTypeCreate,
@@ -16,27 +17,49 @@ from src.schemas.washtype import (
 )
 
 
+async def get_all_wash_types_json_service(session: AsyncSession) -> CachedJSON:
+    """Все типы мойки в виде готового JSON из кэша справочников."""
+
+    async def load() -> bytes:
+        repo = WashTypeRepository(session)
+        wash_types, total = await repo.get_all()
+        return SWashTypeListResponse(
+            items=[SWashTypeResponse.model_validate(wt) for wt in wash_types],
+            total=total,
+        ).model_dump_json().encode()
+
+    return await catalog_cache.get_or_load(WASH_TYPE_LIST_KEY, load)
+
+
 async def get_all_wash_types_service(
     session: AsyncSession,
 ) -> SWashTypeListResponse:
     """Сервис для получения всех типов мойки."""
-    repo = WashTypeRepository(session)
-    wash_types, total = await repo.get_all()
-    return SWashTypeListResponse(
-        items=[SWashTypeResponse.model_validate(wt) for wt in wash_types],
-        total=total,
-    )
+    cached = await get_all_wash_types_json_service(session)
+    return SWashTypeListResponse.model_validate_json(cached.body)
+
+
+async def get_wash_type_by_id_json_service(
+    wash_type_id: uuid.UUID, session: AsyncSession
+) -> CachedJSON:
+    """Тип мойки по ID в виде готового JSON из кэша справочников."""
+
+    async def load() -> bytes:
+        repo = WashTypeRepository(session)
+        wash_type = await repo.get_by_id(wash_type_id)
+        if not wash_type:
+            raise HTTPException(status_code=404, detail="Тип мойки не найден")
+        return SWashTypeResponse.model_validate(wash_type).model_dump_json().encode()
+
+    return await catalog_cache.get_or_load(wash_type_key(wash_type_id), load)
 
 
 async def get_wash_type_by_id_service(
     wash_type_id: uuid.UUID, session: AsyncSession
 ) -> SWashTypeResponse:
     """Сервис для получения одного типа мойки по ID."""
-    repo = WashTypeRepository(session)
-    wash_type = await repo.get_by_id(wash_type_id)
-    if not wash_type:
-        raise HTTPException(status_code=404, detail="Тип мойки не найден")
-    return SWashTypeResponse.model_validate(wash_type)
+    cached = await get_wash_type_by_id_json_service(wash_type_id, session)
+    return SWashTypeResponse.model_validate_json(cached.body)
 
 
 async def create_wash_type_service(
@@ -0,0 +1,309 @@
+import uuid
+from datetime import date, datetime, time, timedelta
+
+import pytest
+from fastapi import HTTPException
+
+from src.bot.handlers.carwash_admin import wash_admin_report
+from src.core.db import async_session_maker
+from src.repositories.analytics import AnalyticsRepository
+from src.repositories.booking import BookingRepository
+from src.services import analytics
+from src.services.analytics import (
+    MAX_RANGE_DAYS,
+    ROLLUP_REFRESH_LOCK_ID,
+    get_carwash_analytics_service,
+    refresh_rollups_service,
+)
+
+
+CARWASH_ID = uuid.uuid4()
+
+
+def _summary_row(key, **values) -> dict:
+    row = dict(
+        bookings=0, completed=0, cancelled=0, no_show=0, booked_minutes=0, revenue=0
+    )
+    row.update(values, key=key)
+    return row
+
+
+@pytest.fixture
+def summary(monkeypatch):
+    """Подменяет AnalyticsRepository.summary и запоминает его аргументы."""
+    calls = []
+    result = {}
+
+    async def fake_summary(self, carwash_id, grain, date_from, date_to, group_by, no_show_before):
+        calls.append((grain, date_from, date_to, group_by, no_show_before))
+        return result["rows"], result["capacity"]
+
+    monkeypatch.setattr(AnalyticsRepository, "summary", fake_summary)
+
+    def set_result(rows, capacity):
+        result.update(rows=rows, capacity=capacity)
+        return calls
+
+    return set_result
+
+
+@pytest.mark.anyio
+async def test_rows_and_totals_are_computed_from_summary(summary):
+    day1, day2 = datetime(2024, 5, 1), datetime(2024, 5, 2)
+    calls = summary(
+        [
+            _summary_row(
+                day1, bookings=4, completed=2, cancelled=1, no_show=1,
+                booked_minutes=90, revenue=2500.004,
+            ),
+            _summary_row(day2, bookings=1, completed=1, booked_minutes=30, revenue=None),
+        ],
+        {day1: 120, day2: 0},
+    )
+
+    report = await get_carwash_analytics_service(
+        CARWASH_ID, "day", day1.date(), day2.date(), "bucket", session=None
+    )
+
+    first, second = report.items
+    assert first.key == "2024-05-01T00:00:00"
+    assert (first.utilization, first.no_show_rate, first.revenue) == (0.75, 0.3333, 2500.0)
+    # Без ёмкости и без неявок доли нулевые, а не деление на ноль
+    assert (second.capacity_minutes, second.utilization, second.no_show_rate) == (0, 0.0, 0.0)
+
+    totals = report.totals
+    assert totals.key == "total"
+    assert (totals.bookings, totals.completed, totals.cancelled, totals.no_show) == (5, 3, 1, 1)
+    assert (totals.booked_minutes, totals.capacity_minutes) == (120, 120)
+    assert (totals.utilization, totals.no_show_rate) == (1.0, 0.25)
+
+    # Неявки — только в интервалах, закончившихся к моменту запроса
+    (grain, _, _, group_by, no_show_before), = calls
+    assert (grain, group_by) == ("day", "bucket")
+    assert no_show_before <= datetime.now() - timedelta(days=1)
+
+
+@pytest.mark.anyio
+async def test_wash_type_rows_share_total_capacity(summary):
+    wash_types = [uuid.uuid4(), uuid.uuid4()]
+    summary(
+        [
+            _summary_row(wash_types[0], bookings=1, booked_minutes=30),
+            _summary_row(wash_types[1], bookings=2, booked_minutes=90),
+        ],
+        {None: 240},
+    )
+
+    report = await get_carwash_analytics_service(
+        CARWASH_ID, "hour", date(2024, 5, 1), date(2024, 5, 1), "wash_type", session=None
+    )
+
+    assert [item.key for item in report.items] == [str(w) for w in wash_types]
+    assert [item.utilization for item in report.items] == [0.125, 0.375]
+    assert (report.totals.capacity_minutes, report.totals.utilization) == (240, 0.5)
+
+
+@pytest.mark.anyio
+async def test_default_range_is_last_week(summary):
+    calls = summary([], {})
+
+    report = await get_carwash_analytics_service(
+        CARWASH_ID, "day", None, None, "bucket", session=None
+    )
+
+    assert (report.date_from, report.date_to) == (date.today() - timedelta(days=6), date.today())
+    assert calls[0][1:3] == (report.date_from, report.date_to)
+    assert report.items == []
+    assert (report.totals.bookings, report.totals.utilization) == (0, 0.0)
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize(
+    "date_from, date_to",
+    [
+        (date(2024, 5, 2), date(2024, 5, 1)),
+        (date(2024, 1, 1), date(2024, 1, 1) + timedelta(days=MAX_RANGE_DAYS)),
+    ],
+)
+async def test_invalid_range_is_rejected(summary, date_from, date_to):
+    calls = summary([], {})
+
+    with pytest.raises(HTTPException) as exc:
+        await get_carwash_analytics_service(
+            CARWASH_ID, "day", date_from, date_to, "bucket", session=None
+        )
+
+    assert exc.value.status_code == 400
+    assert calls == []
+
+
+@pytest.mark.anyio
+async def test_rebuild_days_counts_bookings_and_capacity(
+    pg_session, carwash_slot, booking_factory
+):
+    yesterday = date.today() - timedelta(days=1)
+    pg_session.add_all(
+        [
+            booking_factory(status="confirmed", payment_status="paid"),
+            booking_factory(status="cancelled", payment_status="refunded"),
+            # Прошедшие брони: подтверждённая без визита — неявка
+            booking_factory(slot_date=yesterday, status="confirmed", payment_status="paid"),
+            booking_factory(
+                slot_date=yesterday, start_time=time(11), end_time=time(11, 30),
+                status="completed", payment_status="paid",
+            ),
+        ]
+    )
+    await pg_session.commit()
+
+    carwash_id, tomorrow = carwash_slot.carwash_id, carwash_slot.slot_date
+    repo = AnalyticsRepository(pg_session)
+    await repo.rebuild_days([(carwash_id, yesterday), (carwash_id, tomorrow)])
+    # Пересборка идемпотентна
+    await repo.rebuild_days([(carwash_id, yesterday), (carwash_id, tomorrow)])
+    await pg_session.commit()
+
+    hourly = await get_carwash_analytics_service(
+        carwash_id, "hour", tomorrow, tomorrow, "bucket", pg_session
+    )
+    (item,) = hourly.items
+    assert item.key == datetime.combine(tomorrow, time(10)).isoformat()
+    assert (item.bookings, item.cancelled, item.no_show) == (2, 1, 0)
+    # Отменённая бронь не занимает бокс и не приносит выручки
+    assert (item.booked_minutes, item.capacity_minutes, item.utilization) == (30, 30, 1.0)
+    assert item.revenue == 1000
+
+    daily = await get_carwash_analytics_service(
+        carwash_id, "day", yesterday, tomorrow, "bucket", pg_session
+    )
+    assert [item.key for item in daily.items] == [
+        datetime.combine(day, time.min).isoformat() for day in (yesterday, tomorrow)
+    ]
+    past = daily.items[0]
+    assert (past.bookings, past.completed, past.no_show, past.no_show_rate) == (2, 1, 1, 0.5)
+    assert (daily.totals.bookings, daily.totals.revenue) == (4, 3000)
+
+    by_bay = await get_carwash_analytics_service(
+        carwash_id, "day", yesterday, tomorrow, "wash_bay", pg_session
+    )
+    assert [item.key for item in by_bay.items] == [str(carwash_slot.wash_bay_id)]
+    assert by_bay.items[0].capacity_minutes == 30
+
+
+@pytest.mark.anyio
+async def test_refresh_picks_up_changed_days(pg_session, carwash_slot, booking_factory):
+    pg_session.add(booking_factory(status="confirmed", payment_status="paid"))
+    await pg_session.commit()
+
+    rebuilt = await refresh_rollups_service(pg_session)
+
+    assert rebuilt >= 1
+    report = await get_carwash_analytics_service(
+        carwash_slot.carwash_id,
+        "day",
+        carwash_slot.slot_date,
+        carwash_slot.slot_date,
+        "bucket",
+        pg_session,
+    )
+    assert (report.totals.bookings, report.totals.revenue) == (1, 1000)
+
+    # Водяной знак сдвинут: без новых изменений пересобирается только перекрытие
+    watermark = await AnalyticsRepository(pg_session).get_watermark(
+        analytics.ROLLUP_WATERMARK
+    )
+    await pg_session.commit()
+    assert watermark <= datetime.now()
+
+
+@pytest.mark.anyio
+async def test_refresh_skips_when_another_worker_holds_lock(pg_session):
+    async with async_session_maker() as other:
+        assert await BookingRepository(other).try_advisory_lock(ROLLUP_REFRESH_LOCK_ID)
+
+        assert await refresh_rollups_service(pg_session) is None
+
+        await other.rollback()
+
+
+class FakeMessage:
+    def __init__(self):
+        self.edits = []
+        self.answers = []
+
+    async def edit_text(self, text, **kwargs):
+        self.edits.append(text)
+
+    async def answer(self, text, **kwargs):
+        self.answers.append(text)
+
+
+class FakeCallback:
+    def __init__(self, data: str):
+        self.data = data
+        self.message = FakeMessage()
+        self.answered = False
+
+    async def answer(self, *args, **kwargs):
+        self.answered = True
+
+
+class FakeApiClient:
+    def __init__(self, report=None, error=None):
+        self.report = report
+        self.error = error
+        self.calls = []
+
+    async def get_carwash_analytics(self, carwash_id, **params):
+        self.calls.append((carwash_id, params))
+        if self.error:
+            raise self.error
+        return self.report
+
+
+def _report_row(key: str, **values) -> dict:
+    row = dict(
+        key=key, bookings=0, completed=0, cancelled=0, no_show=0, revenue=0.0,
+        booked_minutes=0, capacity_minutes=0, utilization=0.0, no_show_rate=0.0,
+    )
+    row.update(values)
+    return row
+
+
+@pytest.mark.anyio
+async def test_report_handler_renders_totals_and_days():
+    report = {
+        "items": [
+            _report_row("2024-05-01T00:00:00", bookings=3, revenue=3000.0, utilization=0.25),
+            _report_row("2024-05-02T00:00:00", bookings=1, revenue=1000.0, utilization=0.1),
+        ],
+        "totals": _report_row(
+            "total", bookings=4, completed=2, cancelled=1, no_show=1,
+            revenue=4000.0, utilization=0.175, no_show_rate=0.3333,
+        ),
+    }
+    api_client = FakeApiClient(report=report)
+    callback = FakeCallback(f"wa_report_{CARWASH_ID}")
+
+    await wash_admin_report(callback, api_client)
+
+    assert api_client.calls == [(str(CARWASH_ID), {"grain": "day"})]
+    (text,) = callback.message.edits
+    assert "Броней: 4 (выполнено 2, отменено 1)" in text
+    assert "Выручка: 4000 ₽" in text
+    assert "Загрузка: 18%" in text
+    assert "Неявки: 1 (33%)" in text
+    assert "01.05: 3 бр., 3000 ₽, 25%" in text
+    assert "02.05: 1 бр., 1000 ₽, 10%" in text
+    assert callback.answered
+
+
+@pytest.mark.anyio
+async def test_report_handler_reports_api_error():
+    callback = FakeCallback(f"wa_report_{CARWASH_ID}")
+
+    await wash_admin_report(callback, FakeApiClient(error=RuntimeError("нет связи")))
+
+    assert callback.message.edits == []
+    assert callback.message.answers == ["❌ Не удалось загрузить отчёт."]
+    assert callback.answered
@@ -0,0 +1,184 @@
+import uuid
+
+import httpx
+import pytest
+from aiogram import Bot, Dispatcher, Router
+from aiogram.fsm.storage.memory import MemoryStorage
+from aiogram.types import Message, Update
+from fastapi import FastAPI, HTTPException, Request
+
+from src.bot.utils import api_client as api_client_module
+from src.bot.utils import direct_api_client
+from src.bot.utils.api_client import IN_PROCESS_BASE_URL, ApiClient, get_api_client
+from src.bot.utils.api_client_middleware import ApiClientMiddleware
+from src.bot.utils.direct_api_client import DirectApiClient
+from src.bot.webhook import WebhookUpdateFeeder
+from src.core.cache import CachedJSON
+from src.core.config import get_settings
+
+
+class CountingTransport(httpx.AsyncBaseTransport):
+    """Отвечает 200 {} и считает запросы и закрытия."""
+
+    def __init__(self):
+        self.requests = 0
+        self.closed = 0
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        self.requests += 1
+        return httpx.Response(200, json={})
+
+    async def aclose(self) -> None:
+        self.closed += 1
+
+
+@pytest.fixture
+def client_instances(monkeypatch):
+    """Считает созданные ApiClient экземпляры httpx.AsyncClient."""
+    created = []
+
+    class TrackedAsyncClient(httpx.AsyncClient):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            created.append(self)
+
+    monkeypatch.setattr(api_client_module.httpx, "AsyncClient", TrackedAsyncClient)
+    return created
+
+
+def _message_update(update_id: int) -> Update:
+    return Update.model_validate(
+        {
+            "update_id": update_id,
+            "message": {
+                "message_id": update_id,
+                "date": 0,
+                "chat": {"id": 1, "type": "private"},
+                "text": "hi",
+            },
+        }
+    )
+
+
+@pytest.mark.anyio
+async def test_one_http_client_is_reused_across_calls(client_instances):
+    transport = CountingTransport()
+    client = ApiClient(base_url="http://api", transport=transport)
+
+    await client.get_carwash("1")
+    await client.get_system_stats()
+    await client.create_booking({})
+
+    assert len(client_instances) == 1
+    assert transport.requests == 3
+    await client.close()
+    assert client_instances[0].is_closed
+    assert transport.closed == 1
+
+
+@pytest.mark.anyio
+async def test_handlers_receive_the_shared_client_and_shutdown_closes_it(client_instances):
+    transport = CountingTransport()
+    client = ApiClient(base_url="http://api", transport=transport)
+    seen = []
+
+    router = Router()
+
+    @router.message()
+    async def handler(message: Message, api_client: ApiClient):
+        seen.append(api_client)
+        await api_client.get_system_stats()
+
+    dispatcher = Dispatcher(storage=MemoryStorage())
+    dispatcher.update.middleware(ApiClientMiddleware(client))
+    dispatcher.include_router(router)
+    bot = Bot(get_settings().bot_token)
+    feeder = WebhookUpdateFeeder(
+        bot=bot,
+        dispatcher=dispatcher,
+        api_client=client,
+        workers=1,
+        queue_size=10,
+        secret_token="secret",
+    )
+
+    for update_id in (1, 2, 3):
+        await dispatcher.feed_update(bot, _message_update(update_id))
+    await feeder.stop()
+
+    assert len(seen) == 3 and all(c is client for c in seen)
+    assert len(client_instances) == 1
+    assert transport.requests == 3
+    assert client_instances[0].is_closed
+
+
+def _echo_app() -> FastAPI:
+    """Приложение, отвечающее на любой запрос его методом и путём."""
+    app = FastAPI()
+
+    @app.api_route("/{path:path}", methods=["GET", "POST"])
+    async def echo(path: str, request: Request):
+        return {"method": request.method, "path": f"/{path}"}
+
+    return app
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize(
+    "mode, with_app, expected",
+    [
+        ("auto", True, DirectApiClient),
+        ("auto", False, ApiClient),
+        ("http", True, ApiClient),
+        ("asgi", True, ApiClient),
+        # Без приложения в процессе ходить некуда, кроме сети
+        ("direct", False, ApiClient),
+    ],
+)
+async def test_transport_is_chosen_by_settings(mode, with_app, expected):
+    settings = get_settings().model_copy(update={"api_client_transport": mode})
+    app = _echo_app() if with_app else None
+
+    client = get_api_client(settings, app)
+
+    assert type(client) is expected
+    in_process = with_app and mode != "http"
+    assert client._base_url == (IN_PROCESS_BASE_URL if in_process else settings.api_base_url)
+    if in_process:
+        assert await client.get_system_stats() == {
+            "method": "GET",
+            "path": "/api/v1/admin/system/statistics",
+        }
+    await client.close()
+
+
+@pytest.mark.anyio
+async def test_direct_client_calls_services_and_keeps_http_errors(monkeypatch):
+    carwash_id = uuid.uuid4()
+    calls = []
+
+    async def carwash_json(requested_id, session):
+        calls.append(requested_id)
+        if requested_id != carwash_id:
+            raise HTTPException(status_code=404, detail="Автомойка не найдена")
+        return CachedJSON.from_body(f'{{"id": "{carwash_id}"}}'.encode())
+
+    monkeypatch.setattr(direct_api_client, "get_carwash_by_id_json_service", carwash_json)
+    client = DirectApiClient(
+        base_url=IN_PROCESS_BASE_URL, transport=httpx.ASGITransport(app=_echo_app())
+    )
+
+    # Чтение — сервис напрямую, запись — через ASGI в то же приложение
+    assert await client.get_carwash(str(carwash_id)) == {"id": str(carwash_id)}
+    assert await client.create_booking({}) == {
+        "method": "POST",
+        "path": "/api/v1/bookings/create",
+    }
+
+    # Обработчики бота ловят httpx-ошибки: 404 сервиса выглядит как ответ API
+    with pytest.raises(httpx.HTTPStatusError) as exc:
+        await client.get_carwash(uuid.uuid4())
+    assert exc.value.response.status_code == 404
+    assert exc.value.response.json() == {"detail": "Автомойка не найдена"}
+    assert len(calls) == 2
+    await client.close()
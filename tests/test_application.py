@@ -0,0 +1,55 @@
+import asyncio
+
+import pytest
+from fastapi import FastAPI
+
+from src import application
+
+
+@pytest.fixture
+def shutdown_log(monkeypatch):
+    """
+    Подменяет фоновые задачи и закрытие ресурсов lifespan: задачи ждут
+    отмены и пишут в журнал момент своего завершения.
+    """
+    log = []
+
+    async def task(name):
+        try:
+            await asyncio.Event().wait()
+        finally:
+            # Очистка задачи сама может ждать (откат транзакции, закрытие клиента)
+            await asyncio.sleep(0)
+            log.append(f"task:{name}")
+
+    async def run_periodic(name, interval, job):
+        await task(name)
+
+    async def inbox_worker(batch_size, poll_seconds, name):
+        await task(f"inbox-{name}")
+
+    async def run_bot(app):
+        await task("bot")
+
+    async def close(name):
+        log.append(f"close:{name}")
+
+    monkeypatch.setattr(application, "run_periodic", run_periodic)
+    monkeypatch.setattr(application, "payment_inbox_worker", inbox_worker)
+    monkeypatch.setattr(application, "run_bot", run_bot)
+    monkeypatch.setattr(application, "install_reload_signal", lambda loop: None)
+    monkeypatch.setattr(application.catalog_cache, "close", lambda: close("cache"))
+    monkeypatch.setattr(application, "close_payment_gateway", lambda: close("gateway"))
+    return log
+
+
+@pytest.mark.anyio
+async def test_shutdown_waits_for_background_tasks(shutdown_log):
+    async with application.lifespan(FastAPI()):
+        await asyncio.sleep(0)
+        assert shutdown_log == []
+
+    tasks = [entry for entry in shutdown_log if entry.startswith("task:")]
+    assert "task:bot" in tasks and "task:booking_expiry" in tasks
+    # Все задачи завершились до закрытия кэша и шлюза платежей
+    assert shutdown_log[len(tasks) :] == ["close:cache", "close:gateway"]
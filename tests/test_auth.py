@@ -0,0 +1,172 @@
+import hashlib
+import hmac
+import json
+import time
+import urllib.parse
+import uuid
+from datetime import datetime
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from sqlalchemy import delete, select
+
+from src.core.config import get_settings
+from src.core.db import get_async_session
+from src.core.telegram_auth import InitDataValidator, issue_session_token, webapp_secret
+from src.models.booking import Booking
+from src.models.users import User
+from src.routers.v1.booking import router as booking_router
+from src.routers.v1.user import router
+from src.schemas.users import SUserResponse
+from src.services import users as users_service
+
+
+def _init_data(bot_token: str, telegram_id: int) -> str:
+    fields = {
+        "auth_date": str(int(time.time())),
+        "query_id": "q",
+        "user": json.dumps({"id": telegram_id, "first_name": "Test"}),
+    }
+    check = "\n".join(f"{key}={value}" for key, value in sorted(fields.items()))
+    fields["hash"] = hmac.new(
+        webapp_secret(bot_token), check.encode(), hashlib.sha256
+    ).hexdigest()
+    return urllib.parse.urlencode(fields)
+
+
+def test_validator_returns_independent_copies():
+    bot_token = get_settings().bot_token
+    validator = InitDataValidator(bot_token, max_age=3600)
+    init_data = _init_data(bot_token, 42)
+
+    first = validator.validate(init_data)
+    first["user"]["id"] = 1
+    first["auth_date"] = "0"
+
+    second = validator.validate(init_data)
+    assert second["user"]["id"] == 42
+    assert second["auth_date"] != "0"
+
+
+async def _no_db():
+    raise AssertionError("эндпоинт не должен обращаться к БД")
+    yield
+
+
+@pytest.fixture
+def app():
+    app = FastAPI()
+    app.include_router(router)
+    app.dependency_overrides[get_async_session] = _no_db
+    return app
+
+
+@pytest.fixture
+async def client(app):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://api") as client:
+        yield client
+
+
+def _bearer(user_id: uuid.UUID, telegram_id: int) -> dict:
+    settings = get_settings()
+    token, _ = issue_session_token(
+        user_id, telegram_id, settings.bot_token, settings.webapp_session_ttl_seconds
+    )
+    return {"Authorization": f"Bearer {token}"}
+
+
+@pytest.mark.anyio
+async def test_me_requires_session_token(client):
+    # X-Telegram-Id больше не определяет пользователя
+    response = await client.get("/api/v1/users/me", headers={"X-Telegram-Id": "42"})
+    assert response.status_code == 401
+    response = await client.get("/api/v1/users/me", headers={"Authorization": "Bearer x.y"})
+    assert response.status_code == 401
+
+
+@pytest.mark.anyio
+async def test_profile_update_uses_identity_from_token(app, client, monkeypatch):
+    seen = []
+    user_id = uuid.uuid4()
+
+    async def update_user(self, data):
+        seen.append(data)
+        return SUserResponse(
+            id=user_id,
+            telegram_id=data.telegram_id,
+            username="user_42",
+            email=None,
+            first_name=data.first_name,
+            last_name=None,
+            is_verified=False,
+            created_at=datetime.now(),
+        )
+
+    async def session():
+        yield None
+
+    app.dependency_overrides[get_async_session] = session
+    monkeypatch.setattr(users_service.UserService, "update_user", update_user)
+
+    response = await client.patch(
+        "/api/v1/users/me",
+        json={"telegram_id": 1, "first_name": "Имя"},
+        headers=_bearer(user_id, 42),
+    )
+
+    assert response.status_code == 200, response.text
+    assert seen[0].telegram_id == 42
+    assert seen[0].model_dump(exclude_unset=True) == {"telegram_id": 42, "first_name": "Имя"}
+
+
+@pytest.mark.anyio
+async def test_booking_with_session_token_is_stored_for_its_owner(pg_session, carwash_slot):
+    user = User(username=f"u{uuid.uuid4().hex[:16]}", telegram_id=777_000_001)
+    pg_session.add(user)
+    await pg_session.flush()
+    user_id = user.id
+    await pg_session.commit()
+
+    app = FastAPI()
+    app.include_router(booking_router)
+    transport = httpx.ASGITransport(app=app)
+    payload = {
+        # Идентификаторы из тела подменяются владельцем токена
+        "telegram_id": 1,
+        "user_id": None,
+        "car_wash_id": str(carwash_slot.carwash_id),
+        "wash_bay_id": str(carwash_slot.wash_bay_id),
+        "time_slot_id": str(carwash_slot.time_slot_id),
+        "wash_type_id": str(carwash_slot.wash_type_id),
+        "guest_phone": "+79990000000",
+        "guest_name": "Test",
+        "car_plate": "A000AA77",
+        "car_model": "Test",
+        "slot_date": carwash_slot.slot_date.isoformat(),
+        "start_time": "10:00:00",
+        "end_time": "10:30:00",
+    }
+    try:
+        async with httpx.AsyncClient(transport=transport, base_url="http://api") as client:
+            response = await client.post(
+                "/api/v1/bookings/create",
+                json=payload,
+                headers=_bearer(user_id, 777_000_001),
+            )
+        assert response.status_code == 200, response.text
+
+        stored = (
+            await pg_session.execute(
+                select(Booking.user_id, Booking.telegram_id).where(
+                    Booking.time_slot_id == carwash_slot.time_slot_id
+                )
+            )
+        ).one()
+        assert stored == (user_id, 777_000_001)
+    finally:
+        await pg_session.rollback()
+        await pg_session.execute(delete(Booking).where(Booking.user_id == user_id))
+        await pg_session.execute(delete(User).where(User.id == user_id))
+        await pg_session.commit()
@@ -0,0 +1,264 @@
+import asyncio
+import json
+import uuid
+from datetime import date, datetime, time, timedelta
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import delete, select
+
+from src.core.config import get_settings
+from src.models.carwash import CarWash
+from src.models.timeslot import TimeSlot
+from src.models.washbay import WashBay
+from src.services import availability as availability_module
+from src.services import booking as booking_service
+from src.services import carwash as carwash_service
+from src.services.availability import AvailabilityEngine
+
+
+def _row(bay_id, hour, status="available", minute=0):
+    return SimpleNamespace(
+        id=uuid.uuid4(), wash_bay_id=bay_id, start_time=time(hour, minute), status=status
+    )
+
+
+def test_ttl_marks_day_stale(monkeypatch):
+    clock = [100.0]
+    monkeypatch.setattr(availability_module, "monotonic", lambda: clock[0])
+    engine = AvailabilityEngine(ttl=30)
+    carwash_id, today = uuid.uuid4(), date.today()
+
+    engine.load_day(carwash_id, today, [_row(uuid.uuid4(), 10)])
+    assert engine.is_loaded(carwash_id, today)
+
+    clock[0] += 31
+    assert not engine.is_loaded(carwash_id, today)
+
+
+def test_past_days_are_evicted_on_load():
+    engine = AvailabilityEngine()
+    carwash_id, today = uuid.uuid4(), date.today()
+    yesterday = today - timedelta(days=1)
+    old = _row(uuid.uuid4(), 9)
+
+    engine.load_day(carwash_id, yesterday, [old])
+    engine.load_lock(carwash_id, yesterday)
+    engine.load_day(carwash_id, today, [_row(uuid.uuid4(), 10)])
+
+    assert not engine.is_loaded(carwash_id, yesterday)
+    assert (carwash_id, yesterday) not in engine._load_locks
+    assert engine.reserve(old.id) is False
+
+
+@pytest.mark.anyio
+async def test_concurrent_requests_load_day_once(monkeypatch):
+    engine = AvailabilityEngine()
+    monkeypatch.setattr(availability_module, "availability", engine)
+    carwash_id, today = uuid.uuid4(), date.today()
+    loads = 0
+
+    async def no_new_slots(*args, **kwargs):
+        return 0
+
+    class Repo:
+        def __init__(self, session):
+            pass
+
+        async def get_day_slots(self, carwash_id, on_date):
+            nonlocal loads
+            loads += 1
+            await asyncio.sleep(0.01)
+            return [_row(uuid.uuid4(), 10)]
+
+    monkeypatch.setattr(availability_module, "ensure_slots_for_date", no_new_slots)
+    monkeypatch.setattr(availability_module, "TimeSlotRepository", Repo)
+
+    await asyncio.gather(
+        *(availability_module.ensure_day_loaded(carwash_id, today, None) for _ in range(10))
+    )
+    assert loads == 1
+    assert engine.count_free(carwash_id, today) == 1
+
+
+@pytest.mark.anyio
+async def test_failed_commit_leaves_slot_free(monkeypatch):
+    engine = AvailabilityEngine()
+    monkeypatch.setattr(booking_service, "availability", engine)
+    carwash_id, today, bay_id = uuid.uuid4(), date.today(), uuid.uuid4()
+    row = _row(bay_id, 10)
+    engine.load_day(carwash_id, today, [row])
+
+    booking = SimpleNamespace(
+        id=uuid.uuid4(),
+        guest_phone="+79990000000",
+        final_price=1000.0,
+        expires_at=datetime.now(),
+    )
+    slot = SimpleNamespace(id=row.id, bay_number=1)
+
+    class Repo:
+        def __init__(self, session):
+            pass
+
+        async def create_booking(self, data, slot_minutes):
+            return booking, [slot], SimpleNamespace(name="", address=""), SimpleNamespace(name="")
+
+        generate_qr_data = staticmethod(lambda booking_id, phone: "qr")
+
+    class Session:
+        async def commit(self):
+            raise RuntimeError("commit failed")
+
+    monkeypatch.setattr(booking_service, "BookingRepository", Repo)
+    monkeypatch.setattr(booking_service, "to_booking_details", lambda *a, **kw: None)
+    monkeypatch.setattr(
+        booking_service, "SBookingConfirmation", lambda **kw: SimpleNamespace(**kw)
+    )
+
+    with pytest.raises(RuntimeError):
+        await booking_service.create_booking_service(None, Session())
+    assert engine.count_free(carwash_id, today) == 1
+
+
+@pytest.mark.anyio
+async def test_lazy_day_load_uses_configured_horizon(monkeypatch):
+    engine = AvailabilityEngine()
+    monkeypatch.setattr(availability_module, "availability", engine)
+    seen = []
+
+    async def record(carwash_id, on_date, session, horizon_days):
+        seen.append(horizon_days)
+        return 0
+
+    class Repo:
+        def __init__(self, session):
+            pass
+
+        async def get_day_slots(self, carwash_id, on_date):
+            return []
+
+    monkeypatch.setattr(availability_module, "ensure_slots_for_date", record)
+    monkeypatch.setattr(availability_module, "TimeSlotRepository", Repo)
+
+    await availability_module.ensure_day_loaded(uuid.uuid4(), date.today(), None)
+    assert seen == [get_settings().slot_horizon_days]
+
+
+@pytest.mark.anyio
+async def test_lazy_generation_writes_slots(pg_session, monkeypatch):
+    """Слоты создаются настоящим build_day_slots и сразу загружаются в движок."""
+    engine = AvailabilityEngine()
+    monkeypatch.setattr(availability_module, "availability", engine)
+    suffix = uuid.uuid4().hex
+    carwash = CarWash(
+        name=f"test-{suffix}",
+        address=f"test-{suffix}",
+        phone_number=f"test-{suffix}",
+        working_hours={"start": "09:00", "end": "11:00"},
+    )
+    pg_session.add(carwash)
+    await pg_session.flush()
+    carwash_id = carwash.id
+    pg_session.add(WashBay(car_wash_id=carwash_id, bay_number=1, bay_type="test"))
+    await pg_session.commit()
+    day = date.today() + timedelta(days=1)
+
+    try:
+        await availability_module.ensure_day_loaded(carwash_id, day, pg_session)
+        assert engine.count_free(carwash_id, day) == 4
+
+        rows = (
+            await pg_session.execute(
+                select(TimeSlot.start_time, TimeSlot.end_time)
+                .where(TimeSlot.car_wash_id == carwash_id)
+                .order_by(TimeSlot.start_time)
+            )
+        ).all()
+        assert rows[0] == (
+            datetime.combine(day, time(9)),
+            datetime.combine(day, time(9, 30)),
+        )
+        assert rows[-1].end_time == datetime.combine(day, time(11))
+    finally:
+        await pg_session.rollback()
+        for query in (
+            delete(TimeSlot).where(TimeSlot.car_wash_id == carwash_id),
+            delete(WashBay).where(WashBay.car_wash_id == carwash_id),
+            delete(CarWash).where(CarWash.id == carwash_id),
+        ):
+            await pg_session.execute(query)
+        await pg_session.commit()
+
+
+def _two_bays(carwash_id, on_date):
+    """
+    Бокс A свободен 10:00-11:30, кроме 11:30; бокс B — 10:30-12:30.
+    Возвращает движок и строки по боксам.
+    """
+    engine = AvailabilityEngine()
+    bay_a, bay_b = uuid.UUID(int=1), uuid.UUID(int=2)
+    rows_a = [
+        _row(bay_a, 10),
+        _row(bay_a, 10, minute=30),
+        _row(bay_a, 11),
+        _row(bay_a, 11, "reserved", minute=30),
+    ]
+    rows_b = [
+        _row(bay_b, 10, minute=30),
+        _row(bay_b, 11),
+        _row(bay_b, 11, minute=30),
+        _row(bay_b, 12),
+    ]
+    engine.load_day(carwash_id, on_date, rows_a + rows_b)
+    return engine, rows_a, rows_b
+
+
+def test_span_keeps_starts_with_enough_consecutive_free_slots():
+    carwash_id, tomorrow = uuid.uuid4(), date.today() + timedelta(days=1)
+    engine, rows_a, rows_b = _two_bays(carwash_id, tomorrow)
+
+    slots = engine.free_slots(carwash_id, tomorrow, span=3)
+
+    assert [(s.id, s.start_time, s.end_time) for s in slots] == [
+        (rows_a[0].id, time(10), time(11, 30)),
+        (rows_b[0].id, time(10, 30), time(12)),
+        (rows_b[1].id, time(11), time(12, 30)),
+    ]
+    assert len(engine.free_slots(carwash_id, tomorrow)) == 7
+
+
+@pytest.mark.anyio
+async def test_slot_listing_filters_by_wash_type_and_tracks_reservations(monkeypatch):
+    carwash_id, tomorrow = uuid.uuid4(), date.today() + timedelta(days=1)
+    engine, rows_a, rows_b = _two_bays(carwash_id, tomorrow)
+
+    async def loaded_day(*args):
+        return engine
+
+    async def wash_type(wash_type_id, session):
+        return SimpleNamespace(duration_minutes=75)
+
+    monkeypatch.setattr(carwash_service, "ensure_day_loaded", loaded_day)
+    monkeypatch.setattr(carwash_service, "get_wash_type_by_id_service", wash_type)
+
+    async def listing(wash_type_id=None, per_bay=False):
+        body = await carwash_service.get_free_slots_json_service(
+            carwash_id, tomorrow, wash_type_id, per_bay, None
+        )
+        return [(slot["start_time"], slot["id"]) for slot in json.loads(body)]
+
+    # Без типа мойки — одно время начала на все боксы
+    assert [start for start, _ in await listing()] == [
+        "10:00", "10:30", "11:00", "11:30", "12:00"
+    ]
+    assert len(await listing(per_bay=True)) == 7
+    assert await listing(wash_type_id=uuid.uuid4()) == [
+        ("10:00", str(rows_a[0].id)),
+        ("10:30", str(rows_b[0].id)),
+        ("11:00", str(rows_b[1].id)),
+    ]
+
+    # Резерв меняет версию дня: закэшированный ответ не отдаётся
+    engine.reserve(rows_b[2].id)
+    assert await listing(wash_type_id=uuid.uuid4()) == [("10:00", str(rows_a[0].id))]
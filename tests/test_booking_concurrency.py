@@ -0,0 +1,171 @@
+import asyncio
+import uuid
+from datetime import datetime, time, timedelta
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import delete, func, select, update
+
+from src.core.db import async_session_maker
+from src.models.booking import Booking
+from src.models.timeslot import TimeSlot
+from src.models.washtype import WashType
+from src.schemas.booking import SBookingCreate
+from src.services.booking import create_booking_service
+
+
+PARALLEL_REQUESTS = 20
+
+
+def _request(carwash_slot, n: int, time_slot_id=None, wash_type_id=None) -> SBookingCreate:
+    return SBookingCreate(
+        telegram_id=n,
+        user_id=None,
+        car_wash_id=carwash_slot.carwash_id,
+        wash_bay_id=carwash_slot.wash_bay_id,
+        time_slot_id=time_slot_id or carwash_slot.time_slot_id,
+        wash_type_id=wash_type_id or carwash_slot.wash_type_id,
+        guest_phone=f"+7999000{n:04d}",
+        guest_name="Test",
+        car_plate="A000AA77",
+        car_model="Test",
+        slot_date=carwash_slot.slot_date,
+        start_time=time(10),
+        end_time=time(10, 30),
+    )
+
+
+async def _book(request: SBookingCreate):
+    """Бронь в отдельной сессии; HTTPException возвращается после отката."""
+    async with async_session_maker() as session:
+        try:
+            return await create_booking_service(request, session)
+        except HTTPException as e:
+            await session.rollback()
+            return e
+
+
+@pytest.fixture
+async def bay_slots(pg_session, carwash_slot):
+    """
+    Слоты бокса carwash_slot на 10:00, 10:30, 11:00 и 11:30 (id по времени)
+    и тип мойки на 75 минут — три слота по 30 минут.
+    """
+    day = datetime.combine(carwash_slot.slot_date, time.min)
+    extra = [
+        TimeSlot(
+            car_wash_id=carwash_slot.carwash_id,
+            wash_bay_id=carwash_slot.wash_bay_id,
+            slot_date=day,
+            start_time=day + timedelta(minutes=minutes),
+            end_time=day + timedelta(minutes=minutes + 30),
+        )
+        for minutes in (630, 660, 690)
+    ]
+    suffix = uuid.uuid4().hex
+    long_wash = WashType(
+        name=f"test-{suffix}", description=f"test-{suffix}", duration_minutes=75, base_price=3000
+    )
+    pg_session.add_all([*extra, long_wash])
+    await pg_session.flush()
+    slot_ids = [carwash_slot.time_slot_id, *(slot.id for slot in extra)]
+    long_wash_id = long_wash.id
+    await pg_session.commit()
+    yield slot_ids, long_wash_id
+
+    # Брони ссылаются на тип мойки: удаляем их раньше, чем carwash_slot
+    await pg_session.rollback()
+    await pg_session.execute(delete(Booking).where(Booking.wash_type_id == long_wash_id))
+    await pg_session.execute(delete(WashType).where(WashType.id == long_wash_id))
+    await pg_session.commit()
+
+
+async def _statuses(session, slot_ids) -> list[str]:
+    session.expire_all()
+    result = await session.execute(
+        select(TimeSlot.id, TimeSlot.status).where(TimeSlot.id.in_(slot_ids))
+    )
+    by_id = dict(result.all())
+    return [by_id[slot_id] for slot_id in slot_ids]
+
+
+@pytest.mark.anyio
+async def test_parallel_bookings_of_one_slot(pg_session, carwash_slot):
+    """Из N одновременных броней одного слота проходит ровно одна."""
+    results = await asyncio.gather(
+        *(_book(_request(carwash_slot, n)) for n in range(PARALLEL_REQUESTS))
+    )
+
+    rejected = [r for r in results if isinstance(r, HTTPException)]
+    assert len(results) - len(rejected) == 1
+    assert {r.status_code for r in rejected} == {400}
+
+    count = await pg_session.execute(
+        select(func.count(Booking.id)).where(
+            Booking.time_slot_id == carwash_slot.time_slot_id
+        )
+    )
+    assert count.scalar_one() == 1
+
+
+@pytest.mark.anyio
+async def test_long_wash_reserves_consecutive_slots(pg_session, carwash_slot, bay_slots):
+    """Мойка на 75 минут занимает ceil(75 / 30) = 3 слота подряд."""
+    slot_ids, long_wash_id = bay_slots
+
+    result = await _book(_request(carwash_slot, 1, wash_type_id=long_wash_id))
+
+    assert not isinstance(result, HTTPException), result.detail
+    assert await _statuses(pg_session, slot_ids) == [
+        "reserved",
+        "reserved",
+        "reserved",
+        "available",
+    ]
+    booking = await pg_session.get(Booking, result.booking.id)
+    assert (booking.start_time, booking.end_time) == (time(10), time(11, 30))
+
+
+@pytest.mark.anyio
+async def test_partially_free_span_is_rolled_back(pg_session, carwash_slot, bay_slots):
+    """Если один из слотов мойки занят, не резервируется ни один."""
+    slot_ids, long_wash_id = bay_slots
+    await pg_session.execute(
+        update(TimeSlot).where(TimeSlot.id == slot_ids[2]).values(status="booked")
+    )
+    await pg_session.commit()
+
+    result = await _book(_request(carwash_slot, 1, wash_type_id=long_wash_id))
+
+    assert isinstance(result, HTTPException) and result.status_code == 400
+    assert await _statuses(pg_session, slot_ids) == [
+        "available",
+        "available",
+        "booked",
+        "available",
+    ]
+    count = await pg_session.execute(
+        select(func.count(Booking.id)).where(Booking.car_wash_id == carwash_slot.carwash_id)
+    )
+    assert count.scalar_one() == 0
+
+
+@pytest.mark.anyio
+async def test_overlapping_spans_have_one_winner(pg_session, carwash_slot, bay_slots):
+    """Брони с 10:00 и с 10:30 делят два слота: из гонки проходит ровно одна."""
+    slot_ids, long_wash_id = bay_slots
+
+    results = await asyncio.gather(
+        *(
+            _book(_request(carwash_slot, n, slot_ids[n % 2], long_wash_id))
+            for n in range(PARALLEL_REQUESTS)
+        )
+    )
+
+    winners = [r for r in results if not isinstance(r, HTTPException)]
+    assert len(winners) == 1
+    assert {r.status_code for r in results if isinstance(r, HTTPException)} == {400}
+    reserved = [status == "reserved" for status in await _statuses(pg_session, slot_ids)]
+    # Победитель занял ровно свои три слота подряд
+    assert sum(reserved) == 3
+    assert reserved in ([True, True, True, False], [False, True, True, True])
@@ -0,0 +1,75 @@
+from contextlib import contextmanager
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.dialects import postgresql
+
+from src.core.db import engine
+from src.models.carwash import CarWash
+from src.models.washtype import WashType
+from src.repositories.booking import BookingRepository
+from src.services.booking import get_booking_by_id_service, to_booking_details
+
+
+@contextmanager
+def recorded_statements():
+    """SQL всех запросов, отправленных в БД внутри блока."""
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", record)
+
+
+def test_details_query_joins_names_in_one_select():
+    sql = str(BookingRepository.details_query().compile(dialect=postgresql.dialect()))
+
+    assert sql.count("SELECT") == 1
+    for table in ("car_washes", "wash_types", "wash_bays"):
+        assert f"LEFT OUTER JOIN {table}" in sql
+    # Только нужные колонки: ни карточки мойки целиком, ни слота
+    assert "car_washes.working_hours" not in sql
+    assert "time_slots" not in sql
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("status", ["pending_payment", "confirmed"])
+async def test_booking_details_come_from_one_query(
+    pg_session, carwash_slot, booking_factory, status
+):
+    booking = booking_factory(status=status, payment_status="pending")
+    pg_session.add(booking)
+    await pg_session.flush()
+    booking_id = booking.id
+    await pg_session.commit()
+    pg_session.expunge_all()
+
+    with recorded_statements() as statements:
+        details = await get_booking_by_id_service(booking_id, pg_session)
+
+    assert len(statements) == 1
+    carwash = await pg_session.get(CarWash, carwash_slot.carwash_id)
+    wash_type = await pg_session.get(WashType, carwash_slot.wash_type_id)
+    assert (details.car_wash_name, details.car_wash_address) == (
+        carwash.name,
+        carwash.address,
+    )
+    assert (details.wash_type_name, details.bay_number) == (wash_type.name, 1)
+    # QR-код есть только у подтверждённой брони
+    assert (details.qr_code is not None) == (status == "confirmed")
+
+    # ORM-объект с теми же полями даёт ту же схему, что и строка проекции
+    orm = await BookingRepository(pg_session).get_by_id(booking_id)
+    from_orm = to_booking_details(
+        orm,
+        car_wash_name=carwash.name,
+        car_wash_address=carwash.address,
+        wash_type_name=wash_type.name,
+        bay_number=1,
+    )
+    assert from_orm == details
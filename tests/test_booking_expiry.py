@@ -0,0 +1,76 @@
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import HTTPException
+
+from src.models.booking import Booking
+from src.repositories.booking import BookingRepository
+from src.services.payment import confirm_demo_payment_service
+
+
+@pytest.mark.anyio
+async def test_late_payment_of_expired_booking_is_reconciled(pg_session, booking_factory):
+    """Оплата, прошедшая после отмены брони по сроку, не теряется сверкой."""
+    now = datetime.now()
+    booking = booking_factory(
+        status="pending_payment",
+        payment_status="pending",
+        payment_id=f"late-{now.timestamp()}",
+        expires_at=now - timedelta(minutes=1),
+    )
+    pg_session.add(booking)
+    await pg_session.flush()
+    booking_id = booking.id
+    await pg_session.commit()
+
+    repo = BookingRepository(pg_session)
+    await repo.expire_unpaid(now, batch_size=1000, reason="test")
+    await pg_session.commit()
+
+    expired = await pg_session.get(Booking, booking_id)
+    assert expired.status == "cancelled"
+    assert expired.payment_status == "pending"
+
+    pending, after_id = [], None
+    while page := await repo.get_pending_payments_page(after_id, 500):
+        pending.extend(row.id for row in page)
+        after_id = page[-1].id
+    assert booking_id in pending
+
+    confirmed, paid_only = await repo.bulk_mark_paid([booking_id], datetime.now())
+    await pg_session.commit()
+    assert (confirmed, paid_only) == (0, 1)
+
+    await pg_session.refresh(expired)
+    # Слот не возвращается брони, оплата требует возврата
+    assert expired.status == "cancelled"
+    assert expired.payment_status == "paid"
+
+
+@pytest.mark.anyio
+async def test_demo_confirm_skips_expired_booking(pg_session, booking_factory):
+    """Демо-подтверждение не оживляет бронь, отменённую по сроку."""
+    now = datetime.now()
+    booking = booking_factory(
+        status="pending_payment",
+        payment_status="pending",
+        expires_at=now - timedelta(minutes=1),
+    )
+    pg_session.add(booking)
+    await pg_session.flush()
+    booking_id = booking.id
+    await pg_session.commit()
+
+    await BookingRepository(pg_session).expire_unpaid(now, batch_size=1000, reason="test")
+    await pg_session.commit()
+
+    try:
+        result = await confirm_demo_payment_service(pg_session)
+    except HTTPException as e:
+        assert e.status_code == 404
+    else:
+        assert result["booking_id"] != str(booking_id)
+
+    pg_session.expunge_all()
+    expired = await pg_session.get(Booking, booking_id)
+    assert (expired.status, expired.payment_status) == ("cancelled", "pending")
@@ -0,0 +1,145 @@
+import re
+import uuid
+from datetime import date, time
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.dialects import postgresql
+
+from src.repositories.booking import BookingRepository
+
+
+class RecordingSession:
+    """Запоминает выполненные запросы вместо обращения к БД."""
+
+    def __init__(self):
+        self.queries = []
+
+    async def execute(self, query):
+        self.queries.append(query)
+        return self
+
+    def all(self):
+        return []
+
+
+def _sql(query) -> str:
+    return str(
+        query.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True})
+    )
+
+
+def _cursor() -> str:
+    row = SimpleNamespace(slot_date=date(2026, 1, 1), start_time=time(10), id=uuid.UUID(int=1))
+    return BookingRepository.encode_cursor(row)
+
+
+@pytest.mark.anyio
+async def test_cursor_page_uses_keyset_without_offset():
+    session = RecordingSession()
+    repo = BookingRepository(session)
+    cursor = _cursor()
+
+    await repo.get_for_carwash(
+        carwash_id=uuid.uuid4(),
+        date_from=None,
+        date_to=None,
+        status=None,
+        page=50,
+        per_page=20,
+        cursor=cursor,
+    )
+
+    sql = _sql(session.queries[0])
+    assert len(session.queries) == 1
+    assert "OFFSET" not in sql
+    assert re.search(
+        r"\(bookings\.slot_date, bookings\.start_time, bookings\.id\) > \(", sql
+    )
+    # Порядок совпадает с ix_bookings_car_wash_slot (car_wash_id, slot_date, start_time, id)
+    assert "ORDER BY bookings.slot_date, bookings.start_time, bookings.id" in sql
+    assert "LIMIT 21" in sql
+
+
+@pytest.mark.anyio
+async def test_phone_cursor_descends_by_key():
+    session = RecordingSession()
+    cursor = _cursor()
+
+    await BookingRepository(session).get_by_phone(
+        phone="+79990000000", status=None, page=1, per_page=20, cursor=cursor
+    )
+
+    sql = _sql(session.queries[0])
+    assert "OFFSET" not in sql
+    assert re.search(
+        r"\(bookings\.slot_date, bookings\.start_time, bookings\.id\) < \(", sql
+    )
+    assert (
+        "ORDER BY bookings.slot_date DESC, bookings.start_time DESC, bookings.id DESC"
+        in sql
+    )
+
+
+@pytest.mark.anyio
+async def test_cursor_with_equal_slot_times_neither_skips_nor_repeats(
+    pg_session, booking_factory
+):
+    """Брони с одинаковыми (slot_date, start_time) различает id в ключе курсора."""
+    bookings = [booking_factory() for _ in range(7)]
+    pg_session.add_all(bookings)
+    await pg_session.flush()
+    expected = {booking.id for booking in bookings}
+    carwash_id = bookings[0].car_wash_id
+    await pg_session.commit()
+
+    repo = BookingRepository(pg_session)
+    seen, cursor = [], None
+    while True:
+        rows, _, cursor = await repo.get_for_carwash(
+            carwash_id, None, None, None, page=1, per_page=3, cursor=cursor
+        )
+        seen.extend(row.id for row in rows)
+        if cursor is None:
+            break
+
+    assert len(seen) == len(expected)
+    assert set(seen) == expected
+
+
+class ForwardingSession(RecordingSession):
+    """Запоминает запросы и выполняет их в настоящей сессии."""
+
+    def __init__(self, session):
+        super().__init__()
+        self.session = session
+
+    async def execute(self, query):
+        self.queries.append(query)
+        return await self.session.execute(query)
+
+
+@pytest.mark.anyio
+async def test_cursor_page_plan_uses_composite_index(pg_session, booking_factory):
+    bookings = [booking_factory() for _ in range(3)]
+    carwash_id = bookings[0].car_wash_id
+    pg_session.add_all(bookings)
+    await pg_session.commit()
+
+    session = ForwardingSession(pg_session)
+    repo = BookingRepository(session)
+    _, _, cursor = await repo.get_for_carwash(
+        carwash_id, None, None, None, page=1, per_page=1
+    )
+    await repo.get_for_carwash(
+        carwash_id, None, None, None, page=1, per_page=1, cursor=cursor
+    )
+
+    # На маленькой таблице планировщик предпочёл бы seq scan
+    await pg_session.execute(text("SET LOCAL enable_seqscan = off"))
+    plan = await pg_session.execute(text(f"EXPLAIN {_sql(session.queries[-1])}"))
+    plan_text = "\n".join(row[0] for row in plan)
+
+    assert "ix_bookings_car_wash_slot" in plan_text
+    await pg_session.rollback()
@@ -0,0 +1,132 @@
+from datetime import date, timedelta
+
+import httpx
+import pytest
+from aiogram.fsm.context import FSMContext
+from aiogram.fsm.storage.base import StorageKey
+from aiogram.fsm.storage.memory import MemoryStorage
+
+from src.bot.handlers.booking import select_date, show_carwash_detail
+from src.bot.keyboards.keyboards import get_date_keyboard
+
+
+CARWASH_ID = "5f0c5a8e-0000-0000-0000-000000000001"
+
+
+class FakeMessage:
+    def __init__(self):
+        self.edits = []
+        self.answers = []
+
+    async def edit_text(self, text, reply_markup=None, **kwargs):
+        self.edits.append((text, reply_markup))
+
+    async def answer(self, text, **kwargs):
+        self.answers.append(text)
+
+
+class FakeCallback:
+    def __init__(self, data: str):
+        self.data = data
+        self.message = FakeMessage()
+        self.answered = False
+
+    async def answer(self, *args, **kwargs):
+        self.answered = True
+
+
+class FakeApiClient:
+    """Отдаёт сводку свободных слотов и считает обращения к API."""
+
+    def __init__(self, counts=None, error=None):
+        self.counts = counts or {}
+        self.error = error
+        self.calls = []
+
+    async def get_carwash(self, carwash_id):
+        self.calls.append("get_carwash")
+        return {
+            "name": "Мойка",
+            "address": "Адрес",
+            "phone_number": "+70000000000",
+            "working_hours": {"start": "08:00", "end": "22:00"},
+        }
+
+    async def get_availability(self, carwash_id, date_from=None, days=7):
+        self.calls.append("get_availability")
+        if self.error:
+            raise self.error
+        return {
+            "carwash_id": carwash_id,
+            "days": [
+                {"date": day, "available_slots_count": count}
+                for day, count in self.counts.items()
+            ],
+        }
+
+    async def get_slots_count(self, *args, **kwargs):
+        raise AssertionError("сводка на неделю заменяет запрос на один день")
+
+
+def _state() -> FSMContext:
+    return FSMContext(
+        storage=MemoryStorage(), key=StorageKey(bot_id=1, chat_id=1, user_id=1)
+    )
+
+
+def _days(n: int = 7) -> list[str]:
+    return [(date.today() + timedelta(days=i)).isoformat() for i in range(n)]
+
+
+def _button_texts(markup) -> list[str]:
+    return [button.text for row in markup.inline_keyboard for button in row]
+
+
+def test_date_keyboard_shows_free_counts():
+    days = _days()
+    markup = get_date_keyboard(CARWASH_ID, free_counts={days[0]: 12, days[2]: 3})
+
+    texts = _button_texts(markup)
+    assert texts[:2] == ["Сегодня (12)", "Завтра —"]
+    assert texts[2].endswith(" (3)")
+    # Дней без сводки нет в free_counts — у них прочерк
+    assert all(text.endswith(" —") for text in texts[3:7])
+    callbacks = [b.callback_data for row in markup.inline_keyboard for b in row]
+    assert callbacks[:7] == [f"date_{CARWASH_ID}_{day}" for day in days]
+
+
+def test_date_keyboard_without_counts_keeps_plain_labels():
+    texts = _button_texts(get_date_keyboard(CARWASH_ID))
+    assert texts[:2] == ["Сегодня", "Завтра"]
+    assert not any("(" in text or "—" in text for text in texts)
+
+
+@pytest.mark.anyio
+async def test_carwash_detail_uses_one_availability_call():
+    days = _days()
+    api_client = FakeApiClient(counts={days[0]: 5, days[1]: 8})
+    callback = FakeCallback(f"carwash_{CARWASH_ID}")
+    state = _state()
+
+    await show_carwash_detail(callback, state, api_client)
+
+    assert api_client.calls == ["get_carwash", "get_availability"]
+    text, markup = callback.message.edits[0]
+    assert "Свободных слотов сегодня: <b>5</b>" in text
+    assert _button_texts(markup)[:2] == ["Сегодня (5)", "Завтра (8)"]
+    assert (await state.get_data())["carwash_id"] == CARWASH_ID
+    assert callback.answered
+
+
+@pytest.mark.anyio
+async def test_select_date_falls_back_to_plain_keyboard_on_api_error():
+    request = httpx.Request("GET", "http://api")
+    error = httpx.ConnectError("нет соединения", request=request)
+    callback = FakeCallback(f"select_date_{CARWASH_ID}")
+
+    await select_date(callback, _state(), FakeApiClient(error=error))
+
+    text, markup = callback.message.edits[0]
+    assert "Выберите дату" in text
+    assert _button_texts(markup)[:2] == ["Сегодня", "Завтра"]
+    assert callback.answered
@@ -0,0 +1,67 @@
+import pytest
+from aiogram.fsm.storage.base import StorageKey
+from aiogram.fsm.storage.memory import MemoryStorage
+from aiogram.fsm.storage.redis import RedisStorage
+
+from src.bot.states import UserStates
+from src.bot.utils.storage import create_fsm_storage
+from src.core.config import get_settings
+
+
+KEY = StorageKey(bot_id=42, chat_id=7, user_id=7)
+
+
+class RecordingRedis:
+    """Словарь вместо Redis: хранит значения и TTL последней записи."""
+
+    def __init__(self):
+        self.values = {}
+        self.ttl = {}
+
+    async def set(self, name, value, ex=None):
+        self.values[name] = value
+        self.ttl[name] = ex
+
+    async def get(self, name):
+        return self.values.get(name)
+
+    async def delete(self, *names):
+        for name in names:
+            self.values.pop(name, None)
+            self.ttl.pop(name, None)
+
+
+def _settings(**update):
+    return get_settings().model_copy(update=update)
+
+
+def test_memory_storage_is_used_when_configured():
+    assert isinstance(create_fsm_storage(_settings(fsm_storage="memory")), MemoryStorage)
+
+
+@pytest.mark.anyio
+async def test_redis_storage_expires_state_and_data():
+    storage = create_fsm_storage(_settings(fsm_storage="redis", fsm_state_ttl_seconds=600))
+    assert isinstance(storage, RedisStorage)
+    # Подключение к Redis создаётся лениво: до первой команды сети не нужно
+    await storage.close()
+
+    storage.redis = RecordingRedis()
+    await storage.set_state(KEY, UserStates.selecting_date)
+    await storage.set_data(KEY, {"carwash_id": "1"})
+
+    # Ключи с префиксом и id бота: несколько ботов делят один Redis
+    assert storage.redis.ttl == {"fsm:42:7:7:state": 600, "fsm:42:7:7:data": 600}
+    assert await storage.get_state(KEY) == UserStates.selecting_date.state
+    assert await storage.get_data(KEY) == {"carwash_id": "1"}
+
+    # Завершённый сценарий удаляет ключи сразу, не дожидаясь TTL
+    await storage.set_state(KEY, None)
+    await storage.set_data(KEY, {})
+    assert storage.redis.values == {}
+
+
+def test_zero_ttl_keeps_states_forever():
+    storage = create_fsm_storage(_settings(fsm_storage="redis", fsm_state_ttl_seconds=0))
+
+    assert (storage.state_ttl, storage.data_ttl) == (None, None)
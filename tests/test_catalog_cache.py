@@ -0,0 +1,123 @@
+import logging
+
+import pytest
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from src.core.cache import CatalogCache
+
+
+class MemoryRedis:
+    """Минимальная замена Redis для команд, которые использует CatalogCache."""
+
+    def __init__(self):
+        self.data: dict[str, bytes] = {}
+        self.down = False
+
+    def _check(self):
+        if self.down:
+            raise RedisConnectionError("down")
+
+    async def mget(self, *keys):
+        self._check()
+        return [self.data.get(key) for key in keys]
+
+    async def set(self, key, value, ex=None):
+        self._check()
+        self.data[key] = value
+
+    def pipeline(self, transaction=True):
+        return MemoryPipeline(self)
+
+    async def aclose(self):
+        pass
+
+
+class MemoryPipeline:
+    def __init__(self, redis: MemoryRedis):
+        self.redis = redis
+        self.commands = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def incr(self, key):
+        self.commands.append(("incr", key))
+
+    def delete(self, key):
+        self.commands.append(("delete", key))
+
+    async def execute(self):
+        self.redis._check()
+        for command, key in self.commands:
+            if command == "incr":
+                self.redis.data[key] = str(int(self.redis.data.get(key, b"0")) + 1).encode()
+            else:
+                self.redis.data.pop(key, None)
+
+
+def _cache(redis: MemoryRedis) -> CatalogCache:
+    cache = CatalogCache("redis://localhost:6379/15", ttl=300, local_ttl=30)
+    cache._redis = redis
+    return cache
+
+
+@pytest.mark.anyio
+async def test_loader_started_before_invalidate_does_not_write_back():
+    redis = MemoryRedis()
+    writer, reader = _cache(redis), _cache(redis)
+
+    async def stale_loader():
+        # Пока загрузчик читает БД, данные меняются и кэш инвалидируется
+        await writer.invalidate("carwashes")
+        return b'["old"]'
+
+    assert (await writer.get_or_load("carwashes", stale_loader)).body == b'["old"]'
+    assert writer.local.get("carwashes") is None
+
+    async def fresh_loader():
+        return b'["new"]'
+
+    # Другой процесс не получает устаревшее значение из Redis
+    assert (await reader.get_or_load("carwashes", fresh_loader)).body == b'["new"]'
+
+
+@pytest.mark.anyio
+async def test_invalidate_is_retried_after_redis_recovers(caplog):
+    redis = MemoryRedis()
+    cache, other = _cache(redis), _cache(redis)
+
+    async def load_v1():
+        return b"1"
+
+    async def load_v2():
+        return b"2"
+
+    await other.get_or_load("wash_types", load_v1)
+    other.local.delete("wash_types")
+
+    redis.down = True
+    with caplog.at_level(logging.ERROR, logger="src.core.cache"):
+        await cache.invalidate("wash_types")
+    assert "wash_types" in caplog.text
+    assert cache._pending_invalidations == {"wash_types"}
+
+    redis.down = False
+    cache._redis_down_until = 0
+    await cache.get_or_load("carwashes", load_v1)
+    assert cache._pending_invalidations == set()
+
+    # Значение, записанное до инвалидации, больше не читается
+    assert (await other.get_or_load("wash_types", load_v2)).body == b"2"
+
+
+@pytest.mark.anyio
+async def test_unreachable_redis_keeps_pending_invalidation(caplog):
+    cache = CatalogCache("redis://127.0.0.1:1/0", ttl=300, local_ttl=30)
+    with caplog.at_level(logging.ERROR, logger="src.core.cache"):
+        await cache.invalidate("carwashes")
+    assert cache._pending_invalidations == {"carwashes"}
+    assert "Не удалось инвалидировать" in caplog.text
+    await cache.close()
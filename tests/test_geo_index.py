@@ -0,0 +1,131 @@
+import random
+import uuid
+
+import pytest
+
+from src.services.geo_index import KM_PER_DEGREE, GeoIndex, haversine_km
+
+
+MOSCOW = (55.7558, 37.6173)
+
+
+def _card(latitude, longitude) -> dict:
+    return {"id": str(uuid.uuid4()), "latitude": latitude, "longitude": longitude}
+
+
+def _index(cards) -> GeoIndex:
+    index = GeoIndex()
+    index.build(cards)
+    return index
+
+
+def _brute_force(cards, latitude, longitude, radius_km=None) -> list[str]:
+    hits = sorted(
+        (haversine_km(latitude, longitude, c["latitude"], c["longitude"]), c["id"])
+        for c in cards
+    )
+    return [cid for dist, cid in hits if radius_km is None or dist <= radius_km]
+
+
+@pytest.fixture
+def counted_rings(monkeypatch):
+    """Считает кольца, которые обошёл поиск."""
+    rings = []
+    walk = GeoIndex._ring
+
+    def ring(self, center, r):
+        rings.append(r)
+        return walk(self, center, r)
+
+    monkeypatch.setattr(GeoIndex, "_ring", ring)
+    return rings
+
+
+def test_empty_index_returns_nothing(counted_rings):
+    assert GeoIndex().nearest(*MOSCOW, limit=10) == []
+    # Мойки без координат в индекс не попадают
+    index = _index([{"id": str(uuid.uuid4()), "latitude": None, "longitude": None}])
+    assert len(index) == 0
+    assert index.nearest(*MOSCOW, limit=10) == []
+    assert counted_rings == []
+
+
+def test_sparse_grid_stops_walking_rings(counted_rings):
+    near, far = _card(*MOSCOW), _card(-33.87, 151.21)
+    index = _index([near, far])
+
+    # Точка далеко от обеих моек: вместо тысяч пустых колец — перебор ячеек
+    hits = index.nearest(0.0, 0.0, limit=5)
+
+    assert [card["id"] for _, card in hits] == _brute_force([near, far], 0.0, 0.0)
+    assert len(counted_rings) <= 2
+
+
+def test_walk_stops_once_next_ring_is_farther(counted_rings):
+    cards = [_card(MOSCOW[0] + i * 0.001, MOSCOW[1]) for i in range(3)]
+    # Много занятых ячеек далеко: без остановки по расстоянию кольца шли бы до них
+    cards += [
+        _card(MOSCOW[0] + 5 + i * 0.2, MOSCOW[1] + j * 0.2)
+        for i in range(10)
+        for j in range(10)
+    ]
+    index = _index(cards)
+
+    hits = index.nearest(*MOSCOW, limit=3)
+
+    assert [card["id"] for _, card in hits] == [c["id"] for c in cards[:3]]
+    assert max(counted_rings) <= 2
+
+
+def test_radius_cuts_off_farther_carwashes():
+    step = 1 / KM_PER_DEGREE  # 1 км по меридиану в градусах
+    cards = [_card(MOSCOW[0] + km * step, MOSCOW[1]) for km in (0.5, 1.5, 5, 20)]
+    index = _index(cards)
+
+    hits = index.nearest(*MOSCOW, limit=10, radius_km=2)
+
+    assert [card["id"] for _, card in hits] == [c["id"] for c in cards[:2]]
+    assert all(dist <= 2 for dist, _ in hits)
+    assert index.nearest(*MOSCOW, limit=10, radius_km=0.1) == []
+
+
+def test_results_are_ordered_like_brute_force():
+    rng = random.Random(7)
+    cards = [
+        _card(MOSCOW[0] + rng.uniform(-1, 1), MOSCOW[1] + rng.uniform(-1, 1))
+        for _ in range(500)
+    ]
+    cards += [_card(rng.uniform(-80, 80), rng.uniform(-180, 180)) for _ in range(50)]
+    index = _index(cards)
+
+    for latitude, longitude in (MOSCOW, (55.2, 38.4), (10.0, -70.0)):
+        for limit in (1, 7, 40):
+            hits = index.nearest(latitude, longitude, limit=limit)
+            distances = [dist for dist, _ in hits]
+            assert distances == sorted(distances)
+            assert [card["id"] for _, card in hits] == _brute_force(
+                cards, latitude, longitude
+            )[:limit]
+        within = index.nearest(latitude, longitude, limit=1000, radius_km=30)
+        assert [card["id"] for _, card in within] == _brute_force(
+            cards, latitude, longitude, radius_km=30
+        )
+
+
+def test_pages_are_consecutive_slices():
+    rng = random.Random(11)
+    cards = [
+        _card(MOSCOW[0] + rng.uniform(-0.5, 0.5), MOSCOW[1] + rng.uniform(-0.5, 0.5))
+        for _ in range(95)
+    ]
+    index = _index(cards)
+    per_page = 20
+
+    # Как search_carwashes_nearby_service: limit = page * per_page, срез с offset
+    pages = []
+    for page in range(1, 7):
+        hits = index.nearest(*MOSCOW, limit=page * per_page)
+        pages.append([card["id"] for _, card in hits[(page - 1) * per_page :]])
+
+    assert [len(p) for p in pages] == [20, 20, 20, 20, 15, 0]
+    assert sum(pages, []) == _brute_force(cards, *MOSCOW)
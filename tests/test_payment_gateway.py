@@ -0,0 +1,100 @@
+import asyncio
+import uuid
+
+import httpx
+import pytest
+from fastapi import HTTPException
+
+from src.services.fake_yookassa import create_fake_yookassa_app
+from src.services.payment_gateway import CircuitBreaker, PaymentGatewayService
+
+
+def _fake_gateway() -> PaymentGatewayService:
+    return PaymentGatewayService(
+        demo_mode=False,
+        base_url="http://fake-yookassa/v3",
+        transport=httpx.ASGITransport(app=create_fake_yookassa_app()),
+        retries=0,
+    )
+
+
+@pytest.mark.anyio
+async def test_repeated_create_payment_returns_the_same_payment():
+    gateway = _fake_gateway()
+    booking_id = uuid.uuid4()
+
+    first = await gateway.create_payment(booking_id, 500, "test", "http://return")
+    second = await gateway.create_payment(booking_id, 500, "test", "http://return")
+    other = await gateway.create_payment(uuid.uuid4(), 500, "test", "http://return")
+
+    assert first["id"] == second["id"]
+    assert other["id"] != first["id"]
+
+    refund = await gateway.create_refund(first["id"], 100)
+    assert (await gateway.create_refund(first["id"], 100))["id"] == refund["id"]
+    await gateway.close()
+
+
+class GatedTransport(httpx.AsyncBaseTransport):
+    """Держит запросы до release и отвечает status_code."""
+
+    def __init__(self, status_code: int = 200):
+        self.status_code = status_code
+        self.requests = 0
+        self.release = asyncio.Event()
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        self.requests += 1
+        await self.release.wait()
+        return httpx.Response(self.status_code, json={"id": "p"})
+
+
+def _open_breaker() -> CircuitBreaker:
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+    breaker.record_failure()
+    return breaker
+
+
+async def _call(gateway: PaymentGatewayService):
+    try:
+        return await gateway.get_payment("p")
+    except HTTPException as e:
+        return e.status_code
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("status_code, closes", [(200, True), (503, False)])
+async def test_half_open_breaker_lets_one_trial_through(status_code, closes):
+    transport = GatedTransport(status_code)
+    gateway = PaymentGatewayService(
+        demo_mode=False, transport=transport, retries=0, breaker=_open_breaker()
+    )
+
+    trial = asyncio.create_task(_call(gateway))
+    await asyncio.sleep(0.01)
+    rejected = await asyncio.gather(*(_call(gateway) for _ in range(5)))
+    assert rejected == [503] * 5
+    assert transport.requests == 1
+
+    transport.release.set()
+    await trial
+    assert gateway.breaker.is_open is False
+    assert (gateway.breaker._opened_at is None) is closes
+    await gateway.close()
+
+
+@pytest.mark.anyio
+async def test_cancelled_trial_frees_the_slot():
+    transport = GatedTransport()
+    gateway = PaymentGatewayService(
+        demo_mode=False, transport=transport, retries=0, breaker=_open_breaker()
+    )
+
+    trial = asyncio.create_task(_call(gateway))
+    await asyncio.sleep(0.01)
+    assert gateway.breaker.is_open
+    trial.cancel()
+    await asyncio.gather(trial, return_exceptions=True)
+
+    assert gateway.breaker.allow_request()
+    await gateway.close()
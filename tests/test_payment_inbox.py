@@ -0,0 +1,163 @@
+import hashlib
+import hmac
+import json
+import uuid
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from sqlalchemy import delete, select
+
+from src.models.booking import Booking
+from src.models.payment_event import PaymentEvent
+from src.routers.v1.payment import router
+from src.services import payment_inbox
+from src.services.fake_yookassa import create_fake_yookassa_app
+from src.services.payment_gateway import PaymentGatewayService, get_payment_gateway
+
+
+@pytest.fixture
+async def gateway():
+    gateway = PaymentGatewayService(
+        demo_mode=False,
+        base_url="http://fake-yookassa/v3",
+        transport=httpx.ASGITransport(app=create_fake_yookassa_app()),
+        retries=0,
+    )
+    yield gateway
+    await gateway.close()
+
+
+@pytest.fixture
+async def client(gateway):
+    app = FastAPI()
+    app.include_router(router)
+    app.dependency_overrides[get_payment_gateway] = lambda: gateway
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://api") as client:
+        yield client
+
+
+@pytest.fixture
+async def pending_booking(pg_session, booking_factory):
+    """Бронь в ожидании оплаты; после теста удаляются её события inbox."""
+    booking = booking_factory(status="pending_payment", payment_status="pending")
+    pg_session.add(booking)
+    await pg_session.flush()
+    booking_id = booking.id
+    await pg_session.commit()
+    yield booking_id
+
+    await pg_session.rollback()
+    await pg_session.execute(
+        delete(PaymentEvent).where(
+            PaymentEvent.payload["object"]["metadata"]["booking_id"].astext
+            == str(booking_id)
+        )
+    )
+    await pg_session.commit()
+
+
+def _notification(event: str, payment: dict) -> bytes:
+    return json.dumps({"type": "notification", "event": event, "object": payment}).encode()
+
+
+def _signed(gateway: PaymentGatewayService, body: bytes) -> dict:
+    signature = hmac.new(gateway.secret_key.encode(), body, hashlib.sha256).hexdigest()
+    return {"X-Signature": signature, "Content-Type": "application/json"}
+
+
+async def _events(session, booking_id) -> list[PaymentEvent]:
+    session.expire_all()
+    result = await session.execute(
+        select(PaymentEvent)
+        .where(
+            PaymentEvent.payload["object"]["metadata"]["booking_id"].astext
+            == str(booking_id)
+        )
+        .order_by(PaymentEvent.received_at)
+    )
+    return list(result.scalars().all())
+
+
+@pytest.mark.anyio
+async def test_unsigned_notification_is_checked_with_provider(
+    pg_session, pending_booking, gateway, client
+):
+    payment = await gateway.create_payment(pending_booking, 500, "test", "http://return")
+    forged = {**payment, "status": "succeeded", "paid": True}
+
+    # Неподписанное «succeeded» для неоплаченного платежа: верим провайдеру
+    response = await client.post(
+        "/api/v1/payments/webhook", content=_notification("payment.succeeded", forged)
+    )
+    assert response.json() == {"status": "accepted"}
+    events = await _events(pg_session, pending_booking)
+    assert [event.event_id for event in events] == [f"payment.pending:{payment['id']}"]
+
+    # Подделка не заняла ключ настоящего события
+    await gateway._client.post(f"/payments/{payment['id']}/succeed")
+    response = await client.post(
+        "/api/v1/payments/webhook", content=_notification("payment.succeeded", forged)
+    )
+    assert response.json() == {"status": "accepted"}
+    events = await _events(pg_session, pending_booking)
+    assert events[-1].event_id == f"payment.succeeded:{payment['id']}"
+    assert events[-1].payload["object"]["status"] == "succeeded"
+
+
+@pytest.mark.anyio
+async def test_duplicate_event_is_applied_once(pg_session, pending_booking, gateway, client):
+    payment = {
+        "id": f"pay-{uuid.uuid4().hex}",
+        "status": "succeeded",
+        "metadata": {"booking_id": str(pending_booking)},
+    }
+    body = _notification("payment.succeeded", payment)
+
+    statuses = []
+    for _ in range(2):
+        response = await client.post(
+            "/api/v1/payments/webhook", content=body, headers=_signed(gateway, body)
+        )
+        statuses.append(response.json()["status"])
+    await payment_inbox.process_payment_inbox_batch(batch_size=100)
+    response = await client.post(
+        "/api/v1/payments/webhook", content=body, headers=_signed(gateway, body)
+    )
+    statuses.append(response.json()["status"])
+
+    assert statuses == ["accepted", "duplicate", "duplicate"]
+    events = await _events(pg_session, pending_booking)
+    assert [(event.status, event.attempts) for event in events] == [("processed", 1)]
+    booking = await pg_session.get(Booking, pending_booking)
+    assert (booking.status, booking.payment_status) == ("confirmed", "paid")
+
+
+@pytest.mark.anyio
+async def test_failed_event_rolls_back_its_savepoint(
+    pg_session, pending_booking, gateway, client, monkeypatch
+):
+    apply_event = payment_inbox._apply_event
+
+    async def failing_apply(event, session, released_slots):
+        await apply_event(event, session, released_slots)
+        await session.flush()
+        raise RuntimeError("сбой после изменения брони")
+
+    monkeypatch.setattr(payment_inbox, "_apply_event", failing_apply)
+    payment = {
+        "id": f"pay-{uuid.uuid4().hex}",
+        "status": "succeeded",
+        "metadata": {"booking_id": str(pending_booking)},
+    }
+    body = _notification("payment.succeeded", payment)
+    await client.post("/api/v1/payments/webhook", content=body, headers=_signed(gateway, body))
+
+    await payment_inbox.process_payment_inbox_batch(batch_size=100)
+
+    events = await _events(pg_session, pending_booking)
+    assert [(event.status, event.attempts) for event in events] == [("pending", 1)]
+    assert "сбой после изменения брони" in events[0].error
+    booking = await pg_session.get(Booking, pending_booking)
+    assert (booking.status, booking.payment_status) == ("pending_payment", "pending")
@@ -0,0 +1,51 @@
+from datetime import datetime
+
+import pytest
+from sqlalchemy import text
+
+from src.core.db import engine
+from src.models.booking import Booking
+from src.services.payment_reconciliation import reconcile_payments_service
+
+
+class ObservingGateway:
+    """Отвечает succeeded и проверяет, что у приложения нет открытых транзакций."""
+
+    def __init__(self):
+        self.open_transactions = []
+
+    async def get_payment(self, payment_id: str) -> dict:
+        async with engine.connect() as connection:
+            result = await connection.execute(
+                text(
+                    "SELECT count(*) FROM pg_stat_activity "
+                    "WHERE datname = current_database() AND pid <> pg_backend_pid() "
+                    "AND state LIKE 'idle in transaction%'"
+                )
+            )
+            self.open_transactions.append(result.scalar_one())
+        return {"id": payment_id, "status": "succeeded"}
+
+
+@pytest.mark.anyio
+async def test_provider_is_called_outside_transactions(pg_session, booking_factory):
+    booking = booking_factory(
+        status="pending_payment",
+        payment_status="pending",
+        payment_id=f"reconcile-{datetime.now().timestamp()}",
+    )
+    pg_session.add(booking)
+    await pg_session.flush()
+    booking_id = booking.id
+    await pg_session.commit()
+    # Тестовая сессия сама не должна висеть в транзакции
+    await pg_session.close()
+
+    gateway = ObservingGateway()
+    stats = await reconcile_payments_service(gateway, page_size=500, concurrency=4)
+
+    assert stats is not None and stats.confirmed >= 1
+    assert gateway.open_transactions and not any(gateway.open_transactions)
+
+    confirmed = await pg_session.get(Booking, booking_id)
+    assert (confirmed.status, confirmed.payment_status) == ("confirmed", "paid")
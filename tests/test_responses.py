@@ -0,0 +1,113 @@
+import json
+import uuid
+from datetime import date
+
+import pytest
+from fastapi import Response
+from fastapi.responses import StreamingResponse
+
+from src.core import responses
+from src.core.config import get_settings
+from src.core.responses import fast_json
+from src.schemas.analytics import SAnalyticsResponse, SAnalyticsRow
+
+
+THRESHOLD = 50
+
+
+@pytest.fixture(autouse=True)
+def fast_json_enabled(monkeypatch):
+    settings = get_settings().model_copy(
+        update={"fast_json_responses": True, "fast_json_stream_threshold": THRESHOLD}
+    )
+    monkeypatch.setattr(responses, "get_settings", lambda: settings)
+
+
+def _row(i: int) -> SAnalyticsRow:
+    return SAnalyticsRow(
+        key=f"row-{i}",
+        bookings=i,
+        completed=i,
+        cancelled=0,
+        no_show=0,
+        revenue=i * 1.5,
+        booked_minutes=30 * i,
+        capacity_minutes=600,
+        utilization=0.5,
+        no_show_rate=0.0,
+    )
+
+
+def _report(size: int) -> SAnalyticsResponse:
+    return SAnalyticsResponse(
+        carwash_id=uuid.uuid4(),
+        grain="hour",
+        group_by="bucket",
+        date_from=date(2026, 1, 1),
+        date_to=date(2026, 1, 2),
+        items=[_row(i) for i in range(size)],
+        totals=_row(0),
+    )
+
+
+async def _body(response: Response) -> bytes:
+    if isinstance(response, StreamingResponse):
+        return b"".join([chunk async for chunk in response.body_iterator])
+    return response.body
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize(
+    "size, streamed", [(0, False), (THRESHOLD, False), (THRESHOLD + 1, True), (250, True)]
+)
+async def test_model_with_array_matches_default_serialization(size, streamed):
+    report = _report(size)
+    response = fast_json(report)
+
+    assert isinstance(response, StreamingResponse) is streamed
+    assert json.loads(await _body(response)) == report.model_dump(mode="json")
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("size, streamed", [(3, False), (THRESHOLD + 1, True)])
+async def test_plain_list_matches_default_serialization(size, streamed):
+    items = [_row(i) for i in range(size)]
+    response = fast_json(items)
+
+    assert isinstance(response, StreamingResponse) is streamed
+    assert json.loads(await _body(response)) == [row.model_dump(mode="json") for row in items]
+
+
+def test_disabled_mode_returns_data_unchanged(monkeypatch):
+    monkeypatch.setattr(responses, "get_settings", get_settings)
+    report = _report(THRESHOLD + 1)
+    assert fast_json(report) is report
+
+
+async def _item_chunks(response: StreamingResponse) -> list[list]:
+    """Куски потока с элементами массива (без скобок и запятых между кусками)."""
+    chunks = [chunk async for chunk in response.body_iterator]
+    return [json.loads(b"[" + chunk + b"]") for chunk in chunks if chunk not in (b"[", b",", b"]")]
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("size, chunks", [(THRESHOLD + 1, 2), (250, 5)])
+async def test_streamed_list_is_split_into_chunks(size, chunks):
+    response = fast_json([_row(i) for i in range(size)])
+
+    parts = await _item_chunks(response)
+    assert len(parts) == chunks
+    assert max(len(part) for part in parts) <= THRESHOLD
+    assert sum(len(part) for part in parts) == size
+
+
+@pytest.mark.anyio
+async def test_chunks_stay_bounded_above_high_threshold(monkeypatch):
+    settings = get_settings().model_copy(
+        update={"fast_json_responses": True, "fast_json_stream_threshold": 1000}
+    )
+    monkeypatch.setattr(responses, "get_settings", lambda: settings)
+
+    parts = await _item_chunks(fast_json([_row(i) for i in range(1001)]))
+
+    assert [len(part) for part in parts] == [responses.STREAM_CHUNK_SIZE] * 10 + [1]
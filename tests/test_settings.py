@@ -0,0 +1,119 @@
+import builtins
+import pathlib
+import uuid
+from datetime import datetime
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from src.core import config
+from src.core.config import Settings, get_settings, reload_settings
+from src.core.db import get_async_session
+from src.core.telegram_auth import issue_session_token
+from src.routers.v1.user import router
+from src.schemas.users import SUserResponse
+from src.services import auth as auth_service
+from src.services import users as users_service
+
+
+@pytest.fixture
+def restore_settings(monkeypatch):
+    """Возвращает настройки процесса после теста, меняющего их."""
+    monkeypatch.setattr(config, "_settings", get_settings())
+
+
+@pytest.fixture
+def no_filesystem(monkeypatch, tmp_path):
+    """
+    Возвращает функцию, после вызова которой любое чтение файла — ошибка.
+
+    Settings смотрит на существующий .env: без него конструктор не открыл бы
+    файл и заглушка ничего бы не доказала.
+    """
+    env_file = tmp_path / ".env"
+    env_file.write_text("WEBAPP_URL=http://env-file\n")
+    monkeypatch.setitem(Settings.model_config, "env_file", str(env_file))
+
+    def forbidden(*args, **kwargs):
+        raise AssertionError(f"обращение к файлу: {args[:1]}")
+
+    def enable():
+        monkeypatch.setattr(builtins, "open", forbidden)
+        monkeypatch.setattr(pathlib.Path, "open", forbidden)
+        monkeypatch.setattr(pathlib.Path, "read_text", forbidden)
+        monkeypatch.setattr(pathlib.Path, "read_bytes", forbidden)
+
+    return enable
+
+
+def test_settings_construction_is_caught(no_filesystem):
+    """Проверка самой заглушки: Settings() читает .env через open."""
+    no_filesystem()
+    with pytest.raises(AssertionError):
+        Settings()
+
+
+@pytest.mark.anyio
+async def test_request_path_does_not_read_files(no_filesystem, monkeypatch):
+    settings = get_settings()
+    user_id = uuid.uuid4()
+    token, _ = issue_session_token(
+        user_id, 42, settings.bot_token, settings.webapp_session_ttl_seconds
+    )
+
+    async def find_user(self, **filter_by):
+        return SUserResponse(
+            id=filter_by["id"],
+            telegram_id=42,
+            username="user_42",
+            email=None,
+            first_name=None,
+            last_name=None,
+            is_verified=False,
+            created_at=datetime.now(),
+        )
+
+    async def session():
+        yield None
+
+    monkeypatch.setattr(users_service.UserService, "find_user", find_user)
+    app = FastAPI()
+    app.include_router(router)
+    app.dependency_overrides[get_async_session] = session
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://api") as client:
+        no_filesystem()
+        for _ in range(3):
+            response = await client.get(
+                "/api/v1/users/me", headers={"Authorization": f"Bearer {token}"}
+            )
+            assert response.status_code == 200, response.text
+            assert response.json()["id"] == str(user_id)
+
+
+def test_reload_replaces_settings_and_validators(restore_settings, monkeypatch):
+    before = get_settings()
+    validator = auth_service._init_data_validator(
+        before.bot_token, before.webapp_init_data_max_age_seconds
+    )
+
+    monkeypatch.setenv("WEBAPP_INIT_DATA_MAX_AGE_SECONDS", "60")
+    after = reload_settings()
+
+    assert get_settings() is after is not before
+    assert after.webapp_init_data_max_age_seconds == 60
+    # Кэш валидаторов сброшен: прежний валидатор не переиспользуется
+    assert auth_service._init_data_validator.cache_info().currsize == 0
+    fresh = auth_service._init_data_validator(
+        after.bot_token, after.webapp_init_data_max_age_seconds
+    )
+    assert fresh is not validator and fresh.max_age == 60
+
+
+def test_failed_reload_keeps_previous_settings(restore_settings, monkeypatch):
+    before = get_settings()
+    monkeypatch.setenv("WEBAPP_INIT_DATA_MAX_AGE_SECONDS", "not-a-number")
+
+    assert reload_settings() is before
+    assert get_settings() is before
@@ -0,0 +1,125 @@
+import asyncio
+import uuid
+
+import pytest
+from sqlalchemy import delete
+from sqlalchemy.dialects import postgresql
+
+from src.core.db import async_session_maker
+from src.models.statistic_counter import StatisticCounter, StatisticDelta
+from src.repositories.statistic import StatisticRepository
+from src.services.statistics import fold_statistics_service, recount_statistics_service
+
+
+class RecordingSession:
+    """Запоминает выполненные запросы вместо обращения к БД."""
+
+    def __init__(self):
+        self.queries = []
+
+    async def execute(self, query):
+        self.queries.append(query)
+        return self
+
+    def all(self):
+        return []
+
+
+def _sql(query) -> str:
+    return str(query.compile(dialect=postgresql.dialect()))
+
+
+@pytest.mark.anyio
+async def test_increment_only_appends_deltas():
+    session = RecordingSession()
+
+    await StatisticRepository(session).increment({"bookings:total": 1, "zero": 0})
+
+    assert len(session.queries) == 1
+    sql = _sql(session.queries[0])
+    assert sql.startswith("INSERT INTO statistic_deltas")
+    assert "statistic_counters" not in sql
+    assert "ON CONFLICT" not in sql
+
+
+@pytest.mark.anyio
+async def test_get_many_adds_unfolded_deltas():
+    session = RecordingSession()
+
+    assert await StatisticRepository(session).get_many(["a", "b"]) == {"a": 0, "b": 0}
+
+    sql = _sql(session.queries[0])
+    assert "UNION ALL" in sql
+    assert "FOR UPDATE" not in sql and "LOCK" not in sql
+
+
+async def _increment(key: str, count: int) -> None:
+    async with async_session_maker() as session:
+        await StatisticRepository(session).increment({key: count})
+        await session.commit()
+
+
+async def _cleanup(session, key: str) -> None:
+    await session.execute(delete(StatisticDelta).where(StatisticDelta.key == key))
+    await session.execute(delete(StatisticCounter).where(StatisticCounter.key == key))
+    await session.commit()
+
+
+@pytest.mark.anyio
+async def test_fold_keeps_counter_value(pg_session):
+    key = f"test:{uuid.uuid4()}"
+    try:
+        await asyncio.gather(*(_increment(key, 1) for _ in range(20)))
+        await _increment(key, -5)
+        repo = StatisticRepository(pg_session)
+        assert (await repo.get_many([key]))[key] == 15
+        await pg_session.commit()
+
+        await fold_statistics_service(pg_session, batch_size=7)
+
+        assert (await repo.get_many([key]))[key] == 15
+        counter = await pg_session.get(StatisticCounter, key)
+        assert counter is not None and counter.value == 15
+    finally:
+        await _cleanup(pg_session, key)
+
+
+@pytest.mark.anyio
+async def test_uncommitted_delta_survives_fold(pg_session):
+    key = f"test:{uuid.uuid4()}"
+    async with async_session_maker() as writer:
+        try:
+            await StatisticRepository(writer).increment({key: 3})
+            await writer.flush()
+
+            await fold_statistics_service(pg_session)
+            await writer.commit()
+
+            repo = StatisticRepository(pg_session)
+            assert (await repo.get_many([key]))[key] == 3
+            await pg_session.commit()
+            await fold_statistics_service(pg_session)
+            assert (await pg_session.get(StatisticCounter, key)).value == 3
+        finally:
+            await writer.rollback()
+            await _cleanup(pg_session, key)
+
+
+@pytest.mark.anyio
+async def test_recount_does_not_wait_for_writers_and_keeps_their_deltas(pg_session):
+    key = f"test:{uuid.uuid4()}"
+    async with async_session_maker() as writer:
+        try:
+            await StatisticRepository(writer).increment({key: 3})
+            await writer.flush()
+
+            # Открытая транзакция записи не блокирует пересчёт
+            values = await asyncio.wait_for(recount_statistics_service(), timeout=10)
+            assert values is not None and key not in values
+            await writer.commit()
+
+            repo = StatisticRepository(pg_session)
+            assert (await repo.get_many([key]))[key] == 3
+        finally:
+            await writer.rollback()
+            await _cleanup(pg_session, key)
@@ -0,0 +1,82 @@
+import httpx
+import pytest
+from aiogram import Bot, Dispatcher
+from fastapi import FastAPI
+
+from src.bot.webhook import WEBHOOK_PATH, WebhookUpdateFeeder, webhook_secret
+from src.core.config import get_settings
+from src.routers.v1.telegram import router
+
+
+UPDATE = {
+    "update_id": 1,
+    "message": {
+        "message_id": 1,
+        "date": 0,
+        "chat": {"id": 1, "type": "private"},
+        "text": "/start",
+    },
+}
+
+
+@pytest.fixture
+def feeder():
+    settings = get_settings()
+    return WebhookUpdateFeeder(
+        bot=Bot(settings.bot_token),
+        dispatcher=Dispatcher(),
+        api_client=None,
+        workers=1,
+        queue_size=1,
+        secret_token=webhook_secret(settings),
+    )
+
+
+@pytest.fixture
+async def client(feeder):
+    app = FastAPI()
+    app.include_router(router)
+    app.state.bot_feeder = feeder
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        yield client
+    await feeder.bot.session.close()
+
+
+def test_secret_is_derived_when_not_configured():
+    settings = get_settings()
+    assert settings.bot_webhook_secret is None
+    secret = webhook_secret(settings)
+    assert secret and secret.isalnum()
+    assert secret == webhook_secret(settings)
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("header", [None, "wrong", "секрет".encode()])
+async def test_update_without_valid_secret_is_rejected(client, feeder, header):
+    headers = {"X-Telegram-Bot-Api-Secret-Token": header} if header else {}
+    response = await client.post(WEBHOOK_PATH, json=UPDATE, headers=headers)
+    assert response.status_code == 403
+    assert feeder.queue.empty()
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("body", [b"{not json", b"[1, 2]", b'{"message": 1}'])
+async def test_malformed_update_is_400(client, feeder, body):
+    response = await client.post(
+        WEBHOOK_PATH,
+        content=body,
+        headers={"X-Telegram-Bot-Api-Secret-Token": feeder.secret_token},
+    )
+    assert response.status_code == 400
+
+
+@pytest.mark.anyio
+async def test_valid_update_is_queued(client, feeder):
+    headers = {"X-Telegram-Bot-Api-Secret-Token": feeder.secret_token}
+    response = await client.post(WEBHOOK_PATH, json=UPDATE, headers=headers)
+    assert response.status_code == 200
+    assert feeder.queue.qsize() == 1
+
+    response = await client.post(WEBHOOK_PATH, json=UPDATE, headers=headers)
+    assert response.status_code == 503
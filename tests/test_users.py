@@ -0,0 +1,81 @@
+import uuid
+from contextlib import contextmanager
+
+import pytest
+from sqlalchemy import delete, event
+from sqlalchemy.dialects import postgresql
+
+from src.core.db import engine
+from src.models.users import User
+from src.repositories.users import UserRepository
+from src.services.users import UserService
+
+
+class RecordingSession:
+    """Запоминает выполненные запросы вместо обращения к БД."""
+
+    def __init__(self):
+        self.queries = []
+
+    async def execute(self, query):
+        self.queries.append(query)
+        return self
+
+    def all(self):
+        return []
+
+
+@contextmanager
+def recorded_statements():
+    """SQL всех запросов, отправленных в БД внутри блока."""
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", record)
+
+
+@pytest.mark.anyio
+async def test_user_list_selects_only_user_columns():
+    session = RecordingSession()
+
+    await UserRepository(session).get_all(skip=0, limit=10, is_verified=True)
+
+    sql = str(session.queries[0].compile(dialect=postgresql.dialect()))
+    assert len(session.queries) == 1
+    assert "bookings" not in sql and "JOIN" not in sql
+    assert "ORDER BY users.created_at, users.id" in sql
+
+
+@pytest.mark.anyio
+async def test_listing_and_lookup_do_not_load_relationships(pg_session, booking_factory):
+    marker = uuid.uuid4().hex[:16]
+    user = User(username=f"u{marker}", last_name=marker)
+    pg_session.add(user)
+    await pg_session.flush()
+    user_id = user.id
+    pg_session.add_all(booking_factory(user_id=user_id) for _ in range(10))
+    await pg_session.commit()
+    pg_session.expunge_all()
+
+    try:
+        service = UserService(pg_session)
+        with recorded_statements() as statements:
+            listed = await service.find_all_users(last_name=marker)
+        assert [item.id for item in listed] == [user_id]
+        # Одна выборка users: ни selectin-, ни lazy-загрузки броней и ролей
+        assert len(statements) == 1
+        assert "bookings" not in statements[0]
+
+        with recorded_statements() as statements:
+            await service.find_user(id=user_id)
+        assert not any("bookings" in sql or "car_wash_admins" in sql for sql in statements)
+    finally:
+        await pg_session.rollback()
+        await pg_session.execute(delete(User).where(User.last_name == marker))
+        await pg_session.commit()
@@ -6,15 +6,19 @@
 
 const API_BASE_URL = import.meta.env.VITE_API_BASE_URL || '/api/v1';
 
+// Токен сессии из /users/telegram/auth: следующие запросы не передают initData
+let sessionToken = null;
+
 async function request(path, options = {}) {
   const url = `${API_BASE_URL}${path}`;
 
   const resp = await fetch(url, {
+    ...options,
     headers: {
       'Content-Type': 'application/json',
+      ...(sessionToken && { Authorization: `Bearer ${sessionToken}` }),
       ...(options.headers || {}),
     },
-    ...options,
   });
 
   const text = await resp.text();
@@ -36,21 +40,19 @@ async function request(path, options = {}) {
 // --- Auth / Users ---
 
 export async function authWithTelegram(initData) {
-  return request('/users/telegram/auth', {
+  const user = await request('/users/telegram/auth', {
     method: 'POST',
     headers: {
       'X-Telegram-Init-Data': initData,
     },
   });
+  sessionToken = user?.session_token || null;
+  return user;
 }
 
-export async function getCurrentUser(telegramId) {
-  return request('/users/me', {
-    method: 'GET',
-    headers: {
-      'x-telegram-id': String(telegramId),
-    },
-  });
+// Профиль владельца токена сессии (после authWithTelegram)
+export async function getCurrentUser() {
+  return request('/users/me', { method: 'GET' });
 }
 
 // --- Carwashes ---
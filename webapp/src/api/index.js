@@ -14,14 +14,19 @@ const getTelegramInitData = () => {
   }
 }
 
+// Токен сессии из /users/telegram/auth: после входа initData не передаётся
+let sessionToken = null
+
 // Базовый fetch с авторизацией
 const apiFetch = async (endpoint, options = {}) => {
-  const { initData, user } = getTelegramInitData()
+  const { initData } = getTelegramInitData()
   
+  // Пользователь определяется по токену сессии, а не по переданному id
   const headers = {
     'Content-Type': 'application/json',
-    'X-Telegram-Init-Data': initData,
-    ...(user?.id && { 'X-Telegram-Id': user.id.toString() }),
+    ...(sessionToken
+      ? { Authorization: `Bearer ${sessionToken}` }
+      : { 'X-Telegram-Init-Data': initData }),
     ...options.headers
   }
   
@@ -56,6 +61,11 @@ export const carwashAPI = {
     return apiFetch(`/carwashes/${id}`)
   },
   
+  // Свободные слоты по дням (для выбора даты) — один запрос на неделю
+  getAvailability: async (id, days = 7) => {
+    return apiFetch(`/carwashes/${id}/availability?days=${days}`)
+  },
+  
   // Получить слоты мойки
   getSlots: async (id, date, washTypeId) => {
     const params = new URLSearchParams({ slot_date: date })
@@ -133,10 +143,14 @@ export const washTypeAPI = {
 export const userAPI = {
   // Авторизация через Telegram
   auth: async (telegramData) => {
-    return apiFetch('/users/telegram/auth', {
+    const { initData } = getTelegramInitData()
+    const user = await apiFetch('/users/telegram/auth', {
       method: 'POST',
+      headers: { 'X-Telegram-Init-Data': initData },
       body: JSON.stringify(telegramData)
     })
+    sessionToken = user?.session_token || null
+    return user
   },
   
   // Получить профиль
@@ -2,7 +2,7 @@ import React from 'react'
 import { format, addDays } from 'date-fns'
 import { ru } from 'date-fns/locale'
 
-export default function DateSelector({ selected, onSelect, daysAhead = 7 }) {
+export default function DateSelector({ selected, onSelect, daysAhead = 7, freeCounts }) {
   const dates = Array.from({ length: daysAhead }, (_, i) => addDays(new Date(), i))
   
   return (
@@ -11,6 +11,7 @@ export default function DateSelector({ selected, onSelect, daysAhead = 7 }) {
         const isSelected = selected === format(date, 'yyyy-MM-dd')
         const dayName = idx === 0 ? 'Сегодня' : idx === 1 ? 'Завтра' : format(date, 'EE', { locale: ru })
         const dayNum = format(date, 'd')
+        const freeCount = freeCounts?.[format(date, 'yyyy-MM-dd')]
         
         return (
           <button
@@ -24,6 +25,9 @@ export default function DateSelector({ selected, onSelect, daysAhead = 7 }) {
           >
             <div className="text-xs opacity-75">{dayName}</div>
             <div className="text-lg font-semibold">{dayNum}</div>
+            {freeCount !== undefined && (
+              <div className="text-xs opacity-75">{freeCount ? `${freeCount} св.` : '—'}</div>
+            )}
           </button>
         )
       })}